@@ -0,0 +1,166 @@
+# benchmarks/bench_app.py — rerun latency / memory suite for streamlit_app.py
+#
+#   python benchmarks/bench_app.py                                   # 9/100/1000 questions × 0/2000 files
+#   python benchmarks/bench_app.py --catalog-sizes 9 100 1000 --results-sizes 0 10000 \
+#       --report bench_report.json --thresholds benchmarks/thresholds.json
+#
+# Every (catalog size, results size) scenario runs in its own interpreter so
+# peak RSS is per scenario. Inside, AppTest drives scripted interactions —
+# radios, weight sliders, defect counts, evidence, tab switches, Portfolio —
+# and records wall time per rerun, live matplotlib figures and store writes.
+# Catalogs are synthetic: each tab's real catalog repeated up to the size.
+# Exit status is 1 when any threshold is exceeded.
+#
+# Streamlit 1.37 walks every keyed widget for each keyed widget it renders, so
+# the checklist shows PAGE_SIZE questions per run (streamlit_app.py); rerun
+# cost therefore barely depends on the catalog size, and every size gets the
+# same latency limits.
+import argparse, gc, json, os, random, resource, statistics, subprocess, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_THRESHOLDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "thresholds.json")
+
+# ---------- Fixtures ----------
+def write_catalogs(dst, size):
+    from riskradar.catalog import TABS, catalog_path
+    for tab in TABS:
+        with open(catalog_path(tab), encoding="utf-8") as fh:
+            doc = json.load(fh)
+        base = doc["items"]
+        doc["items"] = [dict(base[n % len(base)], risk_name=f"{base[n % len(base)]['risk_name']} #{n}",
+                             question=f"{base[n % len(base)]['question']} (#{n})") for n in range(size)]
+        with open(os.path.join(dst, f"{tab.lower()}.json"), "w", encoding="utf-8") as fh:
+            json.dump(doc, fh)
+
+def write_results(dst, count):
+    from bench_portfolio import write_file
+    rnd = random.Random(1)
+    for i in range(count):
+        write_file(dst, i, rnd)
+
+# ---------- Scenario (runs in a child process) ----------
+def live_figures():
+    from matplotlib.figure import Figure
+    gc.collect()
+    return sum(1 for o in gc.get_objects() if isinstance(o, Figure))
+
+def run_scenario(catalog_size, results_size, repeat):
+    from streamlit.testing.v1 import AppTest
+    from riskradar import store
+    from riskradar.catalog import load_catalog
+
+    at = AppTest.from_file(os.path.join(ROOT, "streamlit_app.py"), default_timeout=600)
+    t0 = time.perf_counter(); at.run(); first = time.perf_counter() - t0
+    at.text_input(key="L10n_Project").set_value("Bench"); at.text_input(key="L10n_Version").set_value("1.0"); at.run()
+
+    cat = load_catalog("L10n")
+    rnd = random.Random(2)
+    def radio(at):
+        w = rnd.choice([r for r in at.radio if r.key in cat.answer_keys])  # questions on the current page
+        w.set_value("No" if w.value == "Yes" else "Yes")
+    def slider(at):
+        at.slider(key=cat.weight_keys[rnd.randrange(len(cat.weight_keys))]).set_value(rnd.randint(5, 20) / 10)
+    def defects(at):
+        at.number_input(key="L10n_def_major").set_value(rnd.randint(0, 9))
+    def evidence(at):
+        rnd.choice([t for t in at.text_input if t.key in cat.evidence_keys]).set_value(f"https://jira.example/{rnd.random()}")
+    def page(at):
+        w = at.selectbox(key="L10n_checklist_page")
+        w.set_value((w.value + 1) % len(w.options))
+    def switch_tab(at):
+        at.radio(key="view").set_value("LocOps" if at.radio(key="view").value == "L10n" else "L10n")
+    def portfolio(at):
+        at.radio(key="view").set_value("Portfolio" if at.radio(key="view").value != "Portfolio" else "L10n")
+
+    out = {"catalog_size": catalog_size, "results_size": results_size, "first_render_ms": first * 1e3,
+           "interactions": {}}
+    all_times, w0 = [], store.stats()
+    steps = [("radio", radio), ("weight_slider", slider), ("defect_count", defects),
+             ("evidence", evidence), ("switch_tab", switch_tab), ("portfolio", portfolio)]
+    if any(w.key == "L10n_checklist_page" for w in at.selectbox):
+        steps.insert(1, ("checklist_page", page))
+    for label, act in steps:
+        times = []
+        for _ in range(repeat):
+            act(at)
+            t0 = time.perf_counter(); at.run(); times.append(time.perf_counter() - t0)
+            if at.exception:
+                raise RuntimeError(f"{label}: {at.exception[0].value}")
+        if at.radio(key="view").value != "L10n":
+            at.radio(key="view").set_value("L10n").run()
+        all_times += times
+        times.sort()
+        out["interactions"][label] = {"p50_ms": statistics.median(times) * 1e3,
+                                      "p95_ms": times[int(0.95 * (len(times) - 1))] * 1e3}
+    w1 = store.stats()
+    all_times.sort()
+    out["rerun_p95_ms"] = all_times[int(0.95 * (len(all_times) - 1))] * 1e3
+    out["reruns"] = len(all_times)
+    out["file_writes"] = w1["writes"] - w0["writes"]
+    out["writes_per_rerun"] = out["file_writes"] / len(all_times)
+    out["live_figures"] = live_figures()
+    out["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return out
+
+# ---------- Driver ----------
+def check(report, thresholds):
+    failures = []
+    for sc in report["scenarios"]:
+        limits = dict(thresholds.get("default", {}))
+        limits.update(thresholds.get("catalog_size", {}).get(str(sc["catalog_size"]), {}))
+        for metric, limit in limits.items():
+            if sc.get(metric, 0) > limit:
+                failures.append(f"catalog={sc['catalog_size']} results={sc['results_size']}: "
+                                f"{metric}={sc[metric]:.1f} > {limit}")
+    return failures
+
+def main():
+    ap = argparse.ArgumentParser(description="streamlit_app.py rerun latency / memory suite")
+    ap.add_argument("--catalog-sizes", type=int, nargs="+", default=[9, 100, 1000])
+    ap.add_argument("--results-sizes", type=int, nargs="+", default=[0, 2000])
+    ap.add_argument("--repeat", type=int, default=5, help="reruns per interaction")
+    ap.add_argument("--report", help="write the JSON report here (default: stdout)")
+    ap.add_argument("--thresholds", default=DEFAULT_THRESHOLDS)
+    ap.add_argument("--scenario", nargs=2, type=int, metavar=("CATALOG_SIZE", "RESULTS_SIZE"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.scenario:
+        print(json.dumps(run_scenario(*args.scenario, args.repeat)))
+        return
+
+    report = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "python": sys.version.split()[0], "scenarios": []}
+    for catalog_size in args.catalog_sizes:
+        for results_size in args.results_sizes:
+            with tempfile.TemporaryDirectory() as cat_dir, tempfile.TemporaryDirectory() as res_dir:
+                write_catalogs(cat_dir, catalog_size)
+                write_results(res_dir, results_size)
+                env = dict(os.environ, RISKRADAR_CATALOG_DIR=cat_dir, RISKRADAR_RESULTS_DIR=res_dir)
+                proc = subprocess.run([sys.executable, __file__, "--scenario", str(catalog_size), str(results_size),
+                                       "--repeat", str(args.repeat)], env=env, capture_output=True, text=True)
+                if proc.returncode:
+                    sys.exit(f"scenario {catalog_size}/{results_size} failed:\n{proc.stderr}")
+                sc = json.loads(proc.stdout.strip().splitlines()[-1])
+                report["scenarios"].append(sc)
+                print(f"catalog={catalog_size:>5} results={results_size:>6} first={sc['first_render_ms']:8.0f} ms "
+                      f"rerun p95={sc['rerun_p95_ms']:8.0f} ms rss={sc['peak_rss_mb']:6.0f} MB "
+                      f"figures={sc['live_figures']} writes/rerun={sc['writes_per_rerun']:.2f}", file=sys.stderr)
+
+    with open(args.thresholds, encoding="utf-8") as fh:
+        thresholds = json.load(fh)
+    report["thresholds"] = thresholds
+    report["failures"] = check(report, thresholds)
+    text = json.dumps(report, indent=2)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    for f in report["failures"]:
+        print(f"THRESHOLD EXCEEDED: {f}", file=sys.stderr)
+    sys.exit(1 if report["failures"] else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+# benchmarks/bench_defects.py — throughput and peak memory of the defect-export ingest
+#
+#   python benchmarks/bench_defects.py --issues 500000 --projects 40 --naive
+#
+# Writes synthetic tracker exports of --issues issues each — Jira CSV (two
+# "Fix Version/s" columns), Jira search JSON and ValueEdge REST JSON — and
+# ingests each one in a fresh process (riskradar.defects.ingest into a temp
+# store), reporting issues/s and peak RSS. The counts are checked against a
+# straightforward reference count of the same issues. `--naive` adds the
+# load-everything baseline: pd.read_csv / json.load, then a groupby.
+import argparse, csv, json, os, random, resource, subprocess, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PRIORITIES = ("Highest", "High", "Medium", "Low", "Blocker", "Critical", "Major", "Minor")
+STATUSES = ("Open", "In Progress", "Reopened", "Done", "Closed", "Resolved")
+VE_SEVERITIES = ("urgent", "very_high", "high", "medium", "low")
+VE_PHASES = ("New", "Opened", "Fixed", "Closed", "Rejected")
+
+def issues(n, projects, rnd):
+    for k in range(n):
+        p = rnd.randrange(projects)
+        versions = [f"25.{rnd.randint(1, 4)}"] + ([f"25.{rnd.randint(5, 6)}"] if rnd.random() < 0.1 else [])
+        yield k, f"Project {p}", f"P{p}", versions
+
+def write_jira_csv(path, n, projects, rnd):
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        w = csv.writer(fh)
+        w.writerow(["Summary", "Issue key", "Issue Type", "Status", "Project key", "Project name", "Priority",
+                    "Resolution", "Fix Version/s", "Fix Version/s", "Description"])
+        for k, name, key, versions in issues(n, projects, rnd):
+            status = rnd.choice(STATUSES)
+            w.writerow([f"Crash in dialog {k}", f"{key}-{k}", "Bug", status, key, name, rnd.choice(PRIORITIES),
+                        "Fixed" if status in ("Done", "Closed", "Resolved") else "",
+                        *(versions + [""])[:2], "Steps to reproduce: open, click, observe. " * 3])
+
+def write_jira_json(path, n, projects, rnd):
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('{"expand": "names,schema", "startAt": 0, "maxResults": %d, "total": %d, "issues": [' % (n, n))
+        for k, name, key, versions in issues(n, projects, rnd):
+            status = rnd.choice(STATUSES)
+            done = status in ("Done", "Closed", "Resolved")
+            fh.write(("," if k else "") + json.dumps({"id": str(k), "key": f"{key}-{k}", "fields": {
+                "summary": f"Crash in dialog {k}", "issuetype": {"name": "Bug"},
+                "project": {"key": key, "name": name}, "priority": {"name": rnd.choice(PRIORITIES)},
+                "status": {"name": status, "statusCategory": {"key": "done" if done else "indeterminate"}},
+                "resolution": {"name": "Fixed"} if done else None,
+                "fixVersions": [{"name": v} for v in versions],
+                "description": "Steps to reproduce: open, click, observe. " * 3}}))
+        fh.write("]}")
+
+def write_valueedge_json(path, n, projects, rnd):
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write('{"total_count": %d, "data": [' % n)
+        for k, name, key, versions in issues(n, projects, rnd):
+            sev = rnd.choice(VE_SEVERITIES)
+            fh.write(("," if k else "") + json.dumps({
+                "type": "defect", "id": str(k), "name": f"Crash in dialog {k}",
+                "severity": {"type": "list_node", "logical_name": f"list_node.severity.{sev}"},
+                "phase": {"type": "phase", "name": rnd.choice(VE_PHASES)},
+                "release": {"type": "release", "name": versions[0]}, "product": {"name": name}}))
+        fh.write("]}")
+
+FORMATS = {"jira.csv": write_jira_csv, "jira.json": write_jira_json, "valueedge.json": write_valueedge_json}
+
+def reference(path):
+    """Counts the obvious way (whole file in memory), for the correctness check and --naive."""
+    from riskradar import defects
+    ext = os.path.splitext(path)[1]
+    if ext == ".csv":
+        import pandas as pd
+        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+        total = len(df)
+        df = df[~df["Status"].str.lower().isin(defects.CLOSED) & (df["Resolution"] == "")]
+        sev = df["Priority"].str.lower().map(defects.SEVERITY_MAP)
+        long = pd.concat([pd.DataFrame({"p": df[pc].str.casefold(), "v": df[vc].str.casefold(), "s": sev})
+                          for pc in ("Project key", "Project name") for vc in ("Fix Version/s", "Fix Version/s.1")])
+        out = {}
+        for (p, v, s), n in long[long["v"] != ""].groupby(["p", "v", "s"]).size().items():
+            out.setdefault((p, v), [0] * 4)[int(s)] = int(n)
+        return out, total
+    with open(path, encoding="utf-8") as fh:
+        doc = json.load(fh)
+    out = {}
+    items = doc.get("issues") or doc.get("data")
+    for it in items:
+        if "fields" in it:  # Jira
+            f = it["fields"]
+            if f["resolution"] or f["status"]["statusCategory"]["key"] == "done":
+                continue
+            keys = [(p, v["name"]) for p in (f["project"]["key"], f["project"]["name"]) for v in f["fixVersions"]]
+            sev = f["priority"]["name"]
+        else:  # ValueEdge
+            if it["phase"]["name"].lower() in defects.CLOSED:
+                continue
+            keys = [(it["product"]["name"], it["release"]["name"])]
+            sev = it["severity"]["logical_name"].rsplit(".", 1)[-1].replace("_", " ")
+        for p, v in keys:
+            out.setdefault((p.casefold(), v.casefold()), [0] * 4)[defects.SEVERITY_MAP[sev.lower()]] += 1
+    return out, len(items)
+
+# ---------- Child ----------
+def peak_rss_mb():
+    # VmHWM starts fresh at exec; ru_maxrss would carry over this (bigger) parent's peak
+    try:
+        with open("/proc/self/status") as fh:
+            return next(int(l.split()[1]) for l in fh if l.startswith("VmHWM:")) / 1024
+    except (OSError, StopIteration):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def child(mode, path, store_dir):
+    t0 = time.perf_counter()
+    if mode == "naive":
+        _, n = reference(path)
+    else:
+        from riskradar import defects
+        inbox = os.path.dirname(path)
+        r = [x for x in defects.ingest(inbox, store_dir, force=True) if x["path"] == path][0]
+        n = r["issues"]
+    print(json.dumps({"issues": n, "seconds": time.perf_counter() - t0,
+                      "peak_rss_mb": peak_rss_mb()}))
+
+def main():
+    ap = argparse.ArgumentParser(description="Defect export ingest throughput and peak RSS")
+    ap.add_argument("--issues", type=int, default=500_000)
+    ap.add_argument("--projects", type=int, default=40)
+    ap.add_argument("--formats", nargs="+", default=list(FORMATS), choices=list(FORMATS))
+    ap.add_argument("--naive", action="store_true", help="also run the read-everything baseline")
+    ap.add_argument("--child", nargs=3, metavar=("MODE", "PATH", "STORE"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.child:
+        return child(*args.child)
+    from riskradar import defects
+
+    rnd = random.Random(15)
+    with tempfile.TemporaryDirectory() as tmp:
+        # correctness on a small export of each kind first
+        for name, write in FORMATS.items():
+            small = os.path.join(tmp, "check", name)
+            os.makedirs(os.path.dirname(small), exist_ok=True)
+            write(small, 20_000, args.projects, rnd)
+            got, _ = defects.aggregate(defects.iter_issues(small))
+            want, _ = reference(small)
+            assert got == want, f"{name}: streaming counts differ from the reference"
+            os.unlink(small)
+        print("streaming counts match the reference count")
+
+        for name in args.formats:
+            inbox = os.path.join(tmp, name)
+            os.makedirs(inbox)
+            path = os.path.join(inbox, name)
+            t0 = time.perf_counter()
+            FORMATS[name](path, args.issues, args.projects, rnd)
+            size = os.path.getsize(path) / 1e6
+            print(f"{name}: {args.issues:,} issues, {size:.0f} MB (written in {time.perf_counter() - t0:.1f} s)")
+            for mode in ["ingest"] + (["naive"] if args.naive else []):
+                proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", mode, path, tmp],
+                                      capture_output=True, text=True)
+                if proc.returncode:
+                    print(f"  {mode:<7} failed: {proc.stderr.strip().splitlines()[-1]}")
+                    continue
+                r = json.loads(proc.stdout)
+                print(f"  {mode:<7} {r['seconds']:6.2f} s  {r['issues'] / r['seconds']:>9,.0f} issues/s  "
+                      f"{size / r['seconds']:6.1f} MB/s  peak RSS {r['peak_rss_mb']:6.0f} MB")
+            os.unlink(path)
+
+if __name__ == "__main__":
+    main()
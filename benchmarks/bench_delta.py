@@ -0,0 +1,91 @@
+# benchmarks/bench_delta.py — version-to-version delta latency over a large portfolio
+#
+#   python benchmarks/bench_delta.py --projects 3000
+#
+# Synthetic portfolio: every project × tab assessed for --versions versions
+# (some saved twice on different dates), 5-15 risks each with drifting scores.
+# Times DeltaIndex construction, then whole-portfolio and single-project
+# comparisons, against a pandas baseline (filter both versions, keep the newest
+# date, merge on the string columns) that must return the same changes.
+import argparse, os, statistics, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+def synthetic_frame(projects, versions, seed=3):
+    g = np.random.default_rng(seed)
+    rows = {k: [] for k in ("project_name", "tab", "version", "assessment_date", "category", "risk_name",
+                            "score", "weighted_score")}
+    for p in range(projects):
+        for tab in ("L10n", "LocOps", "General"):
+            present = g.random(20) < 0.5
+            scores = g.integers(1, 10, 20)
+            for v in range(versions):
+                present ^= g.random(20) < 0.1  # risks appear / get resolved
+                scores = np.clip(scores + g.integers(-2, 3, 20), 1, 9)
+                for save in range(1 + (g.random() < 0.2)):
+                    date = f"2025-{1 + v:02d}-{1 + 10 * save:02d}"
+                    for r in np.flatnonzero(present):
+                        rows["project_name"].append(f"Proj{p}"); rows["tab"].append(tab)
+                        rows["version"].append(f"25.{v}"); rows["assessment_date"].append(date)
+                        rows["category"].append(f"Cat{r % 6}"); rows["risk_name"].append(f"Risk {r}")
+                        rows["score"].append(float(scores[r])); rows["weighted_score"].append(float(scores[r]) * 1.5)
+    frame = pd.DataFrame(rows)
+    for c in ("project_name", "tab", "version", "assessment_date", "category", "risk_name"):
+        frame[c] = frame[c].astype("category")
+    return frame
+
+def pandas_delta(frame, base, head, projects=None):
+    keys = ["project_name", "tab", "risk_name"]
+    def side(v):
+        s = frame[frame["version"] == v]
+        if projects:
+            s = s[s["project_name"].isin(projects)]
+        newest = s.groupby(["project_name", "tab"], observed=True)["assessment_date"].transform(
+            lambda d: d.astype(str).max())
+        s = s[s["assessment_date"].astype(str) == newest]
+        return s.assign(**{k: s[k].astype(str) for k in keys})
+    b, h = side(base), side(head)
+    pairs = b[["project_name", "tab"]].drop_duplicates().merge(h[["project_name", "tab"]].drop_duplicates())
+    b, h = b.merge(pairs), h.merge(pairs)
+    j = b[keys + ["score"]].merge(h[keys + ["score"]], on=keys, how="outer", suffixes=("_b", "_h"))
+    return int((j["score_b"].isna() | j["score_h"].isna() | (j["score_b"] != j["score_h"])).sum())
+
+def timed(fn, n):
+    times = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - t0)
+    times.sort()
+    return out, statistics.median(times) * 1e3, times[int(0.95 * (len(times) - 1))] * 1e3
+
+def main():
+    ap = argparse.ArgumentParser(description="Risk delta engine latency")
+    ap.add_argument("--projects", type=int, default=3000)
+    ap.add_argument("--versions", type=int, default=4)
+    ap.add_argument("--repeat", type=int, default=10)
+    args = ap.parse_args()
+    from riskradar.delta import DeltaIndex
+
+    frame = synthetic_frame(args.projects, args.versions)
+    t0 = time.perf_counter()
+    index = DeltaIndex(frame)
+    print(f"rows={len(frame)} projects={args.projects} index build {time.perf_counter() - t0:.3f} s")
+
+    base, head = "25.1", "25.2"
+    delta, p50, p95 = timed(lambda: index.compare(base, head), args.repeat)
+    print(f"delta (all projects)  p50 {p50:7.1f} ms  p95 {p95:7.1f} ms  changes={len(delta)}")
+    expected, p50, _ = timed(lambda: pandas_delta(frame, base, head), 2)
+    print(f"pandas (all projects) p50 {p50:7.1f} ms                   changes={expected}")
+    assert expected == len(delta), "delta engine and pandas baseline disagree"
+
+    one = ["Proj7"]
+    delta, p50, p95 = timed(lambda: index.compare(base, head, projects=one), args.repeat)
+    print(f"delta (one project)   p50 {p50:7.1f} ms  p95 {p95:7.1f} ms  changes={len(delta)}")
+    assert pandas_delta(frame, base, head, one) == len(delta)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+# benchmarks/bench_drafts.py — draft snapshot size / cost and per-session state memory
+#
+#   python benchmarks/bench_drafts.py --sessions 20 --catalog-size 100
+#   git show <rev>:streamlit_app.py > /tmp/old_app.py
+#   python benchmarks/bench_drafts.py --script /tmp/old_app.py   # before: compare with the current script
+#
+# Part 1 encodes/decodes a filled-in tab (riskradar/drafts.py) and reports the
+# snapshot size. Part 2 keeps --sessions AppTest sessions alive at once, each
+# filling in all three tabs (answers, P/I, weights, evidence links drawn from a
+# shared pool, header, release, defect and link inputs) and ending on the first
+# one, then measures their Streamlit SessionState objects together: objects
+# shared between sessions (catalog strings, interned links) are counted once,
+# code and types not at all. Streamlit's own widget metadata, which 1.37 keeps
+# for every widget ever rendered, is listed separately. Each script runs in its
+# own interpreter.
+import argparse, gc, json, os, random, subprocess, sys, tempfile, time, types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+LINKS = [f"https://jira.example/browse/LOC-{n}" for n in range(40)]
+
+# ---------- Memory ----------
+_SKIP = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType,
+         types.CodeType, types.FrameType)
+
+def deep_size(roots) -> int:
+    """Bytes reachable from `roots`, each object once; code, types and modules excluded."""
+    seen, stack, total = set(), list(roots), 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SKIP):
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        stack.extend(gc.get_referents(obj))
+    return total
+
+# ---------- Part 1: snapshot ----------
+def filled_state(cat, rnd):
+    from riskradar import rules
+    from riskradar.catalog import key_for
+    state = {key_for(cat.tab, "Project"): "Bench", key_for(cat.tab, "Version"): "25.3",
+             key_for(cat.tab, "Assessor"): "QA", key_for(cat.tab, "rel_url"): rnd.choice(LINKS),
+             key_for(cat.tab, "rel_status"): "In progress", key_for(cat.tab, "def_major"): 3,
+             key_for(cat.tab, "link_ci"): "https://ci.example/job/loc", key_for(cat.tab, "adv"): True}
+    for n in range(len(cat)):
+        state[cat.answer_keys[n]] = rnd.choice(("Yes", "No"))
+        state[cat.p_keys[n]], state[cat.i_keys[n]] = rnd.randint(1, 3), rnd.randint(1, 3)
+        state[cat.evidence_keys[n]] = rnd.choice(LINKS) if rnd.random() < 0.3 else ""
+    for key in cat.weight_keys:
+        state[key] = rnd.randint(rules.WEIGHT_MIN * 10, rules.WEIGHT_MAX * 10) / 10
+    return state
+
+def snapshot_report(repeat):
+    from riskradar import drafts
+    from riskradar.catalog import TABS, load_catalog
+    rnd = random.Random(17)
+    for tab in TABS:
+        cat = load_catalog(tab)
+        state = filled_state(cat, rnd)
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            blob = drafts.encode(cat, state)
+        enc = (time.perf_counter() - t0) / repeat
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            values = drafts.decode(cat, blob)
+        dec = (time.perf_counter() - t0) / repeat
+        assert all(state[k] == v for k, v in values.items())
+        print(f"{tab:<8} {len(cat):>5} questions  {len(state):>5} keys  widget state {deep_size([state]):>8,} B  "
+              f"snapshot {len(blob):>5} B  encode {enc * 1e6:7.1f} µs  decode {dec * 1e6:7.1f} µs")
+
+# ---------- Part 2: concurrent sessions (child) ----------
+def fill_tab(at, tab, rnd):
+    from riskradar.catalog import key_for, load_catalog
+    cat = load_catalog(tab)
+    at.text_input(key=key_for(tab, "Project")).set_value(f"Proj{rnd.randrange(50)}")
+    at.text_input(key=key_for(tab, "Version")).set_value("25.3")
+    at.text_input(key=key_for(tab, "Assessor")).set_value("QA")
+    page_key = key_for(tab, "checklist_page")
+    pages = len(at.selectbox(key=page_key).options) if any(w.key == page_key for w in at.selectbox) else 1
+    for page in range(pages):  # large catalogs show a page of questions at a time
+        if page:
+            at.selectbox(key=page_key).set_value(page).run()
+        shown = {r.key for r in at.radio}
+        for n in (n for n, k in enumerate(cat.answer_keys) if k in shown):
+            if rnd.random() < 0.3:
+                at.radio(key=cat.answer_keys[n]).set_value("No" if at.radio(key=cat.answer_keys[n]).value == "Yes" else "Yes")
+            if rnd.random() < 0.2:
+                at.selectbox(key=cat.p_keys[n]).set_value(rnd.randint(1, 3))
+            if rnd.random() < 0.3:
+                at.text_input(key=cat.evidence_keys[n]).set_value(rnd.choice(LINKS))
+    at.slider(key=cat.weight_keys[0]).set_value(1.5)
+    at.text_input(key=key_for(tab, "rel_url")).set_value(rnd.choice(LINKS))
+    at.selectbox(key=key_for(tab, "rel_status")).set_value("In progress")
+    at.number_input(key=key_for(tab, "def_major")).set_value(rnd.randint(0, 9))
+    at.text_input(key=key_for(tab, "link_ci")).set_value("https://ci.example/job/loc")
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+def run_sessions(script, sessions):
+    from streamlit.testing.v1 import AppTest
+    from riskradar.catalog import TABS
+    rnd = random.Random(17)
+    apps = []
+    t0 = time.perf_counter()
+    for _ in range(sessions):
+        at = AppTest.from_file(script, default_timeout=600)
+        at.run()
+        for tab in (*TABS[1:], TABS[0]):
+            if at.radio(key="view").value != tab:
+                at.radio(key="view").set_value(tab).run()
+            fill_tab(at, tab, rnd)
+        apps.append(at)
+    elapsed = time.perf_counter() - t0
+    gc.collect()
+    states = [at.session_state._state for at in apps]
+    keys = [len(s.filtered_state) for s in states]
+    # Streamlit 1.37 never prunes widget_metadata (one entry per widget a session has ever
+    # rendered), so it is reported on its own; the rest is the state the app controls
+    meta = deep_size(s._new_widget_state.widget_metadata for s in states)
+    values = deep_size([s._old_state, s._new_session_state, s._new_widget_state.states, s._key_id_mapping]
+                       for s in states) - deep_size([[] for _ in states])
+    return {"sessions": sessions, "keys_per_session": sum(keys) / len(keys), "state_bytes": values,
+            "bytes_per_session": values / sessions, "metadata_bytes_per_session": meta / sessions,
+            "seconds": elapsed}
+
+def main():
+    ap = argparse.ArgumentParser(description="Draft snapshot size and per-session state memory")
+    ap.add_argument("--script", action="append", help="entry point(s) to compare (default: streamlit_app.py)")
+    ap.add_argument("--sessions", type=int, default=20)
+    ap.add_argument("--catalog-size", type=int, help="synthetic catalogs with this many questions per tab")
+    ap.add_argument("--repeat", type=int, default=2000, help="encode/decode repetitions")
+    ap.add_argument("--child", nargs=2, metavar=("SCRIPT", "SESSIONS"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.child:
+        print(json.dumps(run_sessions(args.child[0], int(args.child[1]))))
+        return
+
+    with tempfile.TemporaryDirectory() as cat_dir, tempfile.TemporaryDirectory() as res_dir:
+        env = dict(os.environ, RISKRADAR_RESULTS_DIR=res_dir)
+        if args.catalog_size:
+            from bench_app import write_catalogs
+            write_catalogs(cat_dir, args.catalog_size)
+            env["RISKRADAR_CATALOG_DIR"] = os.environ["RISKRADAR_CATALOG_DIR"] = cat_dir
+        snapshot_report(args.repeat)
+        for script in args.script or [os.path.join(ROOT, "streamlit_app.py")]:
+            proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", os.path.abspath(script),
+                                   str(args.sessions)], env=env, capture_output=True, text=True)
+            if proc.returncode:
+                sys.exit(f"{script} failed:\n{proc.stderr}")
+            r = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(f"{os.path.basename(script):<20} {r['sessions']} sessions  {r['keys_per_session']:7.0f} keys/session  "
+                  f"state {r['bytes_per_session'] / 1024:7.1f} KiB/session "
+                  f"(+ widget metadata {r['metadata_bytes_per_session'] / 1024:.1f})  "
+                  f"{r['state_bytes'] / 2**20:.2f} MiB for all sessions, filled in {r['seconds']:.0f} s")
+
+if __name__ == "__main__":
+    main()
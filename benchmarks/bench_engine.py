@@ -0,0 +1,57 @@
+# benchmarks/bench_engine.py — batch engine throughput vs the row-by-row loop
+#
+#   python benchmarks/bench_engine.py --n 100000
+#
+# Generates random answer sets per tab, checks that riskradar.engine.score_batch
+# produces exactly the rows of the assess_tab-style loop (engine.score_record),
+# then reports assessments/second for both.
+import argparse, os, random, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from riskradar import engine, rules
+from riskradar.catalog import TABS, load_catalog
+
+def random_record(tab, rnd, n):
+    cat = load_catalog(tab)
+    items = cat.items
+    return {
+        "tab": tab, "project_name": f"Proj{n % 300}", "version": "25.3", "assessment_date": "2025-08-26",
+        "assessor": "bench",
+        "answers": {it[1]: rnd.choice(["Yes", "No"]) for it in items},
+        "P": {it[1]: rnd.randint(1, 3) for it in items if rnd.random() < 0.3},
+        "I": {it[1]: rnd.randint(1, 3) for it in items if rnd.random() < 0.3},
+        "evidence": {it[1]: f"https://jira.example/{n}" for it in items if rnd.random() < 0.2},
+        "weights": {c: rnd.randint(5, 20) / 10 for c in cat.weight_categories},
+        "release_status": rnd.choice(rules.RELEASE_STATUSES),
+        "release_url": f"https://release.example/{n}",
+        "defects": {s: rnd.randint(0, 3) for s in rules.SEVERITIES},
+    }
+
+def main():
+    ap = argparse.ArgumentParser(description="Batch scoring throughput benchmark")
+    ap.add_argument("--n", type=int, default=100000, help="assessments per tab")
+    args = ap.parse_args()
+    rnd = random.Random(3)
+
+    for tab in TABS:
+        records = [random_record(tab, rnd, n) for n in range(args.n)]
+        arrays = engine.records_to_arrays(tab, records)
+
+        t0 = time.perf_counter()
+        loop_rows = [row for r in records for row in engine.score_record(r)]
+        t_loop = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        rows, summary = engine.score_batch(tab, **arrays)
+        t_vec = time.perf_counter() - t0
+
+        expected = pd.DataFrame(loop_rows, columns=rules.RESULT_COLUMNS)
+        same = expected.to_csv(index=False) == rows.to_csv(index=False)
+        print(f"{tab:<8} n={args.n} identical={same} "
+              f"loop={args.n / t_loop:,.0f}/s vectorized={args.n / t_vec:,.0f}/s ({t_loop / t_vec:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/bench_export.py — peak memory and throughput of the bulk export
+#
+#   python benchmarks/bench_export.py --rows 1000000 --formats csv parquet xlsx --naive
+#
+# Writes --rows synthetic risk rows as results/*.csv files (--rows-per-file each)
+# into a temp dir, then exports them once per format, each in a fresh process
+# so peak RSS (ru_maxrss) belongs to that export alone. `--naive` adds the
+# load-everything baseline: pd.read_csv of every file, pd.concat, to_csv.
+# MB/s is input CSV bytes read per second of wall time.
+import argparse, csv, json, os, random, resource, subprocess, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def generate(out_dir, rows, per_file):
+    from riskradar.rules import RESULT_COLUMNS
+    rnd = random.Random(14)
+    cats = ["Tooling", "Quality", "Schedule", "Resources", "File Handling", "Release", "Process"]
+    for f in range(0, rows, per_file):
+        project, version = f"Proj{f // per_file % 500}", f"{f // per_file // 500}.0"
+        date = f"2025-{f // per_file % 12 + 1:02d}-{f // per_file % 28 + 1:02d}"
+        tab = ("L10n", "LocOps", "General")[f // per_file % 3]
+        body = []
+        for r in range(min(per_file, rows - f)):
+            p, i = rnd.randint(1, 3), rnd.randint(1, 3)
+            w = rnd.choice((0.5, 1.0, 1.5, 2.0))
+            body.append([project, version, date, tab, rnd.choice(cats), f"Risk {r}", p, i, p * i,
+                         round(p * i * w, 1), f"Mitigation for risk {r}", "", "", "QA"])
+        with open(os.path.join(out_dir, f"{project}_{version}_{date}_{tab}.csv"), "w", newline="") as fh:
+            w = csv.writer(fh)
+            w.writerow(RESULT_COLUMNS)
+            w.writerows(body)
+
+# ---------- Child ----------
+def child(fmt, src, dest):
+    t0 = time.perf_counter()
+    if fmt == "naive":
+        import glob
+        import pandas as pd
+        frames = [pd.read_csv(p) for p in sorted(glob.glob(os.path.join(src, "*.csv")))]
+        df = pd.concat(frames, ignore_index=True)
+        df.to_csv(dest, index=False)
+        n = len(df)
+    else:
+        from riskradar import export
+        n = export.export(dest, fmt, out_dir=src)
+    print(json.dumps({"rows": n, "seconds": time.perf_counter() - t0,
+                      "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}))
+
+def main():
+    ap = argparse.ArgumentParser(description="Bulk export peak RSS and MB/s")
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--rows-per-file", type=int, default=100)
+    ap.add_argument("--formats", nargs="+", default=["csv", "parquet", "xlsx"])
+    ap.add_argument("--naive", action="store_true", help="also run the pd.concat + to_csv baseline")
+    ap.add_argument("--child", nargs=3, metavar=("FMT", "SRC", "DEST"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.child:
+        return child(*args.child)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "results")
+        os.makedirs(src)
+        t0 = time.perf_counter()
+        generate(src, args.rows, args.rows_per_file)
+        size = sum(e.stat().st_size for e in os.scandir(src))
+        print(f"{args.rows:,} rows in {len(os.listdir(src)):,} files, {size / 1e6:.0f} MB "
+              f"(generated in {time.perf_counter() - t0:.1f} s)")
+        idle = subprocess.run([sys.executable, "-c", "import resource, pandas, pyarrow.parquet, riskradar.export; "
+                               "print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024)"],
+                              cwd=ROOT, capture_output=True, text=True)
+        if idle.returncode == 0:
+            print(f"{'imports only':<10} peak RSS {float(idle.stdout):7.0f} MB")
+        for fmt in args.formats + (["naive"] if args.naive else []):
+            dest = os.path.join(tmp, f"export.{'csv' if fmt == 'naive' else fmt}")
+            proc = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", fmt, src, dest],
+                                  capture_output=True, text=True)
+            if proc.returncode:
+                print(f"{fmt:<10} failed: {proc.stderr.strip().splitlines()[-1]}")
+                continue
+            r = json.loads(proc.stdout)
+            print(f"{fmt:<10} {r['rows']:>9,} rows  {r['seconds']:6.1f} s  {size / 1e6 / r['seconds']:6.1f} MB/s  "
+                  f"peak RSS {r['peak_rss_mb']:7.0f} MB  output {os.path.getsize(dest) / 1e6:6.0f} MB")
+            os.unlink(dest)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/bench_figures.py — RSS soak test for chart rendering
+#
+#   python benchmarks/bench_figures.py --reruns 10000
+#   python benchmarks/bench_figures.py --reruns 2000 --legacy   # pyplot figures, never closed
+#
+# Each "rerun" renders the heatmap of a random 3×3 grid drawn from --distinct
+# signatures (assessors mostly look at a handful of matrices). RSS is sampled
+# from /proc/self/status; flat RSS after warm-up means figures are released.
+import argparse, io, os, random, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def rss_mb():
+    with open("/proc/self/status") as fh:
+        for line in fh:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+def legacy_render(grid):
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots(figsize=(4.5, 4.5), dpi=120)
+    ax.imshow(grid, cmap="viridis")
+    for i in range(3):
+        for j in range(3):
+            ax.text(j, i, str(grid[i][j]), ha="center", va="center")
+    fig.tight_layout()
+    fig.savefig(io.BytesIO(), format="png", dpi=200, bbox_inches="tight")  # what st.pyplot does
+
+def main():
+    ap = argparse.ArgumentParser(description="Chart rendering RSS soak test")
+    ap.add_argument("--reruns", type=int, default=10000)
+    ap.add_argument("--distinct", type=int, default=200, help="distinct grid signatures in the workload")
+    ap.add_argument("--legacy", action="store_true")
+    args = ap.parse_args()
+
+    import matplotlib
+    matplotlib.use("agg")
+    from riskradar import charts
+
+    rnd = random.Random(5)
+    grids = [tuple(tuple(rnd.randint(0, 4) for _ in range(3)) for _ in range(3)) for _ in range(args.distinct)]
+    render = legacy_render if args.legacy else charts.heatmap_png
+    step = max(1, args.reruns // 10)
+    t0 = time.perf_counter()
+    print(f"mode={'legacy' if args.legacy else 'charts'} start rss={rss_mb():.1f} MB")
+    for n in range(1, args.reruns + 1):
+        render(rnd.choice(grids))
+        if n % step == 0:
+            print(f"reruns={n:>6} rss={rss_mb():7.1f} MB elapsed={time.perf_counter() - t0:6.1f} s")
+    if not args.legacy:
+        print(charts.cache_info()["heatmap"])
+
+if __name__ == "__main__":
+    main()
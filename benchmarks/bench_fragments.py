@@ -0,0 +1,133 @@
+# benchmarks/bench_fragments.py — what a widget edit costs in the browser: fragment reruns, not full reruns
+#
+#   python benchmarks/bench_fragments.py [--catalog-size 100] [--repeat 20]
+#   git show <rev>:streamlit_app.py > /tmp/old_app.py
+#   python benchmarks/bench_fragments.py --script /tmp/old_app.py   # same edits on an older revision
+#
+# AppTest executes the whole script on every run (bench_rerun.py). Here an edit
+# is replayed the way the browser sends it: as a rerun of the st.fragment that
+# rendered the widget, with the fragments kept across runs. Any escalation to a
+# full rerun (st.rerun() from inside a fragment) is part of the measured time,
+# and `runs` counts script executions per edit: 1 = the fragment only.
+# Link checks are off unless --link-checks is given (they escalate on purpose
+# when checks start and finish).
+import argparse, os, random, statistics, sys, tempfile, time
+from urllib import parse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from streamlit.runtime.fragment import MemoryFragmentStorage
+from streamlit.runtime.scriptrunner import RerunData, ScriptRunnerEvent
+from streamlit.testing.v1 import AppTest, app_test
+from streamlit.testing.v1.element_tree import parse_tree_from_messages
+from streamlit.testing.v1.local_script_runner import LocalScriptRunner, require_widgets_deltas
+
+class BrowserRunner(LocalScriptRunner):
+    """LocalScriptRunner that keeps fragments between runs and can rerun just one of them."""
+    fragments = MemoryFragmentStorage()  # AppTest gives every run a fresh one
+    owner = {}                           # widget id -> id of the fragment that rendered it
+    full_tree = None                     # element tree of the last full run
+    next_fragment = None                 # fragment id for the next run (None: full run)
+    runs = 0                             # script executions during the last run
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._fragment_storage = BrowserRunner.fragments
+
+    def run(self, widget_state=None, query_params=None, timeout=3, page_hash=""):
+        fragment_id, BrowserRunner.next_fragment = BrowserRunner.next_fragment, None
+        self.request_rerun(RerunData(widget_states=widget_state, page_script_hash=page_hash,
+                                     query_string=parse.urlencode(query_params or {}, doseq=True),
+                                     fragment_id_queue=[fragment_id] if fragment_id else []))
+        if not self._script_thread:
+            self.start()
+        require_widgets_deltas(self, timeout)
+        BrowserRunner.runs = self.events.count(ScriptRunnerEvent.SCRIPT_STARTED)
+        tree = parse_tree_from_messages(self.forward_msgs())
+        if fragment_id and BrowserRunner.runs == 1:
+            # Only the fragment's elements were sent; keep querying the full page
+            return tree if tree.exception else BrowserRunner.full_tree
+        BrowserRunner.full_tree = tree
+        BrowserRunner.owner = {}
+        for msg in self.forward_msgs():
+            if msg.HasField("delta") and msg.delta.fragment_id and msg.delta.HasField("new_element"):
+                element = msg.delta.new_element
+                widget = getattr(element, element.WhichOneof("type"))
+                if getattr(widget, "id", ""):
+                    BrowserRunner.owner[widget.id] = msg.delta.fragment_id
+        return tree
+
+app_test.LocalScriptRunner = BrowserRunner
+
+def edit(at, widget):
+    """Send a widget change like the browser: rerun the fragment it lives in, else the whole script."""
+    BrowserRunner.next_fragment = BrowserRunner.owner.get(widget.id)
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+
+def edits(at, tab, rnd):
+    from riskradar.catalog import key_for, load_catalog
+    cat = load_catalog(tab)
+    def page(at):
+        w = at.selectbox(key=key_for(tab, "checklist_page"))
+        return w.set_value((w.value + 1) % len(w.options))
+    def radio(at):
+        w = rnd.choice([r for r in at.radio if r.key in cat.answer_keys])
+        return w.set_value("No" if w.value == "Yes" else "Yes")
+    def evidence(at):
+        w = rnd.choice([t for t in at.text_input if t.key in cat.evidence_keys])
+        return w.set_value(f"https://jira.example/{rnd.random()}")
+    steps = [
+        ("radio", radio),
+        ("weight slider", lambda at: at.slider(key=rnd.choice(cat.weight_keys)).set_value(rnd.randint(5, 20) / 10)),
+        ("defect count", lambda at: at.number_input(key=key_for(tab, "def_major")).set_value(rnd.randint(0, 9))),
+        ("gate status", lambda at: at.selectbox(key=key_for(tab, "rel_status")).set_value(
+            rnd.choice(["Unknown", "Blocked", "Ready"]))),
+        ("evidence link", evidence),
+        ("assessor (header)", lambda at: at.text_input(key=key_for(tab, "Assessor")).set_value(f"QA{rnd.random()}")),
+    ]
+    if any(w.key == key_for(tab, "checklist_page") for w in at.selectbox):
+        steps.append(("checklist page", page))
+    return steps
+
+def main():
+    ap = argparse.ArgumentParser(description="Latency and script executions per widget edit, as the browser sends them")
+    ap.add_argument("--script", default=os.path.join(ROOT, "streamlit_app.py"))
+    ap.add_argument("--catalog-size", type=int, help="synthetic catalogs with this many questions per tab")
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--link-checks", action="store_true", help="leave evidence link checks on")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as cat_dir, tempfile.TemporaryDirectory() as out_dir:
+        os.environ["RISKRADAR_RESULTS_DIR"] = out_dir
+        if not args.link_checks:
+            os.environ["RISKRADAR_LINKCHECK"] = "0"
+        if args.catalog_size:
+            from bench_app import write_catalogs
+            write_catalogs(cat_dir, args.catalog_size)
+            os.environ["RISKRADAR_CATALOG_DIR"] = cat_dir
+        at = AppTest.from_file(os.path.abspath(args.script), default_timeout=600)
+        at.run()
+        at.text_input(key="L10n_Project").set_value("Bench"); at.text_input(key="L10n_Version").set_value("1.0"); at.run()
+
+        rnd = random.Random(3)
+        print(f"{'edit':<20} {'p50':>9} {'p95':>9}  runs/edit")
+        for label, act in edits(at, "L10n", rnd):
+            times, runs = [], []
+            for _ in range(args.repeat):
+                widget = act(at)
+                t0 = time.perf_counter(); edit(at, widget); times.append(time.perf_counter() - t0)
+                runs.append(BrowserRunner.runs)
+                if BrowserRunner.runs == 1 and BrowserRunner.owner.get(widget.id):
+                    # Untimed full run without widget changes: a fragment run can draw widgets the
+                    # queried page doesn't know yet (another checklist page)
+                    at._run()
+            times.sort()
+            print(f"{label:<20} {statistics.median(times) * 1e3:6.1f} ms {times[int(0.95 * (len(times) - 1))] * 1e3:6.1f} ms"
+                  f"  {sum(runs) / len(runs):.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+# benchmarks/bench_linkcheck.py — link validation throughput against local stand-in servers
+#
+#   python benchmarks/bench_linkcheck.py --links 2000 --hosts 4 --latency 50
+#
+# Starts --hosts ThreadingHTTPServers (HTTP/1.1 keep-alive, one per port, so one
+# "host" each) in a child process. Each answers after --latency ms: /ok/* → 200,
+# /dead/* → 404, /nohead/* → 405 to HEAD but 200 to GET, /slow/* → after the
+# client timeout, /status/<code>/* → that code (tests/test_linkcheck.py uses the
+# same server). The same links are then checked
+#   sequential  one blocking request at a time, new connection each (urllib)
+#   linkcheck   riskradar.linkcheck.check(): asyncio, bounded concurrency, keep-alive
+#   cached      the same call again, answered from the TTL cache
+# reporting links/s and how many TCP connections the servers accepted.
+# Results are compared with the expected status of every link.
+import argparse, http.server, json, os, random, socketserver, subprocess, sys, threading, time
+import urllib.error, urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+KINDS = {"ok": True, "dead": False, "nohead": True, "slow": False}
+
+# ---------- Stand-in server (child) ----------
+def serve(ports, latency, slow):
+    connections = {"n": 0}
+    lock = threading.Lock()
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            with lock:
+                connections["n"] += 1
+            super().setup()
+
+        def _answer(self, head):
+            kind = self.path.split("/")[1]
+            if kind == "stats":
+                body = json.dumps(connections).encode()
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            time.sleep(slow if kind == "slow" else latency)
+            code = {"ok": 200, "dead": 404, "nohead": 405 if head else 200}.get(kind, 200)
+            if kind == "status":
+                code = int(self.path.split("/")[2])
+            body = b"" if head else b"x" * 512
+            self.send_response(code)
+            self.send_header("Content-Length", "512")
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_HEAD(self):
+            self._answer(True)
+
+        def do_GET(self):
+            self._answer(False)
+
+        def log_message(self, *args):
+            pass
+
+    class Server(socketserver.ThreadingMixIn, http.server.HTTPServer):
+        daemon_threads = True
+        request_queue_size = 512
+
+        def handle_error(self, request, client_address):
+            pass  # broken pipes from the /slow/ links the client gave up on
+
+    servers = [Server(("127.0.0.1", p), Handler) for p in ports]
+    for s in servers[1:]:
+        threading.Thread(target=s.serve_forever, daemon=True).start()
+    print("ready", flush=True)
+    servers[0].serve_forever()
+
+# ---------- Driver ----------
+def accepted(port) -> int:
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/stats") as resp:
+        return json.load(resp)["n"]
+
+def sequential(urls, timeout):
+    out = {}
+    for url in urls:
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, method="HEAD"), timeout=timeout) as resp:
+                out[url] = resp.status < 400
+        except urllib.error.HTTPError as e:
+            if e.code == 405:
+                try:
+                    with urllib.request.urlopen(url, timeout=timeout) as resp:
+                        out[url] = resp.status < 400
+                        continue
+                except OSError:
+                    pass
+            out[url] = False
+        except OSError:
+            out[url] = False
+    return out
+
+def main():
+    ap = argparse.ArgumentParser(description="Link validation throughput against local stand-in servers")
+    ap.add_argument("--links", type=int, default=2000)
+    ap.add_argument("--hosts", type=int, default=4)
+    ap.add_argument("--latency", type=float, default=50, help="ms per response")
+    ap.add_argument("--dead", type=float, default=0.1, help="share of 404 links")
+    ap.add_argument("--slow", type=int, default=5, help="links that time out")
+    ap.add_argument("--timeout", type=float, default=1.0, help="client timeout, seconds")
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[8, 32, 128])
+    ap.add_argument("--per-host", type=int, default=32)
+    ap.add_argument("--sequential", type=int, default=200, help="links for the sequential baseline (0 = skip)")
+    ap.add_argument("--port", type=int, default=18700)
+    ap.add_argument("--serve", nargs=3, metavar=("PORTS", "LATENCY", "SLOW"), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.serve:
+        return serve([int(p) for p in args.serve[0].split(",")], float(args.serve[1]), float(args.serve[2]))
+
+    from riskradar import linkcheck
+    ports = [args.port + i for i in range(args.hosts)]
+    server = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", ",".join(map(str, ports)),
+                               str(args.latency / 1e3), str(args.timeout * 3)], stdout=subprocess.PIPE, text=True)
+    try:
+        assert server.stdout.readline().strip() == "ready"
+        rnd = random.Random(18)
+        expect = {}
+        for n in range(args.links):
+            kind = "slow" if n < args.slow else "dead" if rnd.random() < args.dead else rnd.choice(("ok", "ok", "nohead"))
+            expect[f"http://127.0.0.1:{rnd.choice(ports)}/{kind}/{n}"] = KINDS[kind]
+        urls = list(expect)
+        print(f"{len(urls)} links on {args.hosts} hosts, {args.latency:.0f} ms per response, "
+              f"{sum(not v for v in expect.values())} unverifiable")
+
+        def conns():
+            return accepted(ports[0])  # one counter for all servers; each call adds one connection itself
+
+        if args.sequential:
+            sample = urls[args.slow:args.slow + args.sequential]  # the timeouts would dominate
+            c0, t0 = conns(), time.perf_counter()
+            got = sequential(sample, args.timeout)
+            dt = time.perf_counter() - t0
+            assert all(got[u] == expect[u] for u in sample), "sequential baseline disagrees"
+            print(f"{'sequential':<16} {len(sample):>6} links  {dt:7.2f} s  {len(sample) / dt:8.0f} links/s  "
+                  f"{conns() - c0 - 1:>6} connections")
+        for conc in args.concurrency:
+            linkcheck.clear()
+            c0, t0 = conns(), time.perf_counter()
+            got = linkcheck.check(urls, conc, args.per_host, args.timeout)
+            dt = time.perf_counter() - t0
+            wrong = [u for u in urls if got[u].ok != expect[u]]
+            assert not wrong, f"{len(wrong)} links misjudged, e.g. {wrong[0]}: {got[wrong[0]]}"
+            print(f"{f'linkcheck c={conc}':<16} {len(urls):>6} links  {dt:7.2f} s  {len(urls) / dt:8.0f} links/s  "
+                  f"{conns() - c0 - 1:>6} connections")
+        t0 = time.perf_counter()
+        linkcheck.check(urls)
+        dt = time.perf_counter() - t0
+        print(f"{'cached':<16} {len(urls):>6} links  {dt * 1e3:7.1f} ms  {len(urls) / dt:8.0f} links/s")
+    finally:
+        server.kill()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# benchmarks/bench_matrix.py — portfolio risk matrix: re-filter latency
+#
+#   python benchmarks/bench_matrix.py --rows 500000
+#
+# Builds a synthetic portfolio frame (same dtypes as riskradar.portfolio),
+# then answers --queries random filter combinations (tabs, categories,
+# projects, date range) three ways and checks they agree:
+#   rows loop : pandas filter + per-row loop into a 3×3 grid (the old plot_heatmap way)
+#   pandas    : pandas filter + groupby(P, I).size()
+#   matrix    : riskradar.matrix partial counts
+import argparse, os, random, statistics, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+CATS = ["Tooling", "Quality", "Schedule", "Resources", "File Handling", "Release", "Quality Metrics"]
+
+def synthetic_frame(n, rnd):
+    g = np.random.default_rng(rnd.randrange(1 << 30))
+    dates = pd.date_range("2024-01-01", periods=600).strftime("%Y-%m-%d")
+    P, I = g.integers(1, 4, n), g.integers(1, 4, n)
+    return pd.DataFrame({
+        "project_name": pd.Categorical.from_codes(g.integers(0, 400, n), [f"Proj{i}" for i in range(400)]),
+        "assessment_date": pd.Categorical.from_codes(g.integers(0, len(dates), n), dates),
+        "tab": pd.Categorical.from_codes(g.integers(0, 3, n), ["General", "L10n", "LocOps"]),
+        "category": pd.Categorical.from_codes(g.integers(0, len(CATS), n), CATS),
+        "risk_name": pd.Categorical.from_codes(g.integers(0, 50, n), [f"Risk {i}" for i in range(50)]),
+        "possibility": P.astype(float), "impact": I.astype(float), "score": (P * I).astype(float),
+    })
+
+def random_filters(rnd):
+    f = {}
+    if rnd.random() < 0.5:
+        f["tabs"] = rnd.sample(["General", "L10n", "LocOps"], rnd.randint(1, 2))
+    if rnd.random() < 0.5:
+        f["categories"] = rnd.sample(CATS, rnd.randint(1, 4))
+    if rnd.random() < 0.3:
+        f["projects"] = [f"Proj{rnd.randrange(400)}" for _ in range(rnd.randint(1, 20))]
+    if rnd.random() < 0.5:
+        lo = pd.Timestamp("2024-01-01") + pd.Timedelta(days=rnd.randrange(500))
+        f["date_from"], f["date_to"] = lo.date(), (lo + pd.Timedelta(days=rnd.randint(7, 180))).date()
+    return f
+
+def filtered(frame, f):
+    m = np.ones(len(frame), dtype=bool)
+    for col, key in (("tab", "tabs"), ("category", "categories"), ("project_name", "projects")):
+        if f.get(key):
+            m &= frame[col].isin(f[key]).to_numpy()
+    if f.get("date_from"):
+        d = frame["assessment_date"].astype(str)
+        m &= ((d >= str(f["date_from"])) & (d <= str(f["date_to"]))).to_numpy()
+    return frame[m]
+
+def rows_loop(frame, f):
+    grid = [[0, 0, 0], [0, 0, 0], [0, 0, 0]]
+    sub = filtered(frame, f)
+    for P, I in zip(sub["possibility"], sub["impact"]):
+        grid[int(P) - 1][int(I) - 1] += 1
+    return np.array(grid)
+
+def pandas_groupby(frame, f):
+    sizes = filtered(frame, f).groupby(["possibility", "impact"]).size()
+    grid = np.zeros((3, 3), dtype=np.int64)
+    for (P, I), c in sizes.items():
+        grid[int(P) - 1, int(I) - 1] = c
+    return grid
+
+def main():
+    ap = argparse.ArgumentParser(description="Portfolio risk matrix re-filter benchmark")
+    ap.add_argument("--rows", type=int, default=500_000)
+    ap.add_argument("--queries", type=int, default=30)
+    args = ap.parse_args()
+    from riskradar.matrix import MatrixIndex
+
+    rnd = random.Random(11)
+    frame = synthetic_frame(args.rows, rnd)
+    t0 = time.perf_counter()
+    index = MatrixIndex(frame)
+    print(f"rows={len(frame)} groups={len(index.partials)} index build {time.perf_counter() - t0:.3f} s")
+
+    queries = [random_filters(rnd) for _ in range(args.queries)]
+    results = {}
+    for label, fn in [("rows loop", lambda f: rows_loop(frame, f)), ("pandas", lambda f: pandas_groupby(frame, f)),
+                      ("matrix", lambda f: index.counts(**f))]:
+        times, grids = [], []
+        for f in queries:
+            t0 = time.perf_counter()
+            grids.append(fn(f))
+            times.append(time.perf_counter() - t0)
+        results[label] = grids
+        times.sort()
+        print(f"{label:<10} p50 {statistics.median(times) * 1e3:9.2f} ms   p95 {times[int(0.95 * (len(times) - 1))] * 1e3:9.2f} ms")
+    assert all((a == b).all() and (a == c).all() for a, b, c in zip(*results.values())), "matrices differ"
+
+    times = []
+    for f in queries:
+        t0 = time.perf_counter()
+        index.rows(3, 3, **f)
+        times.append(time.perf_counter() - t0)
+    print(f"drilldown  p50 {statistics.median(times) * 1e3:9.2f} ms")
+    print("all methods agree")
+
+if __name__ == "__main__":
+    main()
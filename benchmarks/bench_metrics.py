@@ -0,0 +1,36 @@
+# benchmarks/bench_metrics.py — per-span overhead of riskradar.metrics
+#
+#   python benchmarks/bench_metrics.py --spans 1000000
+#
+# Times an empty `with` block three ways: no instrumentation, metrics disabled
+# (the shared no-op) and enabled (histograms only, no JSONL sink).
+import argparse, contextlib, os, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def per_span_ns(make, n):
+    t0 = time.perf_counter()
+    for _ in range(n):
+        with make():
+            pass
+    return (time.perf_counter() - t0) / n * 1e9
+
+def main():
+    ap = argparse.ArgumentParser(description="riskradar.metrics span overhead")
+    ap.add_argument("--spans", type=int, default=1_000_000)
+    args = ap.parse_args()
+
+    from riskradar import metrics
+    if metrics.enabled():
+        sys.exit("unset RISKRADAR_METRICS_PORT / RISKRADAR_METRICS_FILE first")
+    bare = contextlib.nullcontext()
+    base = per_span_ns(lambda: bare, args.spans)
+    off = per_span_ns(lambda: metrics.span("phase", "L10n"), args.spans)
+    metrics.configure()
+    on = per_span_ns(lambda: metrics.span("phase", "L10n"), args.spans)
+    print(f"baseline {base:7.0f} ns/span")
+    print(f"disabled {off:7.0f} ns/span (+{off - base:.0f})")
+    print(f"enabled  {on:7.0f} ns/span (+{on - base:.0f})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# benchmarks/bench_portfolio.py — cold vs warm portfolio loads over a synthetic results/ folder
+#
+#   python benchmarks/bench_portfolio.py --files 50000
+#
+# cold        : no .portfolio cache, every CSV parsed
+# warm (disk) : new process — manifest + Feather read, one directory scan
+# warm (mem)  : same process — directory scan only
+# incremental : 1% of files rewritten/added, only those re-parsed
+import argparse, os, random, sys, tempfile, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HEADER = ("project_name,version,assessment_date,tab,category,risk_name,possibility,impact,score,"
+          "weighted_score,mitigation,evidence,defects_summary,assessor\n")
+CATS = ["Tooling", "Quality", "Schedule", "Resources", "File Handling", "Release", "Quality Metrics"]
+
+def write_file(out_dir, i, rnd):
+    project, tab = f"Proj{i % 400}", rnd.choice(["L10n", "LocOps", "General"])
+    date = f"2025-{1 + i % 12:02d}-{1 + i % 28:02d}"
+    lines = [HEADER]
+    for k in range(rnd.randint(3, 15)):
+        p, im = rnd.randint(1, 3), rnd.randint(1, 3)
+        lines.append(f"{project},{i % 7}.{i % 5},{date},{tab},{rnd.choice(CATS)},Risk {k},{p},{im},{p * im},"
+                     f"{p * im:.1f},Mitigate,,,bench\n")
+    with open(os.path.join(out_dir, f"{project}_{i}_{date}_{tab}.csv"), "w") as fh:
+        fh.writelines(lines)
+
+def timed(label, fn):
+    t0 = time.perf_counter()
+    frame = fn()
+    print(f"{label:<13} {time.perf_counter() - t0:8.3f} s  rows={len(frame)}")
+    return frame
+
+def main():
+    ap = argparse.ArgumentParser(description="Portfolio cold/warm load benchmark")
+    ap.add_argument("--files", type=int, default=50000)
+    args = ap.parse_args()
+    rnd = random.Random(7)
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        for i in range(args.files):
+            write_file(out_dir, i, rnd)
+        from riskradar import portfolio
+
+        timed("cold", lambda: portfolio.load_portfolio(out_dir))
+        portfolio._memo.clear()
+        timed("warm (disk)", lambda: portfolio.load_portfolio(out_dir))
+        frame = timed("warm (mem)", lambda: portfolio.load_portfolio(out_dir))
+
+        t0 = time.perf_counter()
+        portfolio.assessments(frame); portfolio.top_red_flags(frame); portfolio.category_totals(frame)
+        print(f"{'views':<13} {time.perf_counter() - t0:8.3f} s")
+
+        n = max(1, args.files // 100)
+        for i in rnd.sample(range(args.files), n):
+            write_file(out_dir, i, rnd)
+        for i in range(args.files, args.files + n):
+            write_file(out_dir, i, rnd)
+        timed("incremental", lambda: portfolio.load_portfolio(out_dir))
+
+if __name__ == "__main__":
+    main()
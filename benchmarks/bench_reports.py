@@ -0,0 +1,65 @@
+# benchmarks/bench_reports.py — batch report throughput vs worker count
+#
+#   python benchmarks/bench_reports.py --projects 100 --workers 1 2 4 --format html
+#
+# Writes --projects projects × 3 tabs of saved assessments into a temp results/
+# folder, then runs riskradar.reports.generate for each --workers count:
+#   cold       empty figure cache, every distinct chart rendered
+#   figures    figure cache warm, reports rebuilt (--force is not used; the
+#              report manifest is cleared instead)
+#   unchanged  nothing to do: every report's inputs hash as before
+# Throughput is reports per second per worker over the render phase. Projects
+# are drawn from --distinct answer patterns, so identical inputs share charts.
+import argparse, os, random, shutil, sys, tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+HEADER = ("project_name,version,assessment_date,tab,category,risk_name,possibility,impact,score,"
+          "weighted_score,mitigation,evidence,defects_summary,assessor\n")
+CATS = ["Tooling", "Quality", "Schedule", "Resources", "File Handling", "Release", "Quality Metrics"]
+
+def write_results(out_dir, projects, distinct, rnd):
+    patterns = []
+    for _ in range(distinct):
+        rows = []
+        for k in range(rnd.randint(4, 14)):
+            p, i = rnd.randint(1, 3), rnd.randint(1, 3)
+            rows.append(f"{rnd.choice(CATS)},Risk {k},{p},{i},{p * i},{p * i:.1f},Mitigation for risk {k}")
+        patterns.append(rows)
+    for n in range(projects):
+        for t, tab in enumerate(("L10n", "LocOps", "General")):
+            lines = [HEADER] + [f"Proj{n},25.3,2025-09-01,{tab},{r},,,bench\n"
+                                for r in patterns[rnd.randrange(distinct)]]
+            with open(os.path.join(out_dir, f"Proj{n}_25.3_2025-09-01_{tab}.csv"), "w") as fh:
+                fh.writelines(lines)
+
+def show(label, r):
+    print(f"  {label:<10} {r['written']:>5} reports  {r['charts_rendered']:>5}/{r['charts']} charts rendered  "
+          f"render {r['render_seconds']:6.2f} s  total {r['seconds']:6.2f} s  "
+          f"{r['per_second_per_core']:6.1f} reports/s/core")
+
+def main():
+    ap = argparse.ArgumentParser(description="Batch report throughput")
+    ap.add_argument("--projects", type=int, default=100)
+    ap.add_argument("--distinct", type=int, default=20, help="distinct assessment patterns to draw from")
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--format", choices=("html", "pdf"), default="html")
+    args = ap.parse_args()
+    from riskradar import charts, portfolio, reports
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        write_results(out_dir, args.projects, args.distinct, random.Random(16))
+        frame = portfolio.load_portfolio(out_dir)
+        print(f"{args.projects} projects × 3 tabs, {len(frame)} risk rows, {os.cpu_count()} CPUs")
+        for w in args.workers:
+            print(f"workers={w}")
+            shutil.rmtree(os.path.join(out_dir, reports.CACHE_DIRNAME), ignore_errors=True)
+            charts.heatmap_png.cache_clear()  # forked workers would inherit the parent's renders
+            charts.radar_png.cache_clear()
+            show("cold", reports.generate(fmt=args.format, workers=w, out_dir=out_dir, frame=frame))
+            os.unlink(os.path.join(out_dir, reports.CACHE_DIRNAME, "manifest.json"))
+            show("figures", reports.generate(fmt=args.format, workers=w, out_dir=out_dir, frame=frame))
+            show("unchanged", reports.generate(fmt=args.format, workers=w, out_dir=out_dir, frame=frame))
+
+if __name__ == "__main__":
+    main()
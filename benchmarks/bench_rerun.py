@@ -0,0 +1,61 @@
+# benchmarks/bench_rerun.py — per-interaction server latency of an entry point (streamlit.testing AppTest)
+#
+#   python benchmarks/bench_rerun.py                          # current streamlit_app.py
+#   git show <rev>:streamlit_app.py > /tmp/old_app.py
+#   python benchmarks/bench_rerun.py --script /tmp/old_app.py # same interactions on an older revision
+#
+# AppTest always executes the whole script, so this measures full reruns; the
+# fragment reruns a browser sends for widgets below a tab's header are
+# measured by bench_fragments.py.
+import argparse, os, statistics, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest
+
+def interactions(tab):
+    k = lambda name: f"{tab}_{name}"
+    n = {"i": 0}
+    def bump():
+        n["i"] += 1
+        return n["i"]
+    return [
+        ("toggle radio", lambda at: at.radio(key=k("Drops_misaligned")).set_value(
+            "No" if at.radio(key=k("Drops_misaligned")).value == "Yes" else "Yes")),
+        ("move weight slider", lambda at: at.slider(key=k("wt_Tooling")).set_value(0.5 + (bump() % 15) / 10)),
+        ("enter defect count", lambda at: at.number_input(key=k("def_major")).set_value(bump() % 9)),
+        ("type evidence link", lambda at: at.text_input(key=k("Wrong_clone_URLs_evi")).set_value(f"https://jira.example/{bump()}")),
+    ]
+
+def main():
+    ap = argparse.ArgumentParser(description="Per-interaction rerun latency")
+    ap.add_argument("--script", default=os.path.join(ROOT, "streamlit_app.py"))
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        os.environ["RISKRADAR_RESULTS_DIR"] = out_dir
+        at = AppTest.from_file(os.path.abspath(args.script), default_timeout=120)
+        t0 = time.perf_counter(); at.run(); first = time.perf_counter() - t0
+        at.text_input(key="L10n_Project").set_value("Bench"); at.text_input(key="L10n_Version").set_value("1.0"); at.run()
+        print(f"{'first render':<22} {first * 1e3:8.1f} ms")
+
+        steps = interactions("L10n")
+        has_view = any(r.key == "view" for r in at.radio)
+        if has_view:
+            steps.append(("switch tab", lambda at: at.radio(key="view").set_value(
+                "LocOps" if at.radio(key="view").value == "L10n" else "L10n")))
+        for label, act in steps:
+            times = []
+            for _ in range(args.repeat):
+                act(at)
+                t0 = time.perf_counter(); at.run(); times.append(time.perf_counter() - t0)
+                assert not at.exception, at.exception
+            if label == "switch tab" and at.radio(key="view").value != "L10n":
+                at.radio(key="view").set_value("L10n").run()
+            times.sort()
+            print(f"{label:<22} p50={statistics.median(times) * 1e3:7.1f} ms  p95={times[int(0.95 * (len(times) - 1))] * 1e3:7.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/bench_sensitivity.py — latency of the what-if sweep
+#
+#   python benchmarks/bench_sensitivity.py --items 30 100 300 --scenarios 10000
+#
+# Random assessments with --items risky checklist items (plus the release and
+# defect risks) are analyzed with riskradar.sensitivity.analyze; p50/p95 are
+# reported per size. Before timing, the vectorized rating and the exact flip
+# thresholds are checked against rules.score_to_rating evaluated in Python.
+import argparse, os, random, statistics, sys, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+def random_assessment(k, rnd):
+    cats = ["Tooling", "Quality", "Schedule", "Resources", "File Handling"]
+    items = [(rnd.choice(cats), f"Risk {n}", rnd.randint(1, 3), rnd.randint(1, 3)) for n in range(k)]
+    fixed = [("Release", "Release tracker unclear/blocked", 2, 3)]
+    weights = {c: rnd.choice([0.5, 1.0, 1.5, 2.0]) for c in cats + ["Release", "Quality Metrics", "Process"]}
+    return items, fixed, weights
+
+def check(sensitivity, rules, rnd):
+    totals, maxes = np.meshgrid(np.arange(0, 400), sensitivity.CELL_SCORES)
+    codes = sensitivity.rating_codes(totals, maxes)
+    for t, m, c in zip(totals.ravel(), maxes.ravel(), codes.ravel()):
+        assert sensitivity.RATINGS[c] == rules.score_to_rating(int(t), int(m))
+    for _ in range(50):
+        items, fixed, weights = random_assessment(rnd.randint(1, 8), rnd)
+        res = sensitivity.analyze(items, fixed, weights, scenarios=100)
+        scores = [p * i for _, _, p, i in items + fixed]
+        for row in res["items"].itertuples():
+            k = [r[1] for r in items].index(row.risk_name)
+            def rating_with(s):
+                alt = scores[:k] + [s] + scores[k + 1:]
+                return sensitivity.RATINGS.index(rules.score_to_rating(sum(alt), max(alt)))
+            base = sensitivity.RATINGS.index(res["rating"])
+            worse = [s for s in sensitivity.CELL_SCORES if rating_with(s) < base]
+            better = [s for s in sensitivity.CELL_SCORES if rating_with(s) > base]
+            assert row.worse_at_score == (min(worse) if worse else 0)
+            assert row.better_at_score == (max(better) if better else 0)
+
+def main():
+    ap = argparse.ArgumentParser(description="What-if sensitivity sweep latency")
+    ap.add_argument("--items", type=int, nargs="+", default=[30, 100, 300])
+    ap.add_argument("--scenarios", type=int, default=10_000)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+    from riskradar import rules, sensitivity
+
+    rnd = random.Random(13)
+    check(sensitivity, rules, rnd)
+    print("vectorized rating and flip thresholds match rules.score_to_rating")
+    for k in args.items:
+        items, fixed, weights = random_assessment(k, rnd)
+        times = []
+        for n in range(args.repeat):
+            t0 = time.perf_counter()
+            res = sensitivity.analyze(items, fixed, weights, scenarios=args.scenarios, seed=n)
+            times.append(time.perf_counter() - t0)
+        times.sort()
+        share = ", ".join(f"{r} {v:.0%}" for r, v in res["rating_share"].items())
+        print(f"items={k:>4} scenarios={args.scenarios}  p50 {statistics.median(times) * 1e3:6.1f} ms  "
+              f"p95 {times[int(0.95 * (len(times) - 1))] * 1e3:6.1f} ms   base={res['rating']} ({share})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# benchmarks/bench_startup.py — cold-start / time-to-first-render of the Streamlit entry points
+#
+#   python benchmarks/bench_startup.py                       # streamlit_app.py and app.py, 5 cold runs each
+#   python benchmarks/bench_startup.py --rev HEAD~1          # same, plus the scripts as of a git revision
+#   python benchmarks/bench_startup.py --cold-fonts --importtime 15
+#
+# Every run is a fresh `python -X importtime` process driving the script once
+# through AppTest. Two moments are taken from process spawn:
+#   first_paint_ms   st.set_page_config() is called — the first message the browser gets
+#   first_render_ms  the whole first script run (incl. summary/heatmap) has finished
+# The importtime stream is split at first paint, so `--importtime N` lists the
+# N slowest top-level imports the first paint had to wait for.
+# `--cold-fonts` gives every run an empty MPLCONFIGDIR (no matplotlib font cache).
+import argparse, json, os, statistics, subprocess, sys, tempfile, time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("numpy", "pandas", "pyarrow", "matplotlib")
+MARK = "--- first paint ---"
+
+# ---------- Child ----------
+def child(script, spawned_at):
+    sys.path.insert(0, ROOT)
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+    paint = {}
+    set_page_config = st.set_page_config
+
+    def timed_set_page_config(*args, **kwargs):
+        if not paint:
+            paint["ms"] = (time.time() - spawned_at) * 1e3
+            paint["heavy"] = [m for m in HEAVY if m in sys.modules]
+            sys.stderr.write(MARK + "\n")
+        return set_page_config(*args, **kwargs)
+
+    st.set_page_config = timed_set_page_config
+    at = AppTest.from_file(script, default_timeout=120)
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].value)
+    rendered = time.time()
+    from riskradar import warmup
+    warmup.wait()
+    print(json.dumps({"first_paint_ms": paint.get("ms"), "first_render_ms": (rendered - spawned_at) * 1e3,
+                      "loaded_before_paint": paint.get("heavy", [])}))
+
+# ---------- Parent ----------
+def before_paint_imports(stderr):
+    """(cumulative_us, module) of top-level imports logged before the first-paint marker."""
+    out = []
+    for line in stderr.split(MARK)[0].splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit() and not name.startswith("  "):  # nested imports are indented
+            out.append((int(cumulative), name.strip()))
+    return sorted(out, reverse=True)
+
+def run_once(script, cold_fonts):
+    env = dict(os.environ)
+    with tempfile.TemporaryDirectory() as mpl_dir, tempfile.TemporaryDirectory() as res_dir:
+        if cold_fonts:
+            env["MPLCONFIGDIR"] = mpl_dir
+        env["RISKRADAR_RESULTS_DIR"] = res_dir
+        t0 = time.time()
+        proc = subprocess.run([sys.executable, "-X", "importtime", __file__, "--child", script, repr(t0)],
+                              env=env, capture_output=True, text=True, cwd=ROOT)
+    if proc.returncode:
+        sys.exit(f"{script} failed:\n{proc.stderr[-3000:]}")
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    result["imports"] = before_paint_imports(proc.stderr)
+    return result
+
+def checkout(rev, name, dst):
+    src = subprocess.run(["git", "show", f"{rev}:{name}"], cwd=ROOT, capture_output=True, text=True, check=True).stdout
+    path = os.path.join(dst, f"{rev.replace('/', '_').replace('~', '_')}_{name}")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(src)
+    return path
+
+def main():
+    ap = argparse.ArgumentParser(description="Cold-start and time-to-first-render of the Streamlit scripts")
+    ap.add_argument("--scripts", nargs="+", default=["streamlit_app.py", "app.py"])
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--rev", help="also measure the scripts as of this git revision")
+    ap.add_argument("--cold-fonts", action="store_true", help="empty matplotlib font cache for every run")
+    ap.add_argument("--importtime", type=int, default=0, metavar="N", help="show the N slowest pre-paint imports")
+    ap.add_argument("--report", help="write JSON results here")
+    ap.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        child(args.child[0], float(args.child[1]))
+        return
+
+    report = []
+    with tempfile.TemporaryDirectory() as old_dir:
+        targets = [(name, os.path.join(ROOT, name)) for name in args.scripts]
+        if args.rev:
+            targets += [(f"{name}@{args.rev}", checkout(args.rev, name, old_dir)) for name in args.scripts]
+        for label, path in targets:
+            runs = [run_once(path, args.cold_fonts) for _ in range(args.runs)]
+            paint = statistics.median(r["first_paint_ms"] for r in runs)
+            render = statistics.median(r["first_render_ms"] for r in runs)
+            report.append({"script": label, "first_paint_ms": paint, "first_render_ms": render,
+                           "loaded_before_paint": runs[0]["loaded_before_paint"],
+                           "slowest_imports": runs[0]["imports"][:max(args.importtime, 10)]})
+            print(f"{label:<28} first paint {paint:7.0f} ms   first render {render:7.0f} ms   "
+                  f"heavy before paint: {', '.join(runs[0]['loaded_before_paint']) or '-'}")
+            for us, name in runs[0]["imports"][:args.importtime]:
+                print(f"    {us / 1e3:8.1f} ms  {name}")
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+
+if __name__ == "__main__":
+    main()
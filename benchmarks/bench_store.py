@@ -0,0 +1,78 @@
+# benchmarks/bench_store.py — writes per rerun & save latency with N concurrent sessions
+#
+#   python benchmarks/bench_store.py --sessions 16 --reruns 300 --edit-every 10
+#   python benchmarks/bench_store.py --sessions 16 --same-key      # everyone on one assessment
+#   python benchmarks/bench_store.py --legacy                      # old df.to_csv on every rerun
+#
+# Each session simulates Streamlit reruns: most reruns carry identical rows (a
+# widget elsewhere changed), every --edit-every-th rerun edits an evidence link.
+import argparse, os, statistics, sys, tempfile, threading, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+COLS = ["project_name","version","assessment_date","tab","category","risk_name","possibility","impact",
+        "score","weighted_score","mitigation","evidence","defects_summary","assessor"]
+
+def make_df(project, edit):
+    rows = [[project, "25.3", "2025-08-26", "L10n", "Tooling", f"Risk {i}", 2, 3, 6, 6.0,
+             "Mitigate", f"https://jira.example/ISSUE-{edit}-{i}", "", "bench"] for i in range(15)]
+    return pd.DataFrame(rows, columns=COLS)
+
+def legacy_save(out_dir, project, df):
+    df.to_csv(os.path.join(out_dir, f"{project}_25.3_2025-08-26_L10n.csv"), index=False, encoding="utf-8")
+
+def session(idx, args, out_dir, latencies, save):
+    project = "Shared" if args.same_key else f"Proj{idx}"
+    edit = 0
+    df = make_df(project, edit)
+    for n in range(args.reruns):
+        if n % args.edit_every == 0:
+            edit += 1
+            df = make_df(project, f"{idx}.{edit}")
+        t0 = time.perf_counter()
+        save(project, df)
+        latencies.append(time.perf_counter() - t0)
+
+def main():
+    ap = argparse.ArgumentParser(description="Assessment store write benchmark")
+    ap.add_argument("--sessions", type=int, default=8)
+    ap.add_argument("--reruns", type=int, default=200)
+    ap.add_argument("--edit-every", type=int, default=10)
+    ap.add_argument("--same-key", action="store_true")
+    ap.add_argument("--legacy", action="store_true")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        os.environ["RISKRADAR_RESULTS_DIR"] = out_dir
+        from riskradar import store
+
+        writes = {"n": 0}
+        if args.legacy:
+            def save(project, df):
+                legacy_save(out_dir, project, df)
+                writes["n"] += 1
+        else:
+            def save(project, df):
+                store.save_results_csv(project, "25.3", "L10n", df, "2025-08-26")
+
+        latencies = []
+        threads = [threading.Thread(target=session, args=(i, args, out_dir, latencies, save))
+                   for i in range(args.sessions)]
+        t0 = time.perf_counter()
+        for t in threads: t.start()
+        for t in threads: t.join()
+        wall = time.perf_counter() - t0
+
+        total = args.sessions * args.reruns
+        n_writes = writes["n"] if args.legacy else store.stats()["writes"]
+        lat = sorted(latencies)
+        p95 = lat[int(0.95 * (len(lat) - 1))]
+        print(f"mode={'legacy' if args.legacy else 'store'} sessions={args.sessions} reruns/session={args.reruns}")
+        print(f"reruns={total} file writes={n_writes} writes/rerun={n_writes / total:.3f}")
+        print(f"save latency p50={statistics.median(lat) * 1e3:.3f} ms p95={p95 * 1e3:.3f} ms "
+              f"max={lat[-1] * 1e3:.3f} ms wall={wall:.2f} s")
+
+if __name__ == "__main__":
+    main()
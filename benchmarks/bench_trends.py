@@ -0,0 +1,56 @@
+# benchmarks/bench_trends.py — per-save cost of the trend aggregates as history grows
+#
+#   python benchmarks/bench_trends.py --projects 50 --weeks 520
+#
+# Replays --weeks weekly assessments (3 tabs each) for --projects projects in
+# chronological order against a temporary store, timing each save's trend
+# update in its own transaction. Printed per 10% of history: the incremental
+# update (riskradar.trends.record) next to a recompute of the project's weekly
+# series from all of its points, which grows with history.
+import argparse, datetime, os, random, statistics, sys, tempfile, time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+RECOMPUTE = ("SELECT strftime('%Y-%m-%d', assessment_date, 'weekday 0', '-6 days') AS week, COUNT(*), "
+             "SUM(total_score), SUM(weighted_score), SUM(high_count), SUM(blocker), SUM(critical), SUM(major), "
+             "SUM(minor) FROM trend_points WHERE project=? GROUP BY week ORDER BY week")
+
+def main():
+    ap = argparse.ArgumentParser(description="Trend aggregate update cost vs history length")
+    ap.add_argument("--projects", type=int, default=50)
+    ap.add_argument("--weeks", type=int, default=520, help="weekly assessments per project (520 = 10 years)")
+    args = ap.parse_args()
+    from riskradar import store, trends
+
+    rnd = random.Random(9)
+    start = datetime.date(2016, 1, 4)
+    with tempfile.TemporaryDirectory() as out_dir:
+        conn = store.connect(out_dir)
+        step = max(1, args.weeks // 10)
+        inc, full = [], []
+        for w in range(args.weeks):
+            date_str = (start + datetime.timedelta(weeks=w)).isoformat()
+            for p in range(args.projects):
+                for tab in ("L10n", "LocOps", "General"):
+                    scores = [rnd.choice((1, 2, 3, 4, 6, 9)) for _ in range(rnd.randint(3, 12))]
+                    point = trends.point({"score": scores}, [rnd.randint(0, 3) for _ in range(4)])
+                    t0 = time.perf_counter()
+                    conn.execute("BEGIN IMMEDIATE")
+                    trends.record(conn, f"Proj{p}", tab, f"{w // 13}.{w % 13}", date_str, point)
+                    conn.execute("COMMIT")
+                    inc.append(time.perf_counter() - t0)
+                if p == 0:  # the naive alternative, sampled on one project
+                    t0 = time.perf_counter()
+                    conn.execute(RECOMPUTE, (f"Proj{p}",)).fetchall()
+                    full.append(time.perf_counter() - t0)
+            if (w + 1) % step == 0:
+                print(f"week {w + 1:>5}  points={(w + 1) * args.projects * 3:>8}  "
+                      f"incremental p50 {statistics.median(inc) * 1e6:7.0f} us   "
+                      f"recompute(project) {statistics.median(full) * 1e6:8.0f} us")
+                inc, full = [], []
+        t0 = time.perf_counter()
+        n = len(trends.series("Proj0", out_dir=out_dir))
+        print(f"series(Proj0) {n} weeks in {(time.perf_counter() - t0) * 1e3:.2f} ms")
+
+if __name__ == "__main__":
+    main()
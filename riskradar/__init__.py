@@ -0,0 +1 @@
+"""RiskRadar360 building blocks shared by the Streamlit entry points and tooling."""
@@ -0,0 +1,5 @@
+import sys
+
+from riskradar.cli import main
+
+sys.exit(main())
@@ -0,0 +1,107 @@
+# riskradar/catalog.py — risk question catalogs, compiled once per process
+#
+# Catalogs live in versioned JSON files (riskradar/catalogs/<tab>.json, or
+# $RISKRADAR_CATALOG_DIR). load_catalog() compiles a file into a Catalog with
+# everything a rerun needs precomputed (widget keys, category indexes, default
+# P/I arrays) and keeps it in a process-wide cache shared by all sessions. The
+# file is only stat()ed per call and recompiled when its mtime changes, so
+# editing a catalog hot-reloads without restarting the server.
+import json, logging, os, re, threading
+from array import array
+
+from riskradar.rules import EXTRA_CATEGORIES
+
+TABS = ("L10n", "LocOps", "General")
+SCHEMA = 1
+FIELDS = ("category", "risk_name", "question", "risk_when_true", "P", "I", "mitigation", "group")
+
+log = logging.getLogger(__name__)
+_lock = threading.Lock()
+_cache = {}  # path -> Catalog
+_broken = {}  # path -> mtime_ns of a version that failed to compile
+
+def key_for(tab: str, name: str) -> str:
+    safe = re.sub(r"[^A-Za-z0-9_]+", "_", name)
+    return f"{tab}_{safe}"
+
+def catalog_dir() -> str:
+    return os.environ.get("RISKRADAR_CATALOG_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalogs")
+
+def catalog_path(tab: str) -> str:
+    return os.path.join(catalog_dir(), f"{tab.lower()}.json")
+
+class Catalog:
+    """Compiled, read-only catalog of one tab.
+
+    `items` keeps the (category, risk_name, question, risk_when_true, P, I,
+    mitigation, group) tuples; the parallel tuples/arrays are indexed the same way.
+    """
+    __slots__ = ("tab", "version", "path", "mtime_ns", "items", "names", "categories", "mitigations",
+                 "risk_when_true", "P", "I", "weight_categories", "category_index",
+                 "answer_keys", "p_keys", "i_keys", "evidence_keys", "weight_keys")
+
+    def __init__(self, tab, doc, path=None, mtime_ns=0):
+        if doc.get("schema") != SCHEMA:
+            raise ValueError(f"{path}: unsupported catalog schema {doc.get('schema')!r}")
+        items = []
+        for n, it in enumerate(doc.get("items", [])):
+            missing = [f for f in FIELDS if f not in it]
+            if missing:
+                raise ValueError(f"{path}: item {n} is missing {', '.join(missing)}")
+            if it["P"] not in (1, 2, 3) or it["I"] not in (1, 2, 3):
+                raise ValueError(f"{path}: item {n} ({it['risk_name']}) needs P and I in 1..3")
+            items.append(tuple(it[f] for f in FIELDS))
+
+        self.tab, self.version, self.path, self.mtime_ns = tab, str(doc.get("version", "")), path, mtime_ns
+        self.items = tuple(items)
+        self.names = tuple(it[1] for it in items)
+        self.categories = tuple(it[0] for it in items)
+        self.mitigations = tuple(it[6] for it in items)
+        self.risk_when_true = array("b", (bool(it[3]) for it in items))
+        self.P = array("b", (it[4] for it in items))
+        self.I = array("b", (it[5] for it in items))
+        self.weight_categories = tuple(sorted(set(self.categories) | set(EXTRA_CATEGORIES)))
+        windex = {c: i for i, c in enumerate(self.weight_categories)}
+        self.category_index = array("H", (windex[c] for c in self.categories))
+
+        self.answer_keys = tuple(key_for(tab, r) for r in self.names)
+        if len(set(self.answer_keys)) != len(self.answer_keys):
+            raise ValueError(f"{path}: risk_name values must be unique (after key normalization)")
+        self.p_keys = tuple(key_for(tab, r + "_P") for r in self.names)
+        self.i_keys = tuple(key_for(tab, r + "_I") for r in self.names)
+        self.evidence_keys = tuple(key_for(tab, r + "_evi") for r in self.names)
+        self.weight_keys = tuple(key_for(tab, f"wt_{c}") for c in self.weight_categories)
+
+    def __len__(self):
+        return len(self.items)
+
+def _compile(tab, path, mtime_ns):
+    with open(path, encoding="utf-8") as fh:
+        return Catalog(tab, json.load(fh), path, mtime_ns)
+
+def load_catalog(tab: str) -> Catalog:
+    """Compiled catalog for `tab`; recompiled only when the file's mtime changes."""
+    path = catalog_path(tab)
+    mtime_ns = os.stat(path).st_mtime_ns
+    cat = _cache.get(path)
+    if cat is not None and mtime_ns in (cat.mtime_ns, _broken.get(path)):
+        return cat
+    with _lock:
+        cat = _cache.get(path)
+        if cat is not None and cat.mtime_ns == mtime_ns:
+            return cat
+        try:
+            fresh = _compile(tab, path, mtime_ns)
+        except (OSError, ValueError) as exc:
+            if cat is None:
+                raise
+            # Half-saved edit: keep serving the last good version until the file is fixed
+            log.warning("catalog %s not reloaded: %s", path, exc)
+            _broken[path] = mtime_ns
+            return cat
+        _cache[path] = fresh
+        return fresh
+
+def weight_categories(tab: str):
+    """Categories that get a weight slider: the tab's own plus the panel-driven ones."""
+    return load_catalog(tab).weight_categories
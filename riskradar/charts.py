@@ -0,0 +1,85 @@
+# riskradar/charts.py — chart rendering with bounded memory
+#
+# Figures are built with matplotlib.figure.Figure (no pyplot), so they are
+# never registered with pyplot's global figure manager, and are cleared as soon
+# as they are rasterized. The PNG bytes are memoized per input signature — the
+# 3×3 count grid or the category→score vector — in a size-bounded, process-wide
+# LRU, so every session showing the same matrix reuses one rendering.
+import functools, io, math, threading
+
+import matplotlib
+matplotlib.use("agg")
+from matplotlib.figure import Figure
+
+CACHE_SIZE = 512
+SAVE_OPTS = {"format": "png", "dpi": 200, "bbox_inches": "tight"}  # what st.pyplot used
+
+_render_lock = threading.Lock()  # Agg/font caches are not thread-safe
+
+def count_grid(rows, p_key="possibility"):
+    """3×3 tuple grid counting rows per (P, I); hashable, so it can key the cache."""
+    grid = [[0,0,0],[0,0,0],[0,0,0]]
+    for r in rows:
+        try:
+            P = int(r[p_key]) - 1
+            I = int(r["impact"]) - 1
+        except Exception:
+            continue
+        if 0 <= P < 3 and 0 <= I < 3:
+            grid[P][I] += 1
+    return tuple(tuple(row) for row in grid)
+
+def _to_png(fig) -> bytes:
+    buf = io.BytesIO()
+    try:
+        fig.savefig(buf, **SAVE_OPTS)
+    finally:
+        fig.clear()
+    return buf.getvalue()
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def heatmap_png(grid, title="Risk Matrix (Possibility × Impact)", row_label="Poss", compact=True) -> bytes:
+    """PNG of a 3×3 count grid; `compact` is streamlit_app's small, annotated style."""
+    with _render_lock:
+        if compact:
+            fig = Figure(figsize=(4.5, 4.5), dpi=120)
+        else:
+            fig = Figure()
+        ax = fig.subplots()
+        ax.imshow(grid, cmap="viridis")
+        for i in range(3):
+            for j in range(3):
+                val = grid[i][j]
+                if compact:
+                    ax.text(j, i, str(val), ha="center", va="center",
+                            color="white" if val > 0 else "black", fontsize=10)
+                else:
+                    ax.text(j, i, str(val), ha="center", va="center")
+        ax.set_xticks([0,1,2]); ax.set_yticks([0,1,2])
+        fs = {"fontsize": 9} if compact else {}
+        ax.set_xticklabels(["Impact 1","Impact 2","Impact 3"], **fs)
+        ax.set_yticklabels([f"{row_label} 1", f"{row_label} 2", f"{row_label} 3"], **fs)
+        if compact:
+            ax.set_title(title, fontsize=13, pad=8)
+            fig.tight_layout()
+        else:
+            ax.set_title(title)
+        return _to_png(fig)
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def radar_png(labels, values, title="Category Radar") -> bytes:
+    """PNG of a category radar; `labels`/`values` are equal-length tuples."""
+    N = len(labels)
+    angles = [n / float(N) * 2 * math.pi for n in range(N)]
+    with _render_lock:
+        fig = Figure()
+        ax = fig.add_subplot(111, polar=True)
+        ax.plot(angles + angles[:1], list(values) + list(values[:1]))
+        ax.fill(angles + angles[:1], list(values) + list(values[:1]), alpha=0.25)
+        ax.set_xticks(angles)
+        ax.set_xticklabels(labels)
+        ax.set_title(title)
+        return _to_png(fig)
+
+def cache_info() -> dict:
+    return {"heatmap": heatmap_png.cache_info()._asdict(), "radar": radar_png.cache_info()._asdict()}
@@ -0,0 +1,30 @@
+# riskradar/cli.py — `python -m riskradar <command>`
+#
+# Command modules are imported only when their command is chosen, so e.g.
+# `warmup` really starts from a cold interpreter.
+import argparse, importlib, sys
+
+COMMANDS = {
+    "score": ("riskradar.engine", "Score questionnaire answer sets in batch (JSONL/CSV → CSV/Parquet)"),
+    "delta": ("riskradar.delta", "Risks added/resolved/escalated/de-escalated between two versions or dates"),
+    "trends": ("riskradar.trends", "Weekly rating/score/defect trends (--rebuild backfills from the revision log)"),
+    "ingest-defects": ("riskradar.defects", "Count open defects per project/version from Jira/ValueEdge CSV/JSON exports"),
+    "report": ("riskradar.reports", "One HTML/PDF steering report per project (rating, red flags, heatmap, radar)"),
+    "check-links": ("riskradar.linkcheck", "Check evidence links of the saved assessments (or given URLs) concurrently"),
+    "export": ("riskradar.export", "Stream every saved assessment to one CSV/Parquet/XLSX file (bounded memory)"),
+    "warmup": ("riskradar.warmup", "Pre-import pandas/matplotlib and build the font cache (container build step)"),
+}
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    chosen = next((a for a in argv if not a.startswith("-")), None)
+    ap = argparse.ArgumentParser(prog="riskradar", description="RiskRadar360 headless tools")
+    sub = ap.add_subparsers(dest="command", required=True)
+    for name, (module_name, help_text) in COMMANDS.items():
+        p = sub.add_parser(name, help=help_text, description=help_text)
+        if name == chosen:
+            module = importlib.import_module(module_name)
+            module.add_arguments(p)
+            p.set_defaults(handler=module.main)
+    args = ap.parse_args(argv)
+    return args.handler(args)
@@ -0,0 +1,420 @@
+# riskradar/defects.py — defect counts from Jira / ValueEdge export files
+#
+# Tracker exports dropped into results/defects/ (or $RISKRADAR_DEFECTS_DIR) are
+# read in one streaming pass each and reduced to open-issue counts per
+# (project, version) and severity (rules.SEVERITIES). Supported files:
+#   .csv           Jira "Export CSV (all fields)" or a ValueEdge grid export;
+#                  repeated columns (Jira's several "Fix Version/s") are all read
+#   .json          Jira search result ({"issues": [...]}), ValueEdge/Octane REST
+#                  ({"data": [...]}) or a plain array, decoded one issue at a time
+#   .jsonl/.ndjson one issue per line
+# Closed issues (done/resolved/rejected…) are skipped and tracker severities
+# or priorities are mapped with SEVERITY_MAP. Memory is bounded by one issue
+# plus the counts table, whatever the export size.
+#
+# Counts are kept per source file in the assessment store (SQLite). A file is
+# only re-read when its mtime/size change; for a given project/version the
+# newest export that has it wins, so re-exporting daily just works. Trackers
+# page big exports (Jira: 1000 rows per CSV); files named like one export plus
+# a page suffix — "Jira.csv", "Jira (1).csv", "jira_page2.csv", "jira-part-3.csv"
+# — and written within PAGE_WINDOW_S of each other are one export, summed.
+#
+# refresh() runs ingest() on a background thread, so the app never parses an
+# export in the script thread; `python -m riskradar ingest-defects` and batch
+# scoring call ingest() directly.
+import csv, functools, json, logging, os, re, sys, threading, time
+
+from riskradar import rules
+
+log = logging.getLogger(__name__)
+
+EXTENSIONS = (".csv", ".json", ".jsonl", ".ndjson")
+ANY_VERSION = "*"  # the export had no version at all: counts apply to every version of the project
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS defect_sources (
+    path        TEXT PRIMARY KEY,
+    mtime_ns    INTEGER NOT NULL,
+    size        INTEGER NOT NULL,
+    issues      INTEGER NOT NULL,
+    open_issues INTEGER NOT NULL,
+    ingested_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS defect_counts (
+    source   TEXT NOT NULL,
+    project  TEXT NOT NULL,
+    version  TEXT NOT NULL,
+    blocker  INTEGER NOT NULL,
+    critical INTEGER NOT NULL,
+    major    INTEGER NOT NULL,
+    minor    INTEGER NOT NULL,
+    PRIMARY KEY (source, project, version)
+);
+CREATE INDEX IF NOT EXISTS defect_counts_by_project ON defect_counts (project, version);
+"""
+
+# Tracker severity / priority (lower-cased) -> index into rules.SEVERITIES
+SEVERITY_MAP = {
+    "blocker": 0, "showstopper": 0, "urgent": 0, "highest": 0, "p0": 0, "p1": 0, "s1": 0,
+    "critical": 1, "very high": 1, "high": 1, "p2": 1, "s2": 1,
+    "major": 2, "medium": 2, "normal": 2, "p3": 2, "s3": 2,
+    "minor": 3, "low": 3, "lowest": 3, "trivial": 3, "p4": 3, "s4": 3,
+}
+CLOSED = {"done", "closed", "resolved", "fixed", "rejected", "duplicate", "won't fix", "wont fix",
+          "cancelled", "canceled", "not a bug", "completed", "obsolete"}
+
+# CSV header aliases (lower-cased), most specific first; the first group present is used
+PROJECT_COLUMNS = (("project name", "project key"), ("project",), ("product",), ("workspace",))
+VERSION_COLUMNS = (("fix version/s", "fix versions", "fix version"), ("release", "target release"),
+                   ("affects version/s", "affects versions", "version"))
+SEVERITY_COLUMNS = (("severity", "custom field (severity)"), ("priority",))
+STATUS_COLUMNS = (("status category",), ("status", "phase"))
+
+PAGE_RE = re.compile(r"(?:\s*\(\d+\)|[\s_-]*(?:page|part)[\s_-]*\d+)$", re.IGNORECASE)
+PAGE_WINDOW_S = 3600  # pages of one export are downloaded together; a day later it's a new export
+
+_lock = threading.Lock()
+_refresh_lock = threading.Lock()  # not _lock: that one is held for a whole ingest
+_refresh = {"thread": None, "seen": {}}  # seen: (inbox, out_dir) -> inbox listing last ingested
+
+def defects_dir() -> str:
+    from riskradar.store import results_dir
+    return os.environ.get("RISKRADAR_DEFECTS_DIR") or os.path.join(results_dir(), "defects")
+
+@functools.lru_cache(maxsize=8192)  # statuses, severities, projects and versions repeat constantly
+def norm(s) -> str:
+    return " ".join(str(s).split()).casefold()
+
+# ---------- Parsing (one issue at a time) ----------
+# Every reader yields (projects, versions, severity, is_closed) per issue.
+def _columns(header, groups):
+    for group in groups:
+        idx = [i for i, h in enumerate(header) if h in group]
+        if idx:
+            return idx
+    return []
+
+def _iter_csv(fh):
+    reader = csv.reader(fh)
+    header = [norm(h) for h in next(reader, [])]
+    proj, vers = _columns(header, PROJECT_COLUMNS), _columns(header, VERSION_COLUMNS)
+    sev, stat = _columns(header, SEVERITY_COLUMNS)[:1], _columns(header, STATUS_COLUMNS)[:1]
+    res = [i for i, h in enumerate(header) if h == "resolution"][:1]
+    width = len(header)
+    for row in reader:
+        if len(row) < width:
+            row += [""] * (width - len(row))
+        closed = (bool(stat) and norm(row[stat[0]]) in CLOSED) or \
+                 (bool(res) and row[res[0]] not in ("", "Unresolved"))
+        yield ([row[i] for i in proj if row[i]], [row[i] for i in vers if row[i]],
+               row[sev[0]] if sev else "", closed)
+
+def _names(v, fields=("name",)):
+    if not v:
+        return []
+    if isinstance(v, list):
+        return [n for x in v for n in _names(x, fields)]
+    if isinstance(v, dict):
+        return [str(v[f]) for f in fields if v.get(f)]
+    return [str(v)]
+
+def _issue_from_json(item):
+    f = item.get("fields", item) if isinstance(item, dict) else {}
+    projects = _names(f.get("project") or f.get("product") or f.get("workspace"), ("name", "key"))
+    versions = _names(f.get("fixVersions") or f.get("release") or f.get("fix_version") or f.get("versions"))
+    sev = f.get("severity") or f.get("priority") or ""
+    if isinstance(sev, dict):  # ValueEdge list nodes: {"name": "Very High", "logical_name": "list_node.severity.very_high"}
+        sev = sev.get("name") or str(sev.get("logical_name", "")).rsplit(".", 1)[-1].replace("_", " ")
+    status = f.get("status") or f.get("phase") or ""
+    closed = bool(f.get("resolution"))
+    if isinstance(status, dict):
+        closed = closed or (status.get("statusCategory") or {}).get("key") == "done"
+        status = status.get("name", "")
+    return projects, versions, sev, closed or norm(status) in CLOSED
+
+class _JsonStream:
+    """Decodes the elements of a JSON array one by one from a file, keeping only a small window."""
+    BLOCK = 1 << 20
+    MAX_ITEM = 64 << 20  # a single issue larger than this means the file is not what we think
+
+    def __init__(self, fh):
+        self.fh, self.buf, self.pos, self.eof = fh, "", 0, False
+        self.decoder = json.JSONDecoder()
+
+    def _more(self) -> bool:
+        if self.eof:
+            return False
+        block = self.fh.read(self.BLOCK)
+        self.eof = not block
+        self.buf = self.buf[self.pos:] + block
+        self.pos = 0
+        return bool(block)
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._more():
+                return self.buf[self.pos:self.pos + 1]
+
+    def expect(self, ch):
+        if self.peek() != ch:
+            raise ValueError(f"expected {ch!r} at {self.buf[self.pos:self.pos + 20]!r}")
+        self.pos += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                v, end = self.decoder.raw_decode(self.buf, self.pos)
+                if end < len(self.buf) or self.eof:  # a number cut at the window's edge would still decode
+                    self.pos = end
+                    return v
+            except json.JSONDecodeError:
+                if self.eof or len(self.buf) - self.pos > self.MAX_ITEM:
+                    raise
+            self._more()
+
+    def array(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if self.peek() == ",":
+                self.pos += 1
+            else:
+                self.expect("]")
+                return
+
+ARRAY_KEYS = ("issues", "data", "items", "results")
+
+def _iter_json(fh):
+    js = _JsonStream(fh)
+    if js.peek() == "[":
+        items = js.array()
+    else:
+        items = ()
+        js.expect("{")
+        while js.peek() not in ("}", ""):
+            key = js.value()
+            js.expect(":")
+            if key in ARRAY_KEYS and js.peek() == "[":
+                items = js.array()
+                break
+            js.value()  # scalar metadata (total, startAt…), skipped
+            if js.peek() == ",":
+                js.pos += 1
+    for item in items:
+        yield _issue_from_json(item)
+
+def _iter_jsonl(fh):
+    for line in fh:
+        if line.strip():
+            yield _issue_from_json(json.loads(line))
+
+def iter_issues(path):
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, newline="" if ext == ".csv" else None, encoding="utf-8-sig") as fh:
+        yield from (_iter_csv if ext == ".csv" else _iter_json if ext == ".json" else _iter_jsonl)(fh)
+
+# ---------- Aggregation ----------
+def aggregate(issues, severity_map=None, default_project=None):
+    """{(project, version): [blocker, critical, major, minor]} of open issues, plus stats.
+
+    Projects and versions are stored as norm()alized text. An issue with several
+    fix versions (or a project name and key) counts under each of them.
+    """
+    smap = SEVERITY_MAP if severity_map is None else severity_map
+    counts, unmapped = {}, {}
+    stats = {"issues": 0, "open": 0, "counted": 0, "unattributed": 0}
+    versioned = False
+    default = [default_project] if default_project else []
+    for projects, versions, sev, closed in issues:
+        stats["issues"] += 1
+        if closed:
+            continue
+        stats["open"] += 1
+        s = smap.get(norm(sev))
+        if s is None:
+            unmapped[sev] = unmapped.get(sev, 0) + 1
+            continue
+        projects = projects or default
+        if not projects:
+            stats["unattributed"] += 1
+            continue
+        stats["counted"] += 1
+        versioned = versioned or bool(versions)
+        for p in {norm(p) for p in projects}:
+            for v in {norm(v) for v in versions} or ("",):
+                row = counts.get((p, v))
+                if row is None:
+                    row = counts[(p, v)] = [0, 0, 0, 0]
+                row[s] += 1
+    if not versioned:
+        counts = {(p, ANY_VERSION): row for (p, _), row in counts.items()}
+    stats["unmapped"] = unmapped
+    return counts, stats
+
+# ---------- Store ----------
+def _conn(out_dir):
+    from riskradar.store import connect
+    return connect(out_dir)
+
+def inbox_files(inbox=None):
+    inbox = inbox or defects_dir()
+    try:
+        return sorted(e.path for e in os.scandir(inbox)
+                      if e.is_file() and e.name.lower().endswith(EXTENSIONS) and not e.name.startswith("."))
+    except FileNotFoundError:
+        return []
+
+def ingest(inbox=None, out_dir=None, force=False, severity_map=None, default_project=None) -> list:
+    """Bring the stored counts in line with the inbox; returns one summary dict per file (re)read."""
+    conn = _conn(out_dir)
+    done = []
+    with _lock:
+        files = {p: os.stat(p) for p in inbox_files(inbox)}
+        known = {path: (m, s) for path, m, s in conn.execute("SELECT path, mtime_ns, size FROM defect_sources")}
+        gone = [p for p in known if p not in files]
+        todo = [p for p, stt in files.items() if force or known.get(p) != (stt.st_mtime_ns, stt.st_size)]
+        if not gone and not todo:
+            return done
+        for path in todo:
+            t0 = time.perf_counter()
+            try:
+                counts, stats = aggregate(iter_issues(path), severity_map, default_project)
+            except (OSError, ValueError, UnicodeDecodeError, csv.Error) as e:
+                done.append({"path": path, "error": str(e)})
+                continue
+            stt = files[path]
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute("DELETE FROM defect_counts WHERE source=?", (path,))
+                conn.executemany("INSERT INTO defect_counts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                 ((path, p, v, *row) for (p, v), row in counts.items()))
+                conn.execute("INSERT OR REPLACE INTO defect_sources VALUES (?, ?, ?, ?, ?, ?)",
+                             (path, stt.st_mtime_ns, stt.st_size, stats["issues"], stats["open"], time.time()))
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            done.append({"path": path, "pairs": len(counts), "seconds": time.perf_counter() - t0, **stats})
+        if gone:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany("DELETE FROM defect_counts WHERE source=?", ((p,) for p in gone))
+            conn.executemany("DELETE FROM defect_sources WHERE path=?", ((p,) for p in gone))
+            conn.execute("COMMIT")
+    return done
+
+def _listing(inbox):
+    out = []
+    for path in inbox_files(inbox):
+        try:
+            stt = os.stat(path)
+        except FileNotFoundError:
+            continue
+        out.append((path, stt.st_mtime_ns, stt.st_size))
+    return out
+
+def _refresh_run(inbox, out_dir, listing):
+    try:
+        ingest(inbox, out_dir)
+        _refresh["seen"][(inbox, out_dir)] = listing
+    except Exception:  # a locked or broken store; the next refresh() tries again
+        log.exception("defect ingest failed")
+
+def refresh(inbox=None, out_dir=None) -> bool:
+    """Ingest changed exports on a background thread; True while one is running (counts may be stale)."""
+    inbox = inbox or defects_dir()
+    with _refresh_lock:
+        if _refresh["thread"] is not None and _refresh["thread"].is_alive():
+            return True
+        listing = _listing(inbox)  # a scandir and a few stats: cheap enough for the script thread
+        if _refresh["seen"].get((inbox, out_dir)) == listing:
+            return False
+        _refresh["thread"] = threading.Thread(target=_refresh_run, args=(inbox, out_dir, listing),
+                                              name="riskradar-defects", daemon=True)
+        _refresh["thread"].start()
+    return True
+
+def wait(timeout=None):
+    """Join a running refresh() (tests, short-lived processes)."""
+    thread = _refresh["thread"]
+    if thread is not None:
+        thread.join(timeout)
+
+def export_name(path) -> str:
+    """The export a file belongs to: its name without extension and page suffix, case-folded."""
+    return PAGE_RE.sub("", os.path.splitext(os.path.basename(path))[0]).strip().casefold()
+
+def counts_for(project, version, out_dir=None):
+    """{"counts": (blocker, critical, major, minor), "source": path, "sources": [paths]} from the
+    newest export covering this project/version (all its pages summed), or None."""
+    rows = _conn(out_dir).execute(
+        "SELECT c.blocker, c.critical, c.major, c.minor, c.source, s.mtime_ns FROM defect_counts c "
+        "JOIN defect_sources s ON s.path = c.source WHERE c.project=? AND c.version IN (?, ?) "
+        "ORDER BY s.mtime_ns DESC, c.version = ?",
+        (norm(project), norm(version), ANY_VERSION, ANY_VERSION)).fetchall()
+    if not rows:
+        return None
+    newest, name = rows[0][5], export_name(rows[0][4])
+    total, sources = [0, 0, 0, 0], []
+    for *row, source, mtime_ns in rows:
+        if export_name(source) != name or newest - mtime_ns > PAGE_WINDOW_S * 1e9 or source in sources:
+            continue
+        total = [a + b for a, b in zip(total, row)]
+        sources.append(source)
+    return {"counts": tuple(total), "source": sources[0], "sources": sources}
+
+def fill_records(records, out_dir=None):
+    """Give engine records without a "defects" field the ingested counts of their project/version."""
+    for rec in records:
+        if "defects" not in rec and rec.get("project_name") and rec.get("version"):
+            found = counts_for(rec["project_name"], rec["version"], out_dir)
+            if found:
+                rec["defects"] = dict(zip(rules.SEVERITIES, found["counts"]))
+        yield rec
+
+# ---------- CLI ----------
+def add_arguments(ap):
+    ap.add_argument("files", nargs="*", help="export files to copy into the inbox first (default: just rescan it)")
+    ap.add_argument("--inbox", help="export folder (default: results/defects/ or $RISKRADAR_DEFECTS_DIR)")
+    ap.add_argument("--force", action="store_true", help="re-read every file, even unchanged ones")
+    ap.add_argument("--map", action="append", default=[], metavar="NAME=SEVERITY",
+                    help="extra severity mapping, e.g. 'Sev-1=Blocker'; repeatable")
+    ap.add_argument("--project", help="project for issues that carry none (e.g. a ValueEdge workspace export)")
+    ap.add_argument("--show", action="store_true", help="print the resulting counts as CSV")
+    ap.add_argument("--results-dir", help="assessment store (default: results/ or $RISKRADAR_RESULTS_DIR)")
+
+def main(args):
+    import shutil
+    inbox = args.inbox or defects_dir()
+    if args.files:
+        os.makedirs(inbox, exist_ok=True)
+        for f in args.files:
+            shutil.copy2(f, inbox)
+    smap = dict(SEVERITY_MAP)
+    for m in args.map:
+        name, _, sev = m.partition("=")
+        if sev.capitalize() not in rules.SEVERITIES:
+            print(f"ingest-defects: --map {m!r}: severity must be one of {', '.join(rules.SEVERITIES)}", file=sys.stderr)
+            return 2
+        smap[norm(name)] = rules.SEVERITIES.index(sev.capitalize())
+    for r in ingest(inbox, args.results_dir, args.force or bool(args.map or args.project), smap, args.project):
+        if "error" in r:
+            print(f"{r['path']}: {r['error']}", file=sys.stderr)
+            continue
+        unmapped = ", ".join(f"{k or '(none)'}={n}" for k, n in sorted(r["unmapped"].items(), key=lambda kv: -kv[1])[:5])
+        print(f"{os.path.basename(r['path'])}: {r['issues']} issues, {r['open']} open, {r['counted']} counted "
+              f"into {r['pairs']} project/versions in {r['seconds']:.2f} s"
+              + (f"; unmapped severities: {unmapped}" if unmapped else "")
+              + (f"; {r['unattributed']} without project (see --project)" if r["unattributed"] else ""), file=sys.stderr)
+    if args.show:
+        writer = csv.writer(sys.stdout)
+        writer.writerow(("project", "version", *rules.SEVERITIES, "defect_score", "source"))
+        for p, v, *row, src in _conn(args.results_dir).execute(
+                "SELECT project, version, blocker, critical, major, minor, source FROM defect_counts ORDER BY 1, 2, 7"):
+            writer.writerow((p, v, *row, rules.defect_score(*row), os.path.basename(src)))
+    return 0
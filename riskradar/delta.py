@@ -0,0 +1,166 @@
+# riskradar/delta.py — what changed between two versions (or dates) of the saved assessments
+#
+# Indexes the consolidated portfolio frame (riskradar.portfolio) once per
+# load: every row gets an int64 key for (project, tab, risk_name), and
+# postings map each version / assessment date to its row positions. A
+# comparison pulls the two sides from the postings, keeps the newest snapshot
+# per (project, tab) on each side, and hash-joins them on the key.
+#
+# Only (project, tab) pairs assessed on *both* sides are compared: a saved
+# assessment lists the risks that were identified, so a risk missing from the
+# head side means it was resolved — but only if the head side was assessed.
+import re, sys
+
+import numpy as np
+import pandas as pd
+
+CHANGES = ("added", "resolved", "escalated", "de-escalated")
+BY = ("version", "date")  # which saved column a side is selected by
+DELTA_COLUMNS = ["project_name", "tab", "category", "risk_name", "change", "base_score", "head_score",
+                 "score_delta", "base_weighted", "head_weighted", "weighted_delta"]
+
+def version_key(value) -> tuple:
+    """Sort key for versions and dates: digit runs compare as numbers ("25.9" < "25.10"), the rest as text."""
+    return tuple((0, int(p), "") if p.isdigit() else (1, 0, p) for p in re.findall(r"\d+|[^\d.\-_\s]+", str(value)))
+
+def _rank(values):
+    order = sorted(range(len(values)), key=lambda i: (version_key(values[i]), str(values[i])))
+    rank = np.empty(len(values), dtype=np.int64)
+    rank[order] = np.arange(len(values))
+    return rank
+
+def _codes(frame, col):
+    c = frame[col]
+    if not isinstance(c.dtype, pd.CategoricalDtype):
+        c = c.astype(str).astype("category")
+    return c.cat.codes.to_numpy().astype(np.int64), c.cat.categories
+
+def _newest(group, snapshot):
+    """Rows holding the newest snapshot of their group."""
+    if not len(group):
+        return np.zeros(0, dtype=bool)
+    return snapshot == pd.Series(snapshot).groupby(group).transform("max").to_numpy()
+
+class DeltaIndex:
+    """Join keys and per-version/per-date postings over a portfolio frame."""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        self.project, self.projects = _codes(frame, "project_name")
+        self.tab, self.tabs = _codes(frame, "tab")
+        self.risk, self.risks = _codes(frame, "risk_name")
+        self.category, self.categories = _codes(frame, "category")
+        self.score = pd.to_numeric(frame["score"], errors="coerce").to_numpy(dtype=float, na_value=0.0)
+        self.weighted = pd.to_numeric(frame["weighted_score"], errors="coerce").to_numpy(dtype=float, na_value=0.0)
+        self.pair = self.project * (len(self.tabs) + 1) + self.tab
+        self.key = self.pair * (len(self.risks) + 1) + self.risk
+
+        # A version can be saved on several dates (and a date can hold several versions):
+        # a side only uses the newest snapshot per (project, tab) — latest date, then highest version
+        version, versions = _codes(frame, "version")
+        date, dates = _codes(frame, "assessment_date")
+        v_rank, d_rank = _rank(versions), _rank(dates)
+        snapshot = d_rank[date] * (len(versions) + 1) + v_rank[version]
+        self.postings = {
+            "version": self._postings(version, versions, _newest(self.pair * (len(versions) + 1) + version, snapshot)),
+            "date": self._postings(date, dates, _newest(self.pair * (len(dates) + 1) + date, snapshot)),
+        }
+
+    @staticmethod
+    def _postings(codes, values, keep):
+        codes = np.where(keep, codes, -1)
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+        return {str(v): order[bounds[i]:bounds[i + 1]] for i, v in enumerate(values)}
+
+    def options(self, by="version"):
+        """Versions (or dates) with saved assessments, oldest first."""
+        return sorted(self.postings[by], key=lambda v: (version_key(v), v))
+
+    def _side(self, by, value, projects=None, tabs=None):
+        pos = self.postings[by].get(str(value), np.zeros(0, dtype=np.int64))
+        if projects:
+            pos = pos[np.isin(np.asarray(self.projects, dtype=object), list(projects))[self.project[pos]]]
+        if tabs:
+            pos = pos[np.isin(np.asarray(self.tabs, dtype=object), list(tabs))[self.tab[pos]]]
+        return pos
+
+    def compare(self, base, head, by="version", projects=None, tabs=None, unchanged=False) -> pd.DataFrame:
+        """Risks added / resolved / escalated / de-escalated from `base` to `head`."""
+        b, h = self._side(by, base, projects, tabs), self._side(by, head, projects, tabs)
+        both = np.intersect1d(self.pair[b], self.pair[h])
+        b, h = b[np.isin(self.pair[b], both)], h[np.isin(self.pair[h], both)]
+
+        # Hash join: build on the base keys, probe with the head keys
+        table = pd.Index(self.key[b])
+        if not table.is_unique:  # a risk listed twice in one CSV: keep the last row
+            b = b[~table.duplicated(keep="last")]
+            table = pd.Index(self.key[b])
+        hit = table.get_indexer(self.key[h])
+        matched = hit >= 0
+        resolved = np.ones(len(b), dtype=bool)
+        resolved[hit[matched]] = False
+
+        pos = np.concatenate([h, b[resolved]])  # head row when present, for names
+        base_score = np.concatenate([np.where(matched, self.score[b[hit]], 0.0), self.score[b[resolved]]])
+        head_score = np.concatenate([self.score[h], np.zeros(resolved.sum())])
+        base_w = np.concatenate([np.where(matched, self.weighted[b[hit]], 0.0), self.weighted[b[resolved]]])
+        head_w = np.concatenate([self.weighted[h], np.zeros(resolved.sum())])
+        is_added = np.concatenate([~matched, np.zeros(resolved.sum(), dtype=bool)])
+        is_resolved = np.concatenate([np.zeros(len(h), dtype=bool), np.ones(resolved.sum(), dtype=bool)])
+        change = np.select([is_added, is_resolved, head_score > base_score, head_score < base_score],
+                           [0, 1, 2, 3], default=4)
+        if not unchanged:
+            keep = change != 4
+            pos, change = pos[keep], change[keep]
+            base_score, head_score, base_w, head_w = base_score[keep], head_score[keep], base_w[keep], head_w[keep]
+
+        out = pd.DataFrame({
+            "project_name": pd.Categorical.from_codes(self.project[pos], self.projects),
+            "tab": pd.Categorical.from_codes(self.tab[pos], self.tabs),
+            "category": pd.Categorical.from_codes(self.category[pos], self.categories),
+            "risk_name": pd.Categorical.from_codes(self.risk[pos], self.risks),
+            "change": pd.Categorical.from_codes(change, [*CHANGES, "unchanged"]),
+            "base_score": base_score, "head_score": head_score, "score_delta": head_score - base_score,
+            "base_weighted": base_w, "head_weighted": head_w, "weighted_delta": head_w - base_w,
+        }, columns=DELTA_COLUMNS)
+        order = np.lexsort((-out["score_delta"].to_numpy(), self.tab[pos], self.project[pos]))
+        return out.iloc[order].reset_index(drop=True)
+
+_memo = (None, None)  # (frame, DeltaIndex) of the last frame indexed
+
+def index_for(frame: pd.DataFrame) -> DeltaIndex:
+    """DeltaIndex of `frame`, rebuilt only when load_portfolio hands out a new frame."""
+    global _memo
+    cached_frame, index = _memo
+    if cached_frame is not frame:
+        index = DeltaIndex(frame)
+        _memo = (frame, index)
+    return index
+
+def summarize(delta: pd.DataFrame) -> dict:
+    """Counts per change type plus the net score / weighted_score movement."""
+    out = {c: int((delta["change"] == c).sum()) for c in CHANGES}
+    out["score_delta"] = float(delta["score_delta"].sum())
+    out["weighted_delta"] = float(delta["weighted_delta"].sum())
+    return out
+
+# ---------- CLI ----------
+def add_arguments(ap):
+    ap.add_argument("base", help="base version (or date with --by date)")
+    ap.add_argument("head", help="head version (or date with --by date)")
+    ap.add_argument("--by", choices=BY, default="version")
+    ap.add_argument("--project", action="append", help="limit to project(s); repeatable")
+    ap.add_argument("--tab", action="append", help="limit to tab(s); repeatable")
+    ap.add_argument("--unchanged", action="store_true", help="also list risks whose score did not move")
+    ap.add_argument("--results-dir", help="saved assessments (default: results/ or $RISKRADAR_RESULTS_DIR)")
+    ap.add_argument("-o", "--output", help="CSV path (default: stdout)")
+
+def main(args):
+    from riskradar.portfolio import load_portfolio
+    index = index_for(load_portfolio(args.results_dir))
+    delta = index.compare(args.base, args.head, by=args.by, projects=args.project, tabs=args.tab,
+                          unchanged=args.unchanged)
+    delta.to_csv(args.output or sys.stdout, index=False)
+    print(", ".join(f"{k}={v:g}" for k, v in summarize(delta).items()), file=sys.stderr)
+    return 0
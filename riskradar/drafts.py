@@ -0,0 +1,155 @@
+# riskradar/drafts.py — compact, autosaved drafts of an assessment tab's inputs
+#
+# A tab's widget state (several keys per question plus the header, release,
+# defect and link inputs) is encoded as a small snapshot that only records what
+# differs from the catalog defaults:
+#   answers   one bit per question, set where the answer is not the default
+#   P/I       one byte per question, P << 2 | I, 0 = catalog default / not shown
+#   weights   one byte per weight category, weight × 10, 0 = 1.0
+#   evidence  [question index, text] pairs for the non-empty ones
+#   fields    header / Intelligence Panel inputs that are not at their default
+# zlib-compressed JSON, typically 100–300 bytes per tab. streamlit_app.py keeps
+# hidden tabs in this form instead of their widget keys, and writes the active
+# tab's snapshot to the assessment store whenever it changes; a reconnecting
+# browser (same ?draft= URL) gets every tab back in one read. Strings are
+# interned on decode, so sessions restoring the same links share one copy.
+import base64, datetime, functools, json, secrets, sys, time, zlib
+
+from riskradar import rules
+from riskradar.catalog import key_for
+
+FORMAT = 1
+MAX_AGE_DAYS = 30  # drafts not touched for this long are pruned
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS drafts (
+    draft_id   TEXT NOT NULL,
+    tab        TEXT NOT NULL,
+    payload    BLOB NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (draft_id, tab)
+);
+CREATE INDEX IF NOT EXISTS drafts_by_age ON drafts (updated_at);
+"""
+
+# Non-question widget keys of a tab (key_for(tab, name)) and their defaults; anything else defaults to "" / 0
+FIELDS = ("Project", "Version", "Assessor", "adv", "rel_url", "rel_status", "rel_date",
+          *(f"def_{sev.lower()}" for sev in rules.SEVERITIES), "def_from",
+          "link_repo", "link_ci", "link_spec", "sens")
+DEFAULTS = {"adv": True, "sens": False, "rel_status": rules.RELEASE_STATUSES[0]}
+
+# ---------- Encoding ----------
+@functools.lru_cache(maxsize=16)
+def signature(catalog) -> int:
+    """Layout of a catalog's widget keys; item-level parts only apply to the layout they were taken from."""
+    return zlib.crc32("\0".join(catalog.answer_keys + catalog.weight_keys).encode("utf-8"))
+
+@functools.lru_cache(maxsize=16)
+def _field_keys(tab) -> tuple:
+    return tuple((name, key_for(tab, name)) for name in FIELDS)
+
+def _default(name):
+    return datetime.date.today() if name == "rel_date" else DEFAULTS.get(name, 0)
+
+def _b64(raw) -> str:
+    return base64.b64encode(bytes(raw)).decode("ascii") if any(raw) else ""
+
+def encode(catalog, state) -> bytes:
+    """Snapshot of one tab's inputs from `state` (st.session_state or any mapping)."""
+    get = state.get
+    yes = bytearray((len(catalog) + 7) // 8)
+    pi = bytearray(len(catalog))
+    evidence = []
+    for n, key in enumerate(catalog.answer_keys):
+        ans = get(key)
+        if ans is not None and (ans == "Yes") == bool(catalog.risk_when_true[n]):  # default is "Yes" unless risk_when_true
+            yes[n >> 3] |= 1 << (n & 7)
+        p, i = get(catalog.p_keys[n]), get(catalog.i_keys[n])
+        if p is not None and i is not None and (p, i) != (catalog.P[n], catalog.I[n]):
+            pi[n] = p << 2 | i
+        text = get(catalog.evidence_keys[n])
+        if text:
+            evidence.append([n, text])
+    weights = bytearray(len(catalog.weight_keys))
+    for n, key in enumerate(catalog.weight_keys):
+        w = get(key)
+        if w is not None and w != 1.0:
+            weights[n] = round(w * 10)
+    fields = {}
+    for name, key in _field_keys(catalog.tab):
+        value = get(key)
+        if value is None or value == "" or value == _default(name):
+            continue
+        fields[name] = value.isoformat() if isinstance(value, datetime.date) else value
+    doc = {"f": FORMAT, "sig": signature(catalog), "yes": _b64(yes), "pi": _b64(pi), "w": _b64(weights),
+           "ev": evidence, "fields": fields}
+    # 1 KiB window: a snapshot is a few hundred bytes, and the default 32 KiB setup costs more than the deflate
+    z = zlib.compressobj(6, zlib.DEFLATED, 10, 2)
+    return z.compress(json.dumps(doc, separators=(",", ":"), ensure_ascii=False).encode("utf-8")) + z.flush()
+
+def _unb64(text, size) -> bytes:
+    raw = base64.b64decode(text) if text else b""
+    return raw if len(raw) == size else bytes(size)
+
+def decode(catalog, blob: bytes) -> dict:
+    """Widget key -> value for the non-default inputs of a snapshot (empty if it can't be read)."""
+    try:
+        doc = json.loads(zlib.decompress(blob))
+    except (zlib.error, ValueError, TypeError):
+        return {}
+    if not isinstance(doc, dict) or doc.get("f") != FORMAT:
+        return {}
+    out = {}
+    if doc.get("sig") == signature(catalog):  # catalog edited since: keep only the fields
+        yes, pi = _unb64(doc["yes"], (len(catalog) + 7) // 8), _unb64(doc["pi"], len(catalog))
+        for n, key in enumerate(catalog.answer_keys):
+            if yes[n >> 3] >> (n & 7) & 1:
+                out[key] = "Yes" if catalog.risk_when_true[n] else "No"
+            if pi[n]:
+                out[catalog.p_keys[n]], out[catalog.i_keys[n]] = pi[n] >> 2, pi[n] & 3
+        for n, text in doc["ev"]:
+            if 0 <= n < len(catalog):
+                out[catalog.evidence_keys[n]] = sys.intern(text)
+        for key, w in zip(catalog.weight_keys, _unb64(doc["w"], len(catalog.weight_keys))):
+            if w:
+                out[key] = w / 10
+    keys = dict(_field_keys(catalog.tab))
+    for name, value in (doc.get("fields") or {}).items():
+        if name not in keys:
+            continue
+        if name == "rel_date":
+            value = datetime.date.fromisoformat(value)
+        elif name == "def_from":
+            value = tuple(value)
+        elif isinstance(value, str):
+            value = sys.intern(value)
+        out[keys[name]] = value
+    return out
+
+def tab_keys(tab: str, state) -> list:
+    """Widget / marker keys of `tab` present in `state`."""
+    prefix = f"{tab}_"
+    return [k for k in state.keys() if k.startswith(prefix)]
+
+# ---------- Store ----------
+def _connect(out_dir=None):
+    from riskradar.store import connect
+    return connect(out_dir)
+
+def new_id() -> str:
+    return secrets.token_urlsafe(12)
+
+def save(draft_id: str, tab: str, blob: bytes, out_dir=None):
+    _connect(out_dir).execute(
+        "INSERT INTO drafts (draft_id, tab, payload, updated_at) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (draft_id, tab) DO UPDATE SET payload=excluded.payload, updated_at=excluded.updated_at",
+        (draft_id, tab, blob, time.time()))
+
+def load(draft_id: str, out_dir=None) -> dict:
+    """tab -> snapshot for every tab of a draft."""
+    rows = _connect(out_dir).execute("SELECT tab, payload FROM drafts WHERE draft_id=?", (draft_id,)).fetchall()
+    return {tab: bytes(payload) for tab, payload in rows}
+
+def prune(max_age_days=MAX_AGE_DAYS, out_dir=None) -> int:
+    cur = _connect(out_dir).execute("DELETE FROM drafts WHERE updated_at < ?", (time.time() - max_age_days * 86400,))
+    return cur.rowcount
@@ -0,0 +1,498 @@
+# riskradar/engine.py — headless, vectorized batch scoring
+#
+# Scores many questionnaire answer sets of one tab at once with NumPy, using
+# the thresholds from riskradar/rules.py. Output rows follow RESULT_COLUMNS and
+# assess_tab's row order (checklist items in catalog order, then the release
+# gate risk, the defect-load risk and the unverifiable-evidence risk), so a
+# batch export is byte-identical to what the Streamlit app saves for the same
+# inputs, link check results included.
+#
+# Record format (JSONL, one assessment per line; every field optional but `tab`,
+# which is matched ignoring case):
+#   {"tab": "L10n", "project_name": "DP", "version": "25.3", "assessment_date": "2025-08-26",
+#    "assessor": "…", "answers": {"<risk_name>": "Yes"|"No"}, "P": {"<risk_name>": 1-3},
+#    "I": {"<risk_name>": 1-3}, "evidence": {"<risk_name>": "…"}, "weights": {"<Category>": 0.5-2.0},
+#    "release_status": "Ready", "release_url": "…",
+#    "defects": {"Blocker": 0, "Critical": 0, "Major": 0, "Minor": 0},
+#    "links": {"checked": 4, "dead": ["https://…"]}}
+# Answers are "Yes"/"No" in any case, or JSON true/false. Unanswered questions
+# take the UI default (the non-risk answer); a missing release_status is
+# "Unknown", like the untouched selectbox. Anything the UI can't produce (a
+# missing or unknown tab, an answer other than yes/no, a risk_name or weight
+# category the tab's catalog doesn't have, P/I outside 1-3, weights outside
+# 0.5-2.0, negative defect counts, an unknown release_status) is rejected with
+# a ValueError naming the record, rather than scored or skipped.
+# CSV input is the same record flattened: one column per risk_name (Yes/No;
+# any other column is taken as a risk_name and must be one),
+# plus optional `P:<risk_name>`, `I:<risk_name>`, `evidence:<risk_name>`,
+# `weight:<Category>`, `release_status`, `release_url`, `Blocker`…`Minor`,
+# `links_checked` and `dead_links` (space-separated).
+# With --defects, records without defect counts take those ingested from tracker
+# exports for their project_name/version (riskradar/defects.py). With
+# --check-links, records without `links` get their evidence and release links
+# checked (riskradar/linkcheck.py); otherwise they count as unchecked.
+import csv, functools, itertools, json, sys, time
+
+import numpy as np
+import pandas as pd
+
+from riskradar import rules
+from riskradar.catalog import TABS, load_catalog
+
+META = ("project_name", "version", "assessment_date", "assessor")
+_TAB_NAMES = {t.lower(): t for t in TABS}
+_ANSWERS = {"yes": True, "no": False, "true": True, "false": False}
+SUMMARY_COLUMNS = ["project_name","version","assessment_date","tab","rating","total_score","max_cell",
+                   "high_risk_items","weighted_score","risks"]
+
+# ---------- Catalog arrays ----------
+def tab_arrays(tab: str) -> dict:
+    return _catalog_arrays(load_catalog(tab))
+
+@functools.lru_cache(maxsize=16)
+def _catalog_arrays(cat) -> dict:
+    # Keyed by the compiled Catalog object, so a hot-reloaded catalog gets fresh arrays
+    windex = {c: i for i, c in enumerate(cat.weight_categories)}
+    return {
+        "categories": np.array(cat.categories, dtype=object),
+        "names": np.array(cat.names, dtype=object),
+        "mitigations": np.array(cat.mitigations, dtype=object),
+        "risk_when_true": np.frombuffer(cat.risk_when_true, dtype=np.int8).astype(bool),
+        "P": np.frombuffer(cat.P, dtype=np.int8).astype(np.int64),
+        "I": np.frombuffer(cat.I, dtype=np.int8).astype(np.int64),
+        "weight_categories": list(cat.weight_categories),
+        "item_weight_idx": np.frombuffer(cat.category_index, dtype=np.uint16).astype(np.int64),
+        "release_weight_idx": windex[rules.RELEASE_RISK[0]],
+        "defect_weight_idx": windex[rules.DEFECT_RISK[0]],
+        "evidence_weight_idx": windex[rules.EVIDENCE_RISK[0]],
+    }
+
+def rate(total_score, max_cell):
+    """Vectorized score_to_rating."""
+    total_score, max_cell = np.asarray(total_score), np.asarray(max_cell)
+    return np.select([max_cell >= rules.HIGH_CELL, total_score >= rules.MEDIUM_TOTAL],
+                     ["High", "Medium"], "Low").astype(object)
+
+# ---------- Vectorized scoring ----------
+def score_batch(tab, yes, P=None, I=None, weights=None, release_status=None, defects=None,
+                meta=None, evidence=None, release_url=None, links=None, dead_links=None):
+    """Score N answer sets of one tab; returns (rows, summary) DataFrames.
+
+    yes            bool (N, Q) — True where a question was answered "Yes" (catalog order)
+    P, I           int (N, Q) per-item overrides (default: catalog P/I)
+    weights        float (N, C) in the catalog's weight_categories order (default 1.0)
+    release_status (N,) gate statuses (default "Unknown")
+    defects        int (N, 4) Blocker/Critical/Major/Minor counts (default 0)
+    meta           dict of (N,) arrays for project_name/version/assessment_date/assessor
+    evidence       object (N, Q) evidence text; release_url (N,)
+    links          int (N, 2) checked / unverifiable link counts (default 0: not checked)
+    dead_links     (N,) the unverifiable links, space-separated (the evidence of their risk row)
+    """
+    a = tab_arrays(tab)
+    yes = np.asarray(yes, dtype=bool)
+    N, Q = yes.shape
+    P = np.broadcast_to(a["P"], (N, Q)) if P is None else np.asarray(P, dtype=np.int64)
+    I = np.broadcast_to(a["I"], (N, Q)) if I is None else np.asarray(I, dtype=np.int64)
+    weights = np.ones((N, len(a["weight_categories"]))) if weights is None else np.asarray(weights, dtype=float)
+    status = np.full(N, "Unknown", dtype=object) if release_status is None else np.asarray(release_status, dtype=object)
+    defects = np.zeros((N, 4), dtype=np.int64) if defects is None else np.asarray(defects, dtype=np.int64)
+    links = np.zeros((N, 2), dtype=np.int64) if links is None else np.asarray(links, dtype=np.int64)
+    meta = meta or {}
+
+    # Checklist items: rules.is_risk / rules.item_score
+    risky = yes == a["risk_when_true"]
+    n_item, q_item = np.nonzero(risky)
+    p_item, i_item = P[n_item, q_item], I[n_item, q_item]
+    w_item = weights[n_item, a["item_weight_idx"][q_item]]
+
+    # Release gate: rules.release_gate
+    P2 = np.zeros(N, dtype=np.int64); I2 = np.zeros(N, dtype=np.int64)
+    for st, (gp, gi) in rules.RELEASE_GATE.items():
+        hit = status == st
+        P2[hit], I2[hit] = gp, gi
+    n_rel = np.nonzero(P2)[0]
+
+    # Defect load: rules.defect_load
+    dscore = defects @ np.asarray(rules.SEVERITY_WEIGHTS, dtype=np.int64)
+    n_def = np.nonzero(dscore >= rules.DEFECT_LOAD_SCORE)[0]
+    severe = (defects[n_def, 0] > 0) | (defects[n_def, 1] > 2)
+    P3 = np.where(severe, rules.DEFECT_SEVERE[0], rules.DEFECT_DEFAULT[0])
+    I3 = np.where(severe, rules.DEFECT_SEVERE[1], rules.DEFECT_DEFAULT[1])
+
+    # Unverifiable evidence: rules.evidence_gate
+    checked, dead = links[:, 0], links[:, 1]
+    n_ev = np.nonzero(dead)[0]
+    P4 = np.where((dead[n_ev] * 2 >= checked[n_ev]) & (dead[n_ev] > 1), 3, np.where(dead[n_ev] > 1, 2, 1))
+    I4 = np.full(len(n_ev), rules.EVIDENCE_IMPACT, dtype=np.int64)
+
+    n_all = np.concatenate([n_item, n_rel, n_def, n_ev])
+    order = np.argsort(n_all * (Q + 3) + np.concatenate([q_item, np.full(len(n_rel), Q), np.full(len(n_def), Q + 1),
+                                                         np.full(len(n_ev), Q + 2)]), kind="stable")
+    n_all = n_all[order]
+    poss = np.concatenate([p_item, P2[n_rel], P3, P4])[order]
+    impact = np.concatenate([i_item, I2[n_rel], I3, I4])[order]
+    score = poss * impact
+    w_all = np.concatenate([w_item, weights[n_rel, a["release_weight_idx"]], weights[n_def, a["defect_weight_idx"]],
+                            weights[n_ev, a["evidence_weight_idx"]]])[order]
+    weighted_score = np.round(score * w_all, 1)
+
+    rel_cat, rel_name, rel_mit, _ = rules.RELEASE_RISK
+    def_cat, def_name, def_mit, _ = rules.DEFECT_RISK
+    ev_cat, ev_name, ev_mit, _ = rules.EVIDENCE_RISK
+    def lane(items, rel, dfc, evi):
+        return np.concatenate([np.asarray(items, dtype=object), np.full(len(n_rel), rel, dtype=object),
+                               np.full(len(n_def), dfc, dtype=object), np.full(len(n_ev), evi, dtype=object)])[order]
+
+    ev_item = np.full(len(n_item), "", dtype=object) if evidence is None else np.asarray(evidence, dtype=object)[n_item, q_item]
+    ev_rel = np.full(len(n_rel), "", dtype=object) if release_url is None else np.asarray(release_url, dtype=object)[n_rel]
+    ev_dead = np.full(len(n_ev), "", dtype=object) if dead_links is None else np.asarray(dead_links, dtype=object)[n_ev]
+    summaries = np.array([rules.defects_summary(*d) for d in defects[n_def].tolist()], dtype=object)
+    evidence_col = np.concatenate([ev_item, ev_rel, np.full(len(n_def), "", dtype=object), ev_dead])[order]
+    summary_col = np.concatenate([np.full(len(n_item) + len(n_rel), "", dtype=object), summaries,
+                                  np.full(len(n_ev), "", dtype=object)])[order]
+
+    def meta_col(name, default=""):
+        col = meta.get(name)
+        return np.full(len(n_all), default, dtype=object) if col is None else np.asarray(col, dtype=object)[n_all]
+
+    rows = pd.DataFrame({
+        "project_name": meta_col("project_name"), "version": meta_col("version"),
+        "assessment_date": meta_col("assessment_date"), "tab": np.full(len(n_all), tab, dtype=object),
+        "category": lane(a["categories"][q_item], rel_cat, def_cat, ev_cat),
+        "risk_name": lane(a["names"][q_item], rel_name, def_name, ev_name),
+        "possibility": poss, "impact": impact, "score": score, "weighted_score": weighted_score,
+        "mitigation": lane(a["mitigations"][q_item], rel_mit, def_mit, ev_mit),
+        "evidence": evidence_col, "defects_summary": summary_col, "assessor": meta_col("assessor"),
+    }, columns=rules.RESULT_COLUMNS)
+
+    # Per-assessment summary (bincount sums in row order, like assess_tab's sum())
+    total = np.bincount(n_all, weights=score, minlength=N).astype(np.int64)
+    max_cell = np.zeros(N, dtype=np.int64)
+    np.maximum.at(max_cell, n_all, score)
+    summary = pd.DataFrame({
+        "project_name": _meta_full(meta, "project_name", N), "version": _meta_full(meta, "version", N),
+        "assessment_date": _meta_full(meta, "assessment_date", N), "tab": np.full(N, tab, dtype=object),
+        "rating": rate(total, max_cell), "total_score": total, "max_cell": max_cell,
+        "high_risk_items": np.bincount(n_all[score >= rules.HIGH_CELL], minlength=N),
+        "weighted_score": np.bincount(n_all, weights=weighted_score, minlength=N).astype(np.int64),
+        "risks": np.bincount(n_all, minlength=N),
+    }, columns=SUMMARY_COLUMNS)
+    return rows, summary
+
+def _meta_full(meta, name, N):
+    col = meta.get(name)
+    return np.full(N, "", dtype=object) if col is None else np.asarray(col, dtype=object)
+
+# ---------- Input checks (what the widgets allow) ----------
+def _tab(value) -> str:
+    tab = _TAB_NAMES.get(str(value).strip().lower()) if value is not None else None
+    if tab is None:
+        raise ValueError(f"tab must be one of {', '.join(TABS)}, got {value!r}")
+    return tab
+
+def _answer(value, what) -> bool:
+    # The radio gives "Yes"/"No"; True/False or other casings mean the same
+    if isinstance(value, bool):
+        return value
+    v = _ANSWERS.get(value.strip().lower()) if isinstance(value, str) else None
+    if v is None:
+        raise ValueError(f"{what} must be Yes or No, got {value!r}")
+    return v
+
+def _names(record, tab, names, categories):
+    # A risk_name or category the catalog doesn't have would silently score as unanswered
+    for field in ("answers", "P", "I", "evidence"):
+        for name in record.get(field, {}):
+            if name not in names:
+                raise ValueError(f"{field} has {name!r}, which is not a {tab} question")
+    for cat in record.get("weights", {}):
+        if cat not in categories:
+            raise ValueError(f"weights has {cat!r}, which is not a {tab} category")
+
+def _level(value, what) -> int:
+    # P and I come from a 1/2/3 selectbox
+    try:
+        v = int(value)
+    except (TypeError, ValueError):
+        v = None
+    if v not in (1, 2, 3) or (isinstance(value, float) and value != v):
+        raise ValueError(f"{what} must be 1, 2 or 3, got {value!r}")
+    return v
+
+def _weight(value, what) -> float:
+    try:
+        v = float(value)
+    except (TypeError, ValueError):
+        v = None
+    if v is None or not rules.WEIGHT_MIN <= v <= rules.WEIGHT_MAX:
+        raise ValueError(f"{what} must be between {rules.WEIGHT_MIN} and {rules.WEIGHT_MAX}, got {value!r}")
+    return v
+
+def _count(value, what) -> int:
+    try:
+        v = int(value)
+    except (TypeError, ValueError):
+        v = -1
+    if v < 0:
+        raise ValueError(f"{what} must be a count >= 0, got {value!r}")
+    return v
+
+def _status(value) -> str:
+    if value not in rules.RELEASE_STATUSES:
+        raise ValueError(f"release_status must be one of {', '.join(rules.RELEASE_STATUSES)}, got {value!r}")
+    return value
+
+def _links(record) -> tuple:
+    """(checked, unverifiable, "dead links") of a record's link status; checked >= unverifiable."""
+    status = record.get("links") or {}
+    dead = [str(u) for u in status.get("dead", ())]
+    checked = _count(status.get("checked", len(dead)), "links.checked")
+    if checked < len(dead):
+        raise ValueError(f"links.checked must be at least the {len(dead)} dead links, got {checked}")
+    return checked, len(dead), " ".join(dead)
+
+def _which(record) -> str:
+    ident = " ".join(str(record[k]) for k in ("project_name", "version", "assessment_date") if record.get(k))
+    return (f"{record['tab']} record" if record.get("tab") else "record") + (f" {ident}" if ident else "")
+
+# ---------- Row-by-row reference (same loop as assess_tab) ----------
+def score_record(record: dict):
+    """Score one record with plain Python; returns the list of row dicts assess_tab would build."""
+    try:
+        return _score_record(record)
+    except ValueError as e:
+        raise ValueError(f"{_which(record)}: {e}") from None
+
+def _score_record(record: dict):
+    tab = _tab(record.get("tab"))
+    catalog = load_catalog(tab)
+    _names(record, tab, set(catalog.names), set(catalog.weight_categories))
+    answers, Po, Io = record.get("answers", {}), record.get("P", {}), record.get("I", {})
+    ev = record.get("evidence", {})
+    weights = {c: _weight(v, f"weight of {c!r}") for c, v in record.get("weights", {}).items()}
+    base = {k: record.get(k, "") for k in META}
+    base["tab"] = tab
+    rows = []
+    for (cat, rname, question, risk_when_true, P, I, mitigation, group) in catalog.items:
+        yes = _answer(answers[rname], f"answer to {rname!r}") if rname in answers else not risk_when_true
+        risky = rules.is_risk(yes, risk_when_true)
+        p = _level(Po[rname], f"P of {rname!r}") if rname in Po else P
+        i = _level(Io[rname], f"I of {rname!r}") if rname in Io else I
+        poss, impact, score = rules.item_score(risky, p, i)
+        if risky:
+            rows.append(dict(base, category=cat, risk_name=rname, possibility=poss, impact=impact, score=score,
+                             weighted_score=rules.weighted(score, weights.get(cat, 1.0)), mitigation=mitigation,
+                             evidence=ev.get(rname, ""), defects_summary=""))
+    gate = rules.release_gate(_status(record.get("release_status", "Unknown")))
+    if gate:
+        cat, rname, mitigation, _ = rules.RELEASE_RISK
+        score = gate[0] * gate[1]
+        rows.append(dict(base, category=cat, risk_name=rname, possibility=gate[0], impact=gate[1], score=score,
+                         weighted_score=rules.weighted(score, weights.get(cat, 1.0)), mitigation=mitigation,
+                         evidence=record.get("release_url", ""), defects_summary=""))
+    counts = [_count(record.get("defects", {}).get(s, 0), s) for s in rules.SEVERITIES]
+    load = rules.defect_load(*counts)
+    if load:
+        cat, rname, mitigation, _ = rules.DEFECT_RISK
+        score = load[0] * load[1]
+        rows.append(dict(base, category=cat, risk_name=rname, possibility=load[0], impact=load[1], score=score,
+                         weighted_score=rules.weighted(score, weights.get(cat, 1.0)), mitigation=mitigation,
+                         evidence="", defects_summary=rules.defects_summary(*counts)))
+    checked, unverifiable, dead = _links(record)
+    gate = rules.evidence_gate(unverifiable, checked)
+    if gate:
+        cat, rname, mitigation, _ = rules.EVIDENCE_RISK
+        score = gate[0] * gate[1]
+        rows.append(dict(base, category=cat, risk_name=rname, possibility=gate[0], impact=gate[1], score=score,
+                         weighted_score=rules.weighted(score, weights.get(cat, 1.0)), mitigation=mitigation,
+                         evidence=dead, defects_summary=""))
+    return rows
+
+# ---------- Records → arrays ----------
+def records_to_arrays(tab, records):
+    """Turn a list of record dicts (one tab) into score_batch keyword arguments."""
+    a = tab_arrays(tab)
+    names = list(a["names"])
+    qidx = {n: i for i, n in enumerate(names)}
+    widx = {c: i for i, c in enumerate(a["weight_categories"])}
+    N, Q = len(records), len(names)
+    yes = np.broadcast_to(~a["risk_when_true"], (N, Q)).copy()
+    P = np.broadcast_to(a["P"], (N, Q)).copy()
+    I = np.broadcast_to(a["I"], (N, Q)).copy()
+    weights = np.ones((N, len(widx)))
+    evidence = np.full((N, Q), "", dtype=object)
+    status = np.empty(N, dtype=object); rel_url = np.empty(N, dtype=object)
+    defects = np.zeros((N, 4), dtype=np.int64)
+    links = np.zeros((N, 2), dtype=np.int64); dead_links = np.empty(N, dtype=object)
+    meta = {k: np.empty(N, dtype=object) for k in META}
+    for n, r in enumerate(records):
+        try:
+            for k in META:
+                meta[k][n] = r.get(k, "")
+            _names(r, tab, qidx, widx)
+            for name, ans in r.get("answers", {}).items():
+                yes[n, qidx[name]] = _answer(ans, f"answer to {name!r}")
+            for name, v in r.get("P", {}).items():
+                P[n, qidx[name]] = _level(v, f"P of {name!r}")
+            for name, v in r.get("I", {}).items():
+                I[n, qidx[name]] = _level(v, f"I of {name!r}")
+            for name, v in r.get("evidence", {}).items():
+                evidence[n, qidx[name]] = v
+            for cat, v in r.get("weights", {}).items():
+                weights[n, widx[cat]] = _weight(v, f"weight of {cat!r}")
+            status[n] = _status(r.get("release_status", "Unknown"))
+            rel_url[n] = r.get("release_url", "")
+            d = r.get("defects", {})
+            defects[n] = [_count(d.get(s, 0), s) for s in rules.SEVERITIES]
+            links[n, 0], links[n, 1], dead_links[n] = _links(r)
+        except ValueError as e:
+            raise ValueError(f"{_which(r)}: {e}") from None
+    return dict(yes=yes, P=P, I=I, weights=weights, release_status=status, defects=defects,
+                meta=meta, evidence=evidence, release_url=rel_url, links=links, dead_links=dead_links)
+
+def _record_from_csv(row: dict) -> dict:
+    rec = {k: row[k] for k in META + ("tab", "release_status", "release_url") if row.get(k)}
+    rec["answers"] = {}
+    for col, v in row.items():
+        if not v or col in rec:
+            continue
+        prefix, _, name = col.partition(":")
+        if name and prefix in ("P", "I", "evidence"):
+            rec.setdefault(prefix, {})[name] = v
+        elif name and prefix == "weight":
+            rec.setdefault("weights", {})[name] = v
+        elif col in rules.SEVERITIES:
+            rec.setdefault("defects", {})[col] = v
+        elif col == "links_checked":
+            rec.setdefault("links", {})["checked"] = v
+        elif col == "dead_links":
+            rec.setdefault("links", {})["dead"] = v.split()
+        else:
+            rec["answers"][col] = v
+    return rec
+
+def iter_records(path):
+    """Stream records from a .csv or JSONL file ("-" reads JSONL from stdin)."""
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as fh:
+            for row in csv.DictReader(fh):
+                yield _record_from_csv(row)
+        return
+    fh = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+    finally:
+        if fh is not sys.stdin:
+            fh.close()
+
+def score_stream(records, chunk_size=5000):
+    """Yield (rows, summary) per chunk of records, in input order across tabs."""
+    it = iter(records)
+    while True:
+        chunk = list(itertools.islice(it, chunk_size))
+        if not chunk:
+            return
+        by_tab = {}
+        for i, r in enumerate(chunk):
+            try:
+                by_tab.setdefault(_tab(r.get("tab")), []).append(i)
+            except ValueError as e:
+                raise ValueError(f"{_which(r)}: {e}") from None
+        parts, sums = [], []
+        for tab in TABS:
+            pos = by_tab.get(tab)
+            if not pos:
+                continue
+            rows, summary = score_batch(tab, **records_to_arrays(tab, [chunk[i] for i in pos]))
+            pos = np.asarray(pos)
+            summary["_pos"] = pos
+            rows["_pos"] = np.repeat(pos, summary["risks"].to_numpy())
+            parts.append(rows); sums.append(summary)
+        if not parts:
+            continue
+        rows = pd.concat(parts, ignore_index=True).sort_values("_pos", kind="stable").drop(columns="_pos")
+        summary = pd.concat(sums, ignore_index=True).sort_values("_pos", kind="stable").drop(columns="_pos")
+        yield rows.reset_index(drop=True), summary.reset_index(drop=True)
+
+# ---------- Sinks ----------
+class _CsvSink:
+    def __init__(self, path):
+        self.fh = sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+        self.header = True
+
+    def write(self, df):
+        df.to_csv(self.fh, index=False, header=self.header)
+        self.header = False
+
+    def close(self):
+        if self.fh is not sys.stdout:
+            self.fh.close()
+
+class _ParquetSink:
+    def __init__(self, path):
+        self.path, self.writer = path, None
+
+    def write(self, df):
+        import pyarrow as pa, pyarrow.parquet as pq
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if self.writer is None:
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        self.writer.write_table(table.cast(self.writer.schema))
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+def open_sink(path):
+    return _ParquetSink(path) if path.endswith(".parquet") else _CsvSink(path)
+
+def run(input_path, output_path, summary_path=None, chunk_size=5000, ingested_defects=False, check_links=False):
+    """Score a whole input file, streaming chunk by chunk; returns the number of assessments."""
+    out = open_sink(output_path)
+    summ = open_sink(summary_path) if summary_path else None
+    records = iter_records(input_path)
+    if ingested_defects:
+        from riskradar import defects
+        defects.ingest()
+        records = defects.fill_records(records)
+    if check_links:
+        from riskradar import linkcheck
+        records = linkcheck.fill_records(records)
+    n = 0
+    try:
+        for rows, summary in score_stream(records, chunk_size):
+            out.write(rows)
+            if summ:
+                summ.write(summary)
+            n += len(summary)
+    finally:
+        out.close()
+        if summ:
+            summ.close()
+    return n
+
+def add_arguments(ap):
+    ap.add_argument("input", help="JSONL or CSV answer sets ('-' = JSONL on stdin)")
+    ap.add_argument("-o", "--output", default="-", help="risk rows as .csv or .parquet ('-' = CSV on stdout)")
+    ap.add_argument("--summary", help="one row per assessment (rating, totals) as .csv or .parquet")
+    ap.add_argument("--chunk-size", type=int, default=5000)
+    ap.add_argument("--defects", action="store_true",
+                    help="records without `defects` take the counts ingested from tracker exports (see ingest-defects)")
+    ap.add_argument("--check-links", action="store_true",
+                    help="records without `links` get their evidence and release links checked (needs httpx)")
+
+def main(args):
+    t0 = time.perf_counter()
+    try:
+        n = run(args.input, args.output, args.summary, args.chunk_size, args.defects, args.check_links)
+    except ValueError as e:  # a record the UI could never produce
+        print(f"score: {e}", file=sys.stderr)
+        return 2
+    except ImportError:
+        print("score: --check-links needs httpx (pip install httpx)", file=sys.stderr)
+        return 2
+    secs = time.perf_counter() - t0
+    print(f"scored {n} assessments in {secs:.2f} s", file=sys.stderr)
+    return 0
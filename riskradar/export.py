@@ -0,0 +1,207 @@
+# riskradar/export.py — streaming bulk export of every saved assessment
+#
+# Reads results/*.csv file by file with the csv module and yields fixed-size
+# chunks of rows in EXPORT_COLUMNS (the assess_tab schema, rules.RESULT_COLUMNS,
+# plus the `notes` column app.py saves; empty for streamlit_app.py files), so
+# memory is bounded by one chunk whatever the size of results/. Writers consume the
+# chunks one at a time:
+#   .csv      csv.writer, straight to the file (or iter_csv_bytes() for an HTTP response)
+#   .parquet  one pyarrow row group per chunk
+#   .xlsx     openpyxl write-only workbook (optional: pip install openpyxl),
+#             continued on a new sheet every XLSX_MAX_ROWS rows
+# Filters: tabs and an assessment-date range. The file name's date/tab suffix
+# skips whole files; rows are still checked, so renamed files stay correct.
+import csv, io, os, re, sys, time
+
+from riskradar.rules import RESULT_COLUMNS
+from riskradar.store import results_dir, sanitize_filename
+
+CHUNK_ROWS = 50_000
+XLSX_MAX_ROWS = 1_048_575  # per sheet, below Excel's limit once the header is counted
+NUMERIC = ("possibility", "impact", "score", "weighted_score")
+FORMATS = ("csv", "parquet", "xlsx")
+EXPORT_COLUMNS = RESULT_COLUMNS + ["notes"]
+
+_NAME_RE = re.compile(r"_(\d{4}-\d{2}-\d{2})_([A-Za-z0-9.-]+)\.csv$")  # see store.results_filename
+_DATE, _TAB = EXPORT_COLUMNS.index("assessment_date"), EXPORT_COLUMNS.index("tab")
+
+# ---------- Source ----------
+def _wanted_file(name, file_tabs, date_from, date_to):
+    m = _NAME_RE.search(name)
+    if not m:
+        return True  # not our naming scheme; decide per row
+    date, tab = m.groups()
+    return ((not file_tabs or tab in file_tabs)
+            and (not date_from or date >= date_from) and (not date_to or date <= date_to))
+
+def _file_rows(path, tabs, date_from, date_to) -> list:
+    """Rows of one saved CSV (one assessment, so small) in EXPORT_COLUMNS order, filtered."""
+    with open(path, newline="", encoding="utf-8") as fh:
+        reader = csv.reader(fh)
+        header = next(reader, None)
+        if not header:
+            return []
+        rows = list(reader)
+    width = len(EXPORT_COLUMNS)
+    if header not in (EXPORT_COLUMNS, RESULT_COLUMNS):
+        # app.py (starter) saved `likelihood`; streamlit_app.py saves `possibility`
+        header = ["possibility" if h == "likelihood" else h for h in header]
+        idx = [header.index(c) if c in header else None for c in EXPORT_COLUMNS]
+        pad = [""] * len(header)
+        rows = [[(r + pad)[i] if i is not None else "" for i in idx] for r in rows]
+    elif rows and set(map(len, rows)) != {width}:
+        # RESULT_COLUMNS is a prefix of EXPORT_COLUMNS: padding adds the empty notes
+        rows = [(r + [""] * width)[:width] for r in rows]
+    if tabs:
+        rows = [r for r in rows if r[_TAB] in tabs]
+    if date_from or date_to:
+        rows = [r for r in rows if (not date_from or r[_DATE] >= date_from) and (not date_to or r[_DATE] <= date_to)]
+    return rows
+
+def iter_chunks(out_dir=None, tabs=None, date_from=None, date_to=None, chunk_rows=CHUNK_ROWS):
+    """Saved risk rows as lists of at most `chunk_rows` rows, file by file (sorted by name)."""
+    out_dir = out_dir or results_dir()
+    tabs = set(tabs or ())
+    file_tabs = {sanitize_filename(t) for t in tabs}
+    date_from, date_to = (str(d) if d else None for d in (date_from, date_to))
+    try:
+        names = sorted(e.name for e in os.scandir(out_dir)
+                       if e.is_file() and e.name.endswith(".csv") and not e.name.startswith("."))
+    except FileNotFoundError:
+        return
+    chunk = []
+    for name in names:
+        if not _wanted_file(name, file_tabs, date_from, date_to):
+            continue
+        try:
+            chunk += _file_rows(os.path.join(out_dir, name), tabs, date_from, date_to)
+        except (OSError, UnicodeDecodeError, csv.Error):
+            continue  # half-written or foreign file
+        while len(chunk) >= chunk_rows:
+            yield chunk[:chunk_rows]
+            chunk = chunk[chunk_rows:]
+    if chunk:
+        yield chunk
+
+# ---------- Writers ----------
+def _csv_to(fh, chunks):
+    w = csv.writer(fh)
+    w.writerow(EXPORT_COLUMNS)
+    n = 0
+    for chunk in chunks:
+        w.writerows(chunk)
+        n += len(chunk)
+    return n
+
+def _write_csv(path, chunks):
+    with open(path, "w", newline="", encoding="utf-8") as fh:
+        return _csv_to(fh, chunks)
+
+def iter_csv_bytes(chunks):
+    """UTF-8 CSV as one bytes block per chunk, e.g. for a streaming HTTP response."""
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(EXPORT_COLUMNS)
+    for chunk in chunks:
+        w.writerows(chunk)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+def _num(v):
+    try:
+        return float(v)
+    except ValueError:
+        return None
+
+def _write_parquet(path, chunks):
+    import pyarrow as pa, pyarrow.compute as pc, pyarrow.parquet as pq
+    schema = pa.schema([(c, pa.float64() if c in NUMERIC else pa.string()) for c in EXPORT_COLUMNS])
+
+    def numeric(col):
+        text = pa.array(col, pa.string())
+        try:
+            return pc.cast(pc.if_else(pc.equal(text, ""), pa.scalar(None, pa.string()), text), pa.float64())
+        except pa.ArrowInvalid:  # hand-edited cell; fall back to per-value parsing
+            return pa.array([_num(v) for v in col], pa.float64())
+
+    n = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in chunks:
+            # one list per column; zip(*chunk) would allocate a GC-tracked tuple per row
+            arrays = [numeric(col) if c in NUMERIC else pa.array(col, pa.string())
+                      for c, col in ((c, [r[i] for r in chunk]) for i, c in enumerate(EXPORT_COLUMNS))]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            pa.default_memory_pool().release_unused()
+            n += len(chunk)
+    return n
+
+def _write_xlsx(path, chunks):
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise RuntimeError("XLSX export needs openpyxl (pip install openpyxl)") from None
+    numeric = [EXPORT_COLUMNS.index(c) for c in NUMERIC]
+    wb = Workbook(write_only=True)
+    ws, in_sheet, n = None, XLSX_MAX_ROWS, 0
+    for chunk in chunks:
+        for row in chunk:
+            if in_sheet >= XLSX_MAX_ROWS:
+                ws = wb.create_sheet(f"assessments{'' if ws is None else len(wb.worksheets) + 1}")
+                ws.append(EXPORT_COLUMNS)
+                in_sheet = 0
+            for i in numeric:
+                row[i] = _num(row[i])
+            ws.append(row)
+            in_sheet += 1
+        n += len(chunk)
+    if ws is None:
+        wb.create_sheet("assessments").append(EXPORT_COLUMNS)
+    wb.save(path)
+    return n
+
+WRITERS = {"csv": _write_csv, "parquet": _write_parquet, "xlsx": _write_xlsx}
+
+def export(path, fmt=None, out_dir=None, tabs=None, date_from=None, date_to=None, chunk_rows=CHUNK_ROWS) -> int:
+    """Write every matching saved row to `path` (format from `fmt` or the extension); returns the row count.
+
+    Written to a temp name and renamed, so a failed export never leaves a partial file behind.
+    """
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in WRITERS:
+        raise ValueError(f"unsupported export format {fmt!r} (use one of {', '.join(FORMATS)})")
+    tmp = f"{path}.part"
+    try:
+        n = WRITERS[fmt](tmp, iter_chunks(out_dir, tabs, date_from, date_to, chunk_rows))
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+    return n
+
+# ---------- CLI ----------
+def add_arguments(ap):
+    ap.add_argument("output", help="export file: .csv, .parquet or .xlsx ('-' = CSV on stdout)")
+    ap.add_argument("--tab", action="append", help="only this tab; repeatable")
+    ap.add_argument("--from", dest="date_from", help="first assessment date (YYYY-MM-DD)")
+    ap.add_argument("--to", dest="date_to", help="last assessment date (YYYY-MM-DD)")
+    ap.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    ap.add_argument("--results-dir", help="saved assessments (default: results/ or $RISKRADAR_RESULTS_DIR)")
+
+def main(args):
+    t0 = time.perf_counter()
+    if args.output == "-":
+        out = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", newline="")
+        n = _csv_to(out, iter_chunks(args.results_dir, args.tab, args.date_from, args.date_to, args.chunk_rows))
+        out.flush()
+    else:
+        try:
+            n = export(args.output, None, args.results_dir, args.tab, args.date_from, args.date_to, args.chunk_rows)
+        except (ValueError, RuntimeError) as e:  # unknown extension / openpyxl missing
+            print(f"export: {e}", file=sys.stderr)
+            return 2
+    print(f"exported {n} rows in {time.perf_counter() - t0:.2f} s", file=sys.stderr)
+    return 0
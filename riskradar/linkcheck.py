@@ -0,0 +1,329 @@
+# riskradar/linkcheck.py — concurrent, cached validation of evidence and artifact links
+#
+# http(s) links found in evidence fields and the Intelligence Panel (release,
+# repo, CI, spec URLs) are checked with httpx's asyncio client. At most
+# CONCURRENCY requests are in flight overall and PER_HOST per host, each host
+# has its own small keep-alive pool (at most HOSTS_MAX are kept open; the least
+# recently used idle one is closed), and every request has a timeout. HEAD is
+# tried first; a 4xx/5xx answer is retried as a streamed GET (not every server
+# implements HEAD) before the link counts as unverifiable. 401/403/407/429 mean
+# the page exists behind a login or rate limit and count as reachable.
+#
+# Results live in a process-wide TTL cache shared by all sessions (TTL_OK for
+# reachable links, TTL_FAILED for the rest, so a fixed link is picked up soon).
+# The UI never waits on the network: lookup() answers from the cache and hands
+# misses to one background thread running its own event loop, whose pools are
+# closed at exit (shutdown()). check() is the
+# blocking variant for `python -m riskradar check-links`, `score --check-links`
+# and the benchmark.
+# RISKRADAR_LINKCHECK=0 turns the UI checks off (e.g. on a server without
+# outbound access).
+import asyncio, atexit, collections, contextlib, importlib.util, itertools, logging, os, re, sys, threading, time
+from urllib.parse import urlsplit
+
+CONCURRENCY = 32
+PER_HOST = 4
+HOSTS_MAX = 64  # host pools kept open between checks
+TIMEOUT = 5.0  # seconds per request (connect: at most 3)
+TTL_OK = 3600.0
+TTL_FAILED = 300.0
+CACHE_MAX = 20_000
+DRAIN_MAX = 64 * 1024  # bytes of an error page read so its connection stays reusable
+REACHABLE = frozenset((401, 403, 407, 429))
+USER_AGENT = "RiskRadar360-linkcheck/1"
+
+Result = collections.namedtuple("Result", "url ok status detail checked_at")  # status 0 = no HTTP answer
+
+_URL_RE = re.compile(r"https?://[^\s<>\"'`]+", re.IGNORECASE)
+
+log = logging.getLogger(__name__)
+_lock = threading.Lock()
+_cache = collections.OrderedDict()  # url -> Result, least recently checked first
+_inflight = set()
+_stats = {"checked": 0, "unverifiable": 0, "cache_hits": 0}
+_worker = None
+
+def enabled() -> bool:
+    """UI checks run unless RISKRADAR_LINKCHECK=0 or httpx isn't installed."""
+    if os.environ.get("RISKRADAR_LINKCHECK", "1").lower() in ("0", "off", "false", "no"):
+        return False
+    return importlib.util.find_spec("httpx") is not None
+
+def extract(*texts) -> list:
+    """http(s) URLs in free text, first occurrence order, trailing punctuation stripped."""
+    out = {}
+    for text in texts:
+        if text:
+            for m in _URL_RE.finditer(text):
+                out[m.group(0).rstrip(".,;:!?)]}")] = None
+    return list(out)
+
+# ---------- Cache ----------
+def _fresh(r, now) -> bool:
+    return now - r.checked_at < (TTL_OK if r.ok else TTL_FAILED)
+
+def cached(urls) -> dict:
+    """url -> Result for the links with a fresh cached result."""
+    now, out = time.time(), {}
+    with _lock:
+        for url in urls:
+            r = _cache.get(url)
+            if r is not None and _fresh(r, now):
+                out[url] = r
+        _stats["cache_hits"] += len(out)
+    return out
+
+def _store(results):
+    with _lock:
+        for r in results:
+            _cache[r.url] = r
+            _cache.move_to_end(r.url)
+        while len(_cache) > CACHE_MAX:
+            _cache.popitem(last=False)
+        _stats["checked"] += len(results)
+        _stats["unverifiable"] += sum(1 for r in results if not r.ok)
+
+def clear():
+    with _lock:
+        _cache.clear()
+
+def stats() -> dict:
+    with _lock:
+        return dict(_stats, cached=len(_cache), inflight=len(_inflight))
+
+# ---------- Checking ----------
+def _client(per_host, timeout):
+    import httpx
+    return httpx.AsyncClient(
+        follow_redirects=True, headers={"User-Agent": USER_AGENT},
+        timeout=httpx.Timeout(timeout, connect=min(timeout, 3.0)),
+        limits=httpx.Limits(max_connections=per_host, max_keepalive_connections=per_host))
+
+class _Pools:
+    """host -> (semaphore, client), least recently used first.
+
+    One small pool per host rather than one shared pool: hosts don't evict each other's idle
+    connections, and httpcore's pool bookkeeping grows quadratically with the pool size. Past
+    `size` hosts, the least recently used pools no check is using are closed.
+    """
+
+    def __init__(self, per_host, timeout, size=HOSTS_MAX):
+        self.per_host, self.timeout, self.size = per_host, timeout, size
+        self.pools = collections.OrderedDict()
+        self.busy = collections.Counter()  # host -> checks holding its pool
+
+    @contextlib.asynccontextmanager
+    async def use(self, host):
+        if host not in self.pools:
+            self.pools[host] = asyncio.Semaphore(self.per_host), _client(self.per_host, self.timeout)
+        self.pools.move_to_end(host)
+        self.busy[host] += 1
+        try:
+            await self._evict()
+            yield self.pools[host]
+        finally:
+            self.busy[host] -= 1
+            if not self.busy[host]:
+                del self.busy[host]
+
+    async def _evict(self):
+        idle = [h for h in self.pools if not self.busy[h]][:max(0, len(self.pools) - self.size)]
+        await asyncio.gather(*(self.pools.pop(h)[1].aclose() for h in idle))
+
+    async def close(self):
+        pools, self.pools = self.pools, collections.OrderedDict()
+        await asyncio.gather(*(client.aclose() for _, client in pools.values()))
+
+async def _check_one(url, limit, pools) -> Result:
+    import httpx
+    try:
+        host = urlsplit(url).netloc.lower()
+    except ValueError as e:
+        return Result(url, False, 0, f"{type(e).__name__}: {e}"[:200], time.time())
+    # Host first: a queue on one slow host mustn't hold global slots
+    async with pools.use(host) as (host_limit, client), host_limit, limit:
+        try:
+            resp = await client.head(url)
+            if resp.status_code >= 400 and resp.status_code not in REACHABLE:
+                async with client.stream("GET", url) as resp:
+                    # The status is all we need; draining a small error page lets the connection be reused
+                    drained = 0
+                    async for chunk in resp.aiter_raw():
+                        drained += len(chunk)
+                        if drained > DRAIN_MAX:
+                            break
+            status = resp.status_code
+            ok = status < 400 or status in REACHABLE
+            detail = f"HTTP {status} {resp.reason_phrase}".rstrip()
+        except httpx.TimeoutException:
+            status, ok, detail = 0, False, "timed out"
+        except (httpx.HTTPError, httpx.InvalidURL, OSError, ValueError) as e:
+            status, ok, detail = 0, False, f"{type(e).__name__}: {e}"[:200]
+    return Result(url, ok, status, detail, time.time())
+
+async def _check_many(urls, limit, pools) -> list:
+    results = await asyncio.gather(*(_check_one(u, limit, pools) for u in urls))
+    _store(results)
+    return results
+
+async def check_async(urls, concurrency=CONCURRENCY, per_host=PER_HOST, timeout=TIMEOUT) -> dict:
+    """Check every url now (no cache lookup); url -> Result. The results are cached."""
+    pools = _Pools(per_host, timeout)
+    try:
+        results = await _check_many(list(urls), asyncio.Semaphore(concurrency), pools)
+    finally:
+        await pools.close()
+    return {r.url: r for r in results}
+
+def check(urls, concurrency=CONCURRENCY, per_host=PER_HOST, timeout=TIMEOUT, force=False) -> dict:
+    """Blocking: url -> Result for every url, from the cache where fresh unless `force`."""
+    urls = list(dict.fromkeys(urls))
+    found = {} if force else cached(urls)
+    todo = [u for u in urls if u not in found]
+    if todo:
+        found.update(asyncio.run(check_async(todo, concurrency, per_host, timeout)))
+    return {u: found[u] for u in urls}
+
+# ---------- Background ----------
+class _Worker:
+    """One daemon thread with an event loop; host pools are kept so connections are reused across batches."""
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.limit = None
+        self.pools = _Pools(PER_HOST, TIMEOUT)
+        threading.Thread(target=self.loop.run_forever, name="riskradar-linkcheck", daemon=True).start()
+
+    async def _batch(self, urls):
+        try:
+            if self.limit is None:
+                self.limit = asyncio.Semaphore(CONCURRENCY)
+            await _check_many(urls, self.limit, self.pools)
+        except Exception:
+            log.exception("link check failed")
+        finally:
+            with _lock:
+                _inflight.difference_update(urls)
+
+    def submit(self, urls):
+        asyncio.run_coroutine_threadsafe(self._batch(urls), self.loop)
+
+    def close(self, timeout=5.0):
+        try:
+            asyncio.run_coroutine_threadsafe(self.pools.close(), self.loop).result(timeout)
+        except Exception:
+            log.exception("closing link check connections failed")
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+
+def schedule(urls) -> int:
+    """Queue the links without a fresh result that aren't already being checked; returns how many."""
+    global _worker
+    now = time.time()
+    with _lock:
+        todo = [u for u in dict.fromkeys(urls)
+                if u not in _inflight and not (u in _cache and _fresh(_cache[u], now))]
+        _inflight.update(todo)
+        if todo and _worker is None:
+            _worker = _Worker()
+    if todo:
+        _worker.submit(todo)
+    return len(todo)
+
+@atexit.register
+def shutdown():
+    """Close the background worker's connections and stop its thread; the next schedule() starts a new one."""
+    global _worker
+    with _lock:
+        worker, _worker = _worker, None
+    if worker is not None:
+        worker.close()
+
+def lookup(urls) -> dict:
+    """Never blocks: url -> cached Result, or None while its check is pending (then scheduled)."""
+    found = cached(urls)
+    missing = [u for u in urls if u not in found]
+    if missing:
+        schedule(missing)
+    return {u: found.get(u) for u in urls}
+
+def pending(urls) -> int:
+    """How many of `urls` are being checked right now."""
+    with _lock:
+        return sum(1 for u in urls if u in _inflight)
+
+def wait(timeout=None) -> bool:
+    """Until no check is in flight (tests, benchmarks); False on timeout."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        with _lock:
+            if not _inflight:
+                return True
+        if deadline is not None and time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+
+# ---------- Saved assessments ----------
+def saved_links(out_dir=None, tabs=None) -> dict:
+    """url -> [(project, version, date, tab, risk_name), ...] for every link in saved evidence."""
+    from riskradar import export
+    from riskradar.rules import RESULT_COLUMNS
+    cols = [RESULT_COLUMNS.index(c) for c in ("project_name", "version", "assessment_date", "tab", "risk_name")]
+    ev = RESULT_COLUMNS.index("evidence")
+    refs = {}
+    for chunk in export.iter_chunks(out_dir, tabs):
+        for row in chunk:
+            if "://" in row[ev]:
+                for url in extract(row[ev]):
+                    refs.setdefault(url, []).append(tuple(row[i] for i in cols))
+    return refs
+
+def fill_records(records, chunk=500):
+    """Give engine records without a "links" field the status of their evidence and release links.
+
+    Checked a chunk of records at a time, so links shared across records are fetched once.
+    """
+    it = iter(records)
+    while True:
+        batch = list(itertools.islice(it, chunk))
+        if not batch:
+            return
+        urls = {id(rec): extract(*(rec.get("evidence") or {}).values(), rec.get("release_url"))
+                for rec in batch if "links" not in rec}
+        results = check(u for found in urls.values() for u in found)
+        for rec in batch:
+            if id(rec) in urls:
+                found = urls[id(rec)]
+                rec["links"] = {"checked": len(found), "dead": [u for u in found if not results[u].ok]}
+            yield rec
+
+# ---------- CLI ----------
+def add_arguments(ap):
+    ap.add_argument("urls", nargs="*", help="links (or text containing links) to check; "
+                                            "default: every evidence link in the saved assessments")
+    ap.add_argument("--tab", action="append", help="saved assessments of this tab only; repeatable")
+    ap.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    ap.add_argument("--per-host", type=int, default=PER_HOST)
+    ap.add_argument("--timeout", type=float, default=TIMEOUT, help="seconds per request")
+    ap.add_argument("--all", action="store_true", help="list reachable links too")
+    ap.add_argument("--results-dir", help="saved assessments (default: results/ or $RISKRADAR_RESULTS_DIR)")
+
+def main(args):
+    t0 = time.perf_counter()
+    refs = {u: [] for u in extract(*args.urls)} if args.urls else saved_links(args.results_dir, args.tab)
+    try:
+        results = check(refs, args.concurrency, args.per_host, args.timeout)
+    except ImportError:
+        print("check-links: needs httpx (pip install httpx)", file=sys.stderr)
+        return 2
+    bad = 0
+    for url, r in results.items():
+        bad += not r.ok
+        if args.all or not r.ok:
+            print(f"{'ok' if r.ok else 'UNVERIFIABLE':<12} {r.detail:<28} {url}")
+            for project, version, date, tab, risk in refs[url][:3]:
+                print(f"{'':<13}{project} {version} {date} {tab}: {risk}")
+            if len(refs[url]) > 3:
+                print(f"{'':<13}… and {len(refs[url]) - 3} more")
+    print(f"checked {len(results)} links in {time.perf_counter() - t0:.2f} s: {bad} unverifiable", file=sys.stderr)
+    return 1 if bad else 0
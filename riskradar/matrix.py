@@ -0,0 +1,89 @@
+# riskradar/matrix.py — portfolio-wide P×I risk matrix with filters and drilldown
+#
+# Every saved risk row falls into one of 9 cells, (P-1)*3 + (I-1). MatrixIndex
+# groups the rows by (tab, category, project, assessment date) once, and
+# np.bincount gives each group its 9 partial counts. Re-filtering then only
+# touches the groups: every filter becomes a boolean over a dimension's
+# (few) distinct values, indexed by the groups' codes, and the matrix is the
+# sum of the surviving groups' partials — milliseconds even for hundreds of
+# thousands of rows. Drilldown to the contributing risks is one row mask.
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = ("tab", "category", "project_name", "assessment_date")
+
+class MatrixIndex:
+    """Precomputed partial counts over a portfolio frame (see riskradar.portfolio)."""
+
+    def __init__(self, frame: pd.DataFrame):
+        self.frame = frame
+        P = pd.to_numeric(frame["possibility"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        I = pd.to_numeric(frame["impact"], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        valid = np.isin(P, (1, 2, 3)) & np.isin(I, (1, 2, 3))
+        self.rows_index = np.flatnonzero(valid)  # positions of rows that land in a cell
+        self.cells = ((P[valid] - 1) * 3 + (I[valid] - 1)).astype(np.int64)
+
+        # Per dimension: its values and each valid row's code (0 = missing, values start at 1)
+        self.values, codes = {}, []
+        for dim in DIMENSIONS:
+            col = frame[dim]
+            if not isinstance(col.dtype, pd.CategoricalDtype):
+                col = col.astype("category")
+            self.values[dim] = np.array(["", *map(str, col.cat.categories)], dtype=str)
+            codes.append(col.cat.codes.to_numpy()[valid].astype(np.int64) + 1)
+
+        dims = tuple(len(self.values[d]) for d in DIMENSIONS)
+        if len(self.cells):
+            flat = np.ravel_multi_index(codes, dims)
+            keys, self.row_group = np.unique(flat, return_inverse=True)
+        else:
+            keys, self.row_group = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        self.group_codes = dict(zip(DIMENSIONS, np.unravel_index(keys, dims)))
+        self.partials = np.bincount(self.row_group * 9 + self.cells, minlength=len(keys) * 9).reshape(len(keys), 9)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def options(self, dim: str):
+        """Filterable values of a dimension (sorted, without the missing marker)."""
+        return sorted(v for v in self.values[dim][1:])
+
+    def _group_mask(self, tabs=None, categories=None, projects=None, date_from=None, date_to=None):
+        mask = np.ones(len(self.partials), dtype=bool)
+        for dim, chosen in (("tab", tabs), ("category", categories), ("project_name", projects)):
+            if chosen:
+                mask &= np.isin(self.values[dim], list(chosen))[self.group_codes[dim]]
+        if date_from or date_to:
+            dates = self.values["assessment_date"]
+            ok = dates != ""
+            if date_from:
+                ok &= dates >= str(date_from)  # ISO dates compare as strings
+            if date_to:
+                ok &= dates <= str(date_to)
+            mask &= ok[self.group_codes["assessment_date"]]
+        return mask
+
+    def counts(self, **filters) -> np.ndarray:
+        """3×3 int array: rows per (P, I) among the groups passing `filters`."""
+        mask = self._group_mask(**filters)
+        return self.partials[mask].sum(axis=0).reshape(3, 3)
+
+    def rows(self, p: int, i: int, **filters) -> pd.DataFrame:
+        """The saved risk rows behind one cell of the filtered matrix."""
+        keep = self._group_mask(**filters)[self.row_group] & (self.cells == (p - 1) * 3 + (i - 1))
+        return self.frame.iloc[self.rows_index[keep]]
+
+_memo = (None, None)  # (frame, MatrixIndex) of the last frame indexed
+
+def index_for(frame: pd.DataFrame) -> MatrixIndex:
+    """MatrixIndex of `frame`, rebuilt only when load_portfolio hands out a new frame."""
+    global _memo
+    cached_frame, index = _memo
+    if cached_frame is not frame:
+        index = MatrixIndex(frame)
+        _memo = (frame, index)
+    return index
+
+def as_grid(counts: np.ndarray):
+    """Hashable tuple grid for riskradar.charts.heatmap_png."""
+    return tuple(tuple(int(v) for v in row) for row in counts)
@@ -0,0 +1,155 @@
+# riskradar/metrics.py — opt-in timing spans with rolling histograms
+#
+# Disabled unless one of these is set (checked once at import):
+#   RISKRADAR_METRICS_PORT   serve Prometheus text on 127.0.0.1:<port>/metrics
+#   RISKRADAR_METRICS_FILE   append one JSON line per span to a rotating file
+#                            (RISKRADAR_METRICS_FILE_MB per file, 5 backups)
+# When disabled, span() hands back one shared no-op context manager, so an
+# instrumented block costs a function call and a global lookup.
+#
+# Spans are tagged with phase, tab and session. Histograms aggregate per
+# (phase, tab) over a rolling window — per-session series would grow without
+# bound — while the JSONL events keep the session id.
+import bisect, contextlib, json, logging, os, threading, time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from logging.handlers import RotatingFileHandler
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+WINDOW_S = 600  # histograms cover the last 10 minutes
+SLOTS = 10
+NOOP = contextlib.nullcontext()
+
+log = logging.getLogger(__name__)
+_lock = threading.Lock()
+_hists = {}  # (phase, tab) -> RollingHistogram
+_events = None  # logger writing JSONL, when RISKRADAR_METRICS_FILE is set
+_server = None
+_enabled = False
+
+class RollingHistogram:
+    """Bucketed durations over the last WINDOW_S seconds, kept as SLOTS sub-histograms."""
+    __slots__ = ("width", "counts", "sums", "ticks")
+
+    def __init__(self, window=WINDOW_S, slots=SLOTS):
+        self.width = window / slots
+        self.counts = [[0] * (len(BUCKETS) + 1) for _ in range(slots)]
+        self.sums = [0.0] * slots
+        self.ticks = [-1] * slots
+
+    def observe(self, seconds: float, now: float):
+        tick = int(now // self.width)
+        i = tick % len(self.ticks)
+        if self.ticks[i] != tick:  # slot is from an older lap of the ring: recycle it
+            self.ticks[i] = tick
+            self.counts[i] = [0] * (len(BUCKETS) + 1)
+            self.sums[i] = 0.0
+        self.counts[i][bisect.bisect_left(BUCKETS, seconds)] += 1
+        self.sums[i] += seconds
+
+    def snapshot(self, now: float):
+        """(per-bucket counts incl. +Inf, sum) of the slots still inside the window."""
+        tick = int(now // self.width)
+        live = [i for i, t in enumerate(self.ticks) if 0 <= tick - t < len(self.ticks)]
+        counts = [sum(self.counts[i][b] for i in live) for b in range(len(BUCKETS) + 1)]
+        return counts, sum(self.sums[i] for i in live)
+
+class _Span:
+    __slots__ = ("phase", "tab", "session", "t0")
+
+    def __init__(self, phase, tab, session):
+        self.phase, self.tab, self.session = phase, tab, session
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe(self.phase, time.perf_counter() - self.t0, self.tab, self.session, error=exc_type is not None)
+        return False
+
+# ---------- Recording ----------
+def enabled() -> bool:
+    return _enabled
+
+def span(phase: str, tab: str = "", session: str = ""):
+    """Context manager timing one phase; a shared no-op when metrics are off."""
+    if not _enabled:
+        return NOOP
+    return _Span(phase, tab, session)
+
+def observe(phase: str, seconds: float, tab: str = "", session: str = "", error=False):
+    now = time.time()
+    with _lock:
+        hist = _hists.get((phase, tab))
+        if hist is None:
+            hist = _hists[(phase, tab)] = RollingHistogram()
+        hist.observe(seconds, now)
+    if _events is not None:
+        _events.info(json.dumps({"ts": round(now, 3), "phase": phase, "tab": tab, "session": session,
+                                 "ms": round(seconds * 1e3, 3), "error": error}))
+
+def reset():
+    with _lock:
+        _hists.clear()
+
+# ---------- Export ----------
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def render_prometheus() -> str:
+    """Prometheus text exposition (0.0.4) of the rolling phase histograms."""
+    now = time.time()
+    with _lock:
+        snaps = sorted((key, h.snapshot(now)) for key, h in _hists.items())
+    out = [f"# HELP riskradar_phase_seconds Time spent per app phase (last {WINDOW_S}s).",
+           "# TYPE riskradar_phase_seconds histogram"]
+    for (phase, tab), (counts, total) in snaps:
+        labels = f'phase="{_label(phase)}",tab="{_label(tab)}"'
+        running = 0
+        for le, c in zip([*map(str, BUCKETS), "+Inf"], counts):
+            running += c
+            out.append(f'riskradar_phase_seconds_bucket{{{labels},le="{le}"}} {running}')
+        out.append(f"riskradar_phase_seconds_sum{{{labels}}} {total:.6f}")
+        out.append(f"riskradar_phase_seconds_count{{{labels}}} {running}")
+    return "\n".join(out) + "\n"
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_prometheus().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # keep scrapes out of the server log
+        pass
+
+# ---------- Setup ----------
+def configure(port=None, path=None, max_mb=10):
+    """Turn metrics on: a local /metrics endpoint on `port`, JSONL events to `path`."""
+    global _enabled, _events, _server
+    with _lock:
+        if port and _server is None:
+            try:
+                _server = ThreadingHTTPServer(("127.0.0.1", int(port)), _Handler)
+            except OSError as exc:  # e.g. a second server process on the same port
+                log.warning("metrics endpoint not started on port %s: %s", port, exc)
+            else:
+                threading.Thread(target=_server.serve_forever, name="riskradar-metrics", daemon=True).start()
+        if path and _events is None:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            handler = RotatingFileHandler(path, maxBytes=int(max_mb * 1024 * 1024), backupCount=5, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            _events = logging.getLogger("riskradar.metrics.events")
+            _events.setLevel(logging.INFO)
+            _events.propagate = False
+            _events.addHandler(handler)
+        _enabled = True
+
+if os.environ.get("RISKRADAR_METRICS_PORT") or os.environ.get("RISKRADAR_METRICS_FILE"):
+    configure(port=os.environ.get("RISKRADAR_METRICS_PORT"), path=os.environ.get("RISKRADAR_METRICS_FILE"),
+              max_mb=float(os.environ.get("RISKRADAR_METRICS_FILE_MB") or 10))
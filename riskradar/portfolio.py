@@ -0,0 +1,163 @@
+# riskradar/portfolio.py — consolidated, incrementally refreshed view over results/*.csv
+#
+# A manifest maps each saved CSV to its (mtime_ns, size). On load, only files
+# that are new or changed since the manifest was written are parsed; rows of
+# changed/removed files are dropped by `source_file`. The consolidated rows are
+# kept in a Feather file next to the manifest (results/.portfolio/) and, within
+# a server process, in memory — so a warm load is one scandir of results/ (a
+# stat() per CSV). The folder mtime alone isn't enough: a CSV rewritten in
+# place (an editor, an append) doesn't change it.
+import csv, json, os, tempfile, threading
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from riskradar import rules
+from riskradar.engine import rate
+from riskradar.store import ensure_results_dir
+
+CACHE_DIRNAME = ".portfolio"
+MANIFEST = "manifest.json"
+ROWS = "rows.feather"
+
+COLUMNS = ["project_name","version","assessment_date","tab","category","risk_name","possibility","impact",
+           "score","weighted_score","mitigation","evidence","defects_summary","assessor","notes","source_file"]
+NUMERIC = ["possibility","impact","score","weighted_score"]
+CATEGORICAL = ["project_name","version","assessment_date","tab","category","risk_name","assessor","source_file"]
+
+_lock = threading.Lock()
+_memo = {}  # out_dir -> (manifest, frame)
+
+# ---------- Ingest ----------
+def _scan(out_dir):
+    files = {}
+    with os.scandir(out_dir) as it:
+        for e in it:
+            if e.is_file() and e.name.endswith(".csv") and not e.name.startswith("."):
+                st_ = e.stat()
+                files[e.name] = [st_.st_mtime_ns, st_.st_size]
+    return files
+
+def _read_files(out_dir, names):
+    """Parse CSVs with the csv module into one column dict (much cheaper than pd.read_csv per file)."""
+    cols = {c: [] for c in COLUMNS}
+    for name in names:
+        try:
+            with open(os.path.join(out_dir, name), newline="", encoding="utf-8") as fh:
+                reader = csv.reader(fh)
+                header = next(reader, None)
+                if not header:
+                    continue
+                # app.py (starter) saved `likelihood`; streamlit_app.py saves `possibility`
+                header = ["possibility" if h == "likelihood" else h for h in header]
+                idx = [(cols[h], i) for i, h in enumerate(header) if h in cols and h != "source_file"]
+                missing = [cols[c] for c in COLUMNS if c not in header and c != "source_file"]
+                n = 0
+                for row in reader:
+                    for target, i in idx:
+                        target.append(row[i] if i < len(row) else "")
+                    n += 1
+                for target in missing:
+                    target.extend([""] * n)
+                cols["source_file"].extend([name] * n)
+        except (OSError, UnicodeDecodeError, csv.Error):
+            continue  # half-written or foreign file; picked up again once its mtime changes
+    frame = pd.DataFrame(cols, columns=COLUMNS)
+    for c in NUMERIC:
+        frame[c] = pd.to_numeric(frame[c], errors="coerce")
+    return frame
+
+def _compact(frame):
+    for c in CATEGORICAL:
+        frame[c] = frame[c].astype(str).astype("category")
+    for c in NUMERIC:
+        frame[c] = frame[c].astype("float32")
+    return frame.reset_index(drop=True)
+
+def _append(frame, fresh):
+    # Union categories instead of round-tripping the whole cache through str
+    cols = {}
+    for c in COLUMNS:
+        if c in CATEGORICAL:
+            cols[c] = union_categoricals([frame[c], fresh[c]])
+        else:
+            cols[c] = np.concatenate([frame[c].to_numpy(), fresh[c].to_numpy()])
+    return pd.DataFrame(cols, columns=COLUMNS)
+
+def _read_cache(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, MANIFEST), encoding="utf-8") as fh:
+            manifest = json.load(fh)
+        frame = pd.read_feather(os.path.join(cache_dir, ROWS))
+    except (OSError, ValueError):
+        return {}, _compact(_read_files("", []))
+    return manifest, frame
+
+def _write_atomic(path, write):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp_")
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+def _write_cache(cache_dir, manifest, frame):
+    os.makedirs(cache_dir, exist_ok=True)
+    # Rows first, then manifest: a crash in between only causes a re-ingest
+    _write_atomic(os.path.join(cache_dir, ROWS), lambda p: frame.to_feather(p))
+    def dump(p):
+        with open(p, "w", encoding="utf-8") as fh:
+            json.dump(manifest, fh)
+    _write_atomic(os.path.join(cache_dir, MANIFEST), dump)
+
+def load_portfolio(out_dir=None) -> pd.DataFrame:
+    """All saved risk rows, one row per risk per assessment file (`source_file`)."""
+    out_dir = out_dir or ensure_results_dir()
+    cache_dir = os.path.join(out_dir, CACHE_DIRNAME)
+    with _lock:
+        manifest, frame = _memo[out_dir] if out_dir in _memo else _read_cache(cache_dir)
+        files = _scan(out_dir)
+        if manifest == files:
+            _memo[out_dir] = (manifest, frame)
+            return frame
+
+        dropped = [n for n, sig in manifest.items() if files.get(n) != sig]
+        added = [n for n, sig in files.items() if manifest.get(n) != sig]
+        if dropped:
+            frame = frame[~frame["source_file"].isin(dropped)].copy()
+            frame["source_file"] = frame["source_file"].cat.remove_unused_categories()
+        if added:
+            frame = _append(frame, _compact(_read_files(out_dir, added)))
+        frame = frame.reset_index(drop=True)
+        _write_cache(cache_dir, files, frame)
+        _memo[out_dir] = (files, frame)
+        return frame
+
+# ---------- Views ----------
+def assessments(frame: pd.DataFrame) -> pd.DataFrame:
+    """One row per saved assessment with totals and the overall rating."""
+    g = frame.groupby("source_file", observed=True, sort=False)
+    out = g.agg(project_name=("project_name", "first"), version=("version", "first"),
+                assessment_date=("assessment_date", "first"), tab=("tab", "first"),
+                risks=("risk_name", "size"), total_score=("score", "sum"), max_cell=("score", "max"),
+                weighted_score=("weighted_score", "sum"))
+    out["rating"] = rate(out["total_score"], out["max_cell"])
+    return out.reset_index().sort_values(["assessment_date", "project_name"], ascending=[False, True])
+
+def top_red_flags(frame: pd.DataFrame, n: int = 10) -> pd.DataFrame:
+    """Risks most often flagged red (score ≥ rules.RED_FLAG_SCORE) across the portfolio."""
+    red = frame[frame["score"] >= rules.RED_FLAG_SCORE]
+    out = (red.groupby(["risk_name", "category"], observed=True)
+              .agg(assessments=("source_file", "nunique"), avg_score=("score", "mean"),
+                   mitigation=("mitigation", "first"))
+              .reset_index())
+    return out.sort_values(["assessments", "avg_score"], ascending=False).head(n)
+
+def category_totals(frame: pd.DataFrame) -> pd.DataFrame:
+    return (frame.groupby("category", observed=True)
+                 .agg(risks=("risk_name", "size"), score=("score", "sum"), weighted_score=("weighted_score", "sum"))
+                 .sort_values("score", ascending=False))
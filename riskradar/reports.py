@@ -0,0 +1,251 @@
+# riskradar/reports.py — per-project steering reports, rendered on a process pool
+#
+# One report per project (HTML with embedded PNGs, or PDF via matplotlib's
+# PdfPages) with a section per tab: rating, totals, top-5 red flags, the P×I
+# heatmap and the category radar — the charts of streamlit_app.plot_heatmap
+# and app.render_radar (riskradar.charts). Each tab uses the project's newest
+# saved assessment of the chosen version.
+#
+# Work is planned in the parent from the portfolio frame, then fanned out in two
+# passes over a ProcessPoolExecutor (matplotlib holds one lock per process):
+#   1. every distinct chart input (3×3 grid / category vector) not yet in the
+#      figure cache (results/.reports/figures/<sha1>.png) is rendered once;
+#   2. reports are assembled from the cached PNGs.
+# A report whose inputs hash the same as last run (results/.reports/manifest.json)
+# is not rebuilt at all.
+import base64, hashlib, html, io, json, os, sys, time
+from concurrent.futures import ProcessPoolExecutor
+
+from riskradar import rules
+from riskradar.store import ensure_results_dir, sanitize_filename
+
+FORMATS = ("html", "pdf")
+RED_FLAGS = 5
+CACHE_DIRNAME = ".reports"
+LAYOUT = 1  # bump when the report layout changes, so cached reports are rebuilt
+
+# ---------- Planning (parent) ----------
+def build_jobs(frame, version=None, projects=None, tabs=None) -> list:
+    """One plain-data job per project: its newest assessment per tab (of `version`, or the newest version)."""
+    df = frame
+    if version:
+        df = df[df["version"] == version]
+    if projects:
+        df = df[df["project_name"].isin(projects)]
+    if tabs:
+        df = df[df["tab"].isin(tabs)]
+    if df.empty:
+        return []
+    runs = (df.groupby("source_file", observed=True, sort=False)
+              .agg(project=("project_name", "first"), version=("version", "first"),
+                   date=("assessment_date", "first"), tab=("tab", "first"))
+              .reset_index())
+    runs = runs.astype({"project": str, "version": str, "date": str, "tab": str})
+    runs = runs.sort_values(["project", "date", "source_file"])
+    if not version:  # each project's newest version, ordered like release deltas (25.9 < 25.10)
+        from riskradar.delta import version_key
+        newest = runs.groupby("project")["version"].agg(lambda v: max(v, key=lambda x: (version_key(x), x)))
+        runs = runs[runs["version"] == runs["project"].map(newest)]
+    runs = runs.groupby(["project", "tab"]).tail(1)
+    rows_by_file = {f: g for f, g in df[df["source_file"].isin(runs["source_file"])].groupby("source_file", observed=True)}
+
+    jobs = []
+    for project, group in runs.groupby("project", sort=True):
+        sections = []
+        for r in group.sort_values("tab").itertuples():
+            rows = rows_by_file[r.source_file]
+            scores = rows["score"].fillna(0).tolist()
+            total, max_cell = sum(scores), max(scores, default=0)
+            red = rows[rows["score"] >= rules.RED_FLAG_SCORE].sort_values("score", ascending=False, kind="stable")
+            cats = rows.groupby("category", observed=True)["score"].sum().sort_index()
+            sections.append({
+                "tab": r.tab, "date": r.date, "rating": rules.score_to_rating(total, max_cell),
+                "total": float(total), "max_cell": float(max_cell),
+                "weighted": round(float(rows["weighted_score"].fillna(0).sum()), 1),
+                "high": sum(1 for s in scores if s >= rules.HIGH_CELL), "risks": len(scores),
+                "red_flags": [(str(x.risk_name), str(x.category), float(x.score), str(x.mitigation))
+                              for x in red.head(RED_FLAGS).itertuples()],
+                "grid": _grid(rows),
+                "radar": ([str(c) for c in cats.index], [float(v) for v in cats.values]),
+            })
+        jobs.append({"project": project, "version": group["version"].iloc[0], "sections": sections})
+    return jobs
+
+def _grid(rows):
+    from riskradar import charts
+    return charts.count_grid(rows[["possibility", "impact"]].to_dict("records"))
+
+def chart_specs(job) -> list:
+    specs = []
+    for s in job["sections"]:
+        specs.append(("heatmap", s["grid"], f"Risk Matrix — {s['tab']}"))
+        if s["radar"][0]:
+            specs.append(("radar", tuple(s["radar"][0]), tuple(s["radar"][1]), f"Category Radar — {s['tab']}"))
+    return specs
+
+def _key(obj) -> str:
+    return hashlib.sha1(json.dumps(obj, sort_keys=True, default=list).encode("utf-8")).hexdigest()
+
+# ---------- Rendering (workers) ----------
+def _render_chart(args):
+    spec, path = args
+    from riskradar import charts
+    if spec[0] == "heatmap":
+        png = charts.heatmap_png(tuple(map(tuple, spec[1])), spec[2])
+    else:
+        png = charts.radar_png(spec[1], spec[2], spec[3])
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(png)
+    os.replace(tmp, path)
+
+def _pngs(job, fig_dir):
+    out = {}
+    for spec in chart_specs(job):
+        with open(os.path.join(fig_dir, _key(spec) + ".png"), "rb") as fh:
+            out[(spec[0], spec[-1])] = fh.read()
+    return out
+
+def _html(job, pngs) -> bytes:
+    e = html.escape
+    img = lambda png: f'<img src="data:image/png;base64,{base64.b64encode(png).decode("ascii")}">'
+    parts = [f"<!doctype html><meta charset='utf-8'><title>{e(job['project'])} {e(job['version'])}</title>",
+             "<style>body{font-family:sans-serif;margin:2em}section{page-break-inside:avoid;margin-bottom:2em}"
+             ".High{color:#c62828}.Medium{color:#ef6c00}.Low{color:#2e7d32}img{max-width:45%;vertical-align:top}"
+             "table{border-collapse:collapse}td,th{border:1px solid #ccc;padding:4px 8px;text-align:left}</style>",
+             f"<h1>{e(job['project'])} — {e(job['version'])}</h1>"]
+    for s in job["sections"]:
+        parts.append(f"<section><h2>{e(s['tab'])} <span class='{s['rating']}'>{s['rating']}</span></h2>"
+                     f"<p>Assessed {e(s['date'])} · {s['risks']} risks · total score {s['total']:g} · "
+                     f"weighted {s['weighted']:g} · high-risk items (≥{rules.HIGH_CELL}) {s['high']}</p>")
+        if s["red_flags"]:
+            parts.append("<h3>Top red flags</h3><table><tr><th>Risk</th><th>Category</th><th>Score</th>"
+                         "<th>Mitigation</th></tr>" + "".join(
+                             f"<tr><td>{e(n)}</td><td>{e(c)}</td><td>{sc:g}</td><td>{e(m)}</td></tr>"
+                             for n, c, sc, m in s["red_flags"]) + "</table>")
+        else:
+            parts.append("<p>No red flags.</p>")
+        parts.append(img(pngs[("heatmap", f"Risk Matrix — {s['tab']}")]))
+        radar = pngs.get(("radar", f"Category Radar — {s['tab']}"))
+        if radar:
+            parts.append(img(radar))
+        parts.append("</section>")
+    return "\n".join(parts).encode("utf-8")
+
+def _pdf(job, pngs, path):
+    from matplotlib.backends.backend_pdf import PdfPages
+    from matplotlib.figure import Figure
+    from matplotlib.image import imread
+    with PdfPages(path) as pdf:
+        for s in job["sections"]:
+            fig = Figure(figsize=(8.27, 11.69))  # A4 portrait
+            lines = [f"{job['project']} — {job['version']} · {s['tab']}",
+                     f"Rating: {s['rating']}   (assessed {s['date']})",
+                     f"{s['risks']} risks · total {s['total']:g} · weighted {s['weighted']:g} · "
+                     f"high-risk items {s['high']}", "", "Top red flags:"]
+            lines += [f"  {sc:g}  {n} ({c}) → {m}" for n, c, sc, m in s["red_flags"]] or ["  none"]
+            fig.text(0.06, 0.96, "\n".join(lines), va="top", family="sans-serif", fontsize=9, wrap=True)
+            charts = [pngs[("heatmap", f"Risk Matrix — {s['tab']}")]]
+            if ("radar", f"Category Radar — {s['tab']}") in pngs:
+                charts.append(pngs[("radar", f"Category Radar — {s['tab']}")])
+            for n, png in enumerate(charts):
+                ax = fig.add_axes((0.04 + 0.48 * n, 0.2, 0.44, 0.44))
+                ax.imshow(imread(io.BytesIO(png), format="png"))
+                ax.set_axis_off()
+            pdf.savefig(fig)
+            fig.clear()
+
+def _write_report(args):
+    job, path, fmt, fig_dir = args
+    pngs = _pngs(job, fig_dir)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    if fmt == "pdf":
+        _pdf(job, pngs, tmp)
+    else:
+        with open(tmp, "wb") as fh:
+            fh.write(_html(job, pngs))
+    os.replace(tmp, path)
+    return path
+
+# ---------- Driver ----------
+def report_name(job, fmt) -> str:
+    return f"{sanitize_filename(job['project'])}_{sanitize_filename(job['version'])}.{fmt}"
+
+def generate(dest=None, fmt="html", version=None, projects=None, tabs=None, workers=None,
+             out_dir=None, force=False, frame=None) -> dict:
+    """Write one report per project into `dest` (default results/reports/); returns run stats."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unsupported report format {fmt!r} (use one of {', '.join(FORMATS)})")
+    t0 = time.perf_counter()
+    out_dir = out_dir or ensure_results_dir()
+    dest = dest or os.path.join(out_dir, "reports")
+    cache = os.path.join(out_dir, CACHE_DIRNAME)
+    fig_dir = os.path.join(cache, "figures")
+    os.makedirs(fig_dir, exist_ok=True)
+    os.makedirs(dest, exist_ok=True)
+    if frame is None:
+        from riskradar import portfolio
+        frame = portfolio.load_portfolio(out_dir)
+    jobs = build_jobs(frame, version, projects, tabs) if len(frame) else []
+    t_plan = time.perf_counter() - t0
+
+    manifest_path = os.path.join(cache, "manifest.json")
+    try:
+        with open(manifest_path, encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        manifest = {}
+    todo = []
+    for job in jobs:
+        path = os.path.join(dest, report_name(job, fmt))
+        digest = _key([LAYOUT, fmt, job])
+        if force or manifest.get(path) != digest or not os.path.exists(path):
+            todo.append((job, path, digest))
+
+    specs = {_key(s): s for job, _, _ in todo for s in chart_specs(job)}
+    missing = [(s, os.path.join(fig_dir, k + ".png")) for k, s in specs.items()
+               if force or not os.path.exists(os.path.join(fig_dir, k + ".png"))]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(todo) or 1))
+    t1 = time.perf_counter()
+    if workers == 1:
+        for m in missing:
+            _render_chart(m)
+        for job, path, _ in todo:
+            _write_report((job, path, fmt, fig_dir))
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            list(pool.map(_render_chart, missing, chunksize=max(1, len(missing) // (workers * 4))))
+            list(pool.map(_write_report, [(job, path, fmt, fig_dir) for job, path, _ in todo],
+                          chunksize=max(1, len(todo) // (workers * 4))))
+    t_render = time.perf_counter() - t1
+
+    manifest.update({path: digest for _, path, digest in todo})
+    tmp = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh)
+    os.replace(tmp, manifest_path)
+    secs = time.perf_counter() - t0
+    return {"reports": len(jobs), "written": len(todo), "unchanged": len(jobs) - len(todo),
+            "charts": len(specs), "charts_rendered": len(missing), "workers": workers, "dest": dest,
+            "plan_seconds": t_plan, "render_seconds": t_render, "seconds": secs,
+            "per_second_per_core": len(todo) / t_render / min(workers, os.cpu_count() or 1) if todo and t_render else 0.0}
+
+# ---------- CLI ----------
+def add_arguments(ap):
+    ap.add_argument("--version", help="release train version (default: each project's newest)")
+    ap.add_argument("--project", action="append", help="only this project; repeatable")
+    ap.add_argument("--tab", action="append", help="only this tab; repeatable")
+    ap.add_argument("--format", choices=FORMATS, default="html")
+    ap.add_argument("-o", "--output", help="report folder (default: results/reports/)")
+    ap.add_argument("-j", "--workers", type=int, help="worker processes (default: one per core)")
+    ap.add_argument("--force", action="store_true", help="rebuild reports and charts even if unchanged")
+    ap.add_argument("--results-dir", help="saved assessments (default: results/ or $RISKRADAR_RESULTS_DIR)")
+
+def main(args):
+    r = generate(args.output, args.format, args.version, args.project, args.tab, args.workers,
+                 args.results_dir, args.force)
+    print(f"{r['written']} reports written, {r['unchanged']} unchanged → {r['dest']}\n"
+          f"{r['charts']} distinct charts ({r['charts_rendered']} rendered, rest reused); "
+          f"plan {r['plan_seconds']:.2f} s, render {r['render_seconds']:.2f} s on {r['workers']} workers "
+          f"= {r['per_second_per_core']:.1f} reports/s/core", file=sys.stderr)
+    return 0
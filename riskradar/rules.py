@@ -0,0 +1,79 @@
+# riskradar/rules.py — scoring rules shared by the Streamlit UI and the batch engine
+#
+# Pure Python on purpose: assess_tab calls these per widget, riskradar.engine
+# applies the same constants to whole arrays. Change a threshold here and both
+# paths move together.
+
+# Column schema of a saved assessment (one row per identified risk)
+RESULT_COLUMNS = ["project_name","version","assessment_date","tab","category","risk_name","possibility","impact",
+                  "score","weighted_score","mitigation","evidence","defects_summary","assessor"]
+
+# Categories that always get a weight slider, on top of the catalog's own
+EXTRA_CATEGORIES = ("Release", "Quality Metrics", "Process")
+
+HIGH_CELL = 7        # any single P×I at or above this → High
+MEDIUM_TOTAL = 12    # otherwise, total P×I at or above this → Medium
+RED_FLAG_SCORE = 6   # checklist items at or above this are red flags
+
+WEIGHT_MIN, WEIGHT_MAX, WEIGHT_STEP = 0.5, 2.0, 0.1   # category weight sliders
+
+RELEASE_STATUSES = ["Unknown","Draft","In progress","Ready","Blocked"]
+RELEASE_GATE = {"Unknown": (2, 3), "Blocked": (3, 3)}   # status -> (P, I) of the gate risk
+RELEASE_RISK = ("Release", "Release tracker unclear/blocked",
+                "Clarify release scope/gates; unblock owners", "Clarify release gates; unblock")
+
+SEVERITIES = ("Blocker", "Critical", "Major", "Minor")
+SEVERITY_WEIGHTS = (6, 4, 2, 1)
+DEFECT_LOAD_SCORE = 12
+DEFECT_SEVERE = (3, 3)     # (P, I) when any Blocker or more than two Criticals
+DEFECT_DEFAULT = (2, 3)
+DEFECT_RISK = ("Quality Metrics", "High defect load",
+               "Focus blocker/critical burndown; triage", "Blocker/critical burndown")
+
+EVIDENCE_IMPACT = 2         # a dead evidence link weakens the assessment, it doesn't block the release
+EVIDENCE_RISK = ("Process", "Unverifiable evidence",
+                 "Fix or replace dead evidence/artifact links", "Replace dead evidence links")
+
+def is_risk(answer_yes: bool, risk_when_true: bool) -> bool:
+    # A question either describes the risk ("Is FTP still used?") or its control ("Are checks enabled?")
+    return answer_yes == risk_when_true
+
+def item_score(risky: bool, P: int, I: int):
+    """(possibility, impact, score) of a checklist item; non-risks count as 1×1."""
+    poss = int(P) if risky else 1
+    impact = int(I) if risky else 1
+    return poss, impact, poss * impact
+
+def weighted(score, weight) -> float:
+    return round(score * weight, 1)
+
+def release_gate(status):
+    """(P, I) of the release-tracker risk, or None when the gate status is fine."""
+    return RELEASE_GATE.get(status)
+
+def defect_score(blocker, critical, major, minor) -> int:
+    return sum(n * w for n, w in zip((blocker, critical, major, minor), SEVERITY_WEIGHTS))
+
+def defect_load(blocker, critical, major, minor):
+    """(P, I) of the "High defect load" risk, or None below the threshold."""
+    if defect_score(blocker, critical, major, minor) < DEFECT_LOAD_SCORE:
+        return None
+    return DEFECT_SEVERE if blocker > 0 or critical > 2 else DEFECT_DEFAULT
+
+def evidence_gate(unverifiable: int, checked: int):
+    """(P, I) of the "Unverifiable evidence" risk, or None when every checked link resolves."""
+    if not unverifiable:
+        return None
+    P = 3 if unverifiable * 2 >= checked and unverifiable > 1 else 2 if unverifiable > 1 else 1
+    return P, EVIDENCE_IMPACT
+
+def defects_summary(blocker, critical, major, minor) -> str:
+    return f"Blocker={blocker}, Critical={critical}, Major={major}, Minor={minor}"
+
+def score_to_rating(total_score: int, max_cell: int) -> str:
+    if max_cell >= HIGH_CELL:
+        return "High"
+    elif total_score >= MEDIUM_TOTAL:
+        return "Medium"
+    else:
+        return "Low"
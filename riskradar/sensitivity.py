@@ -0,0 +1,110 @@
+# riskradar/sensitivity.py — what-if sweep over category weights and P/I overrides
+#
+# Takes one assessment as assess_tab sees it (the checklist's risky items, the
+# panel-derived risks and the current slider weights) and evaluates it under
+# many weight / P×I combinations at once, with the rules of riskradar.rules:
+#
+# * the rating (rules.score_to_rating) only depends on the P×I scores — the
+#   weights never flip it, they only scale weighted_score;
+# * flip thresholds are exact: for each item, the lowest score that would make
+#   the rating worse and the highest that would make it better, others fixed;
+# * a Monte Carlo pass draws `scenarios` combinations — every weight from the
+#   slider grid, each checklist item's P and I re-picked with `override_rate` —
+#   and attributes rating flips to items and weighted-score spread to categories.
+import numpy as np
+import pandas as pd
+
+from riskradar import rules
+
+RATINGS = ("High", "Medium", "Low")
+CELL_SCORES = np.array(sorted({p * i for p in (1, 2, 3) for i in (1, 2, 3)}))  # 1 2 3 4 6 9
+
+def weight_grid():
+    return np.round(np.arange(rules.WEIGHT_MIN, rules.WEIGHT_MAX + rules.WEIGHT_STEP / 2, rules.WEIGHT_STEP), 1)
+
+def rating_codes(total, max_cell):
+    """Vectorized rules.score_to_rating as indexes into RATINGS."""
+    return np.where(max_cell >= rules.HIGH_CELL, 0, np.where(total >= rules.MEDIUM_TOTAL, 1, 2))
+
+def analyze(items, fixed, weights, scenarios=10_000, override_rate=0.3, seed=0) -> dict:
+    """Sensitivity of one assessment.
+
+    items    [(category, risk_name, P, I), ...] checklist risks whose P/I can be overridden
+    fixed    [(category, risk_name, P, I), ...] panel risks (release gate, defect load)
+    weights  {category: slider weight}
+    """
+    rows = list(items) + list(fixed)
+    K, F = len(items), len(fixed)
+    cats = sorted({r[0] for r in rows} | set(weights))
+    cidx = np.array([cats.index(r[0]) for r in rows], dtype=np.int64)
+    P = np.array([r[2] for r in rows], dtype=np.int64)
+    I = np.array([r[3] for r in rows], dtype=np.int64)
+    w_now = np.array([float(weights.get(c, 1.0)) for c in cats])
+    score = P * I
+
+    total, max_cell = int(score.sum()), int(score.max(initial=0))
+    base = rules.score_to_rating(total, max_cell)
+    base_code = RATINGS.index(base)
+    weighted_now = float(np.round(score * w_now[cidx], 1).sum())
+
+    # ---- Exact one-at-a-time flip thresholds (rating) ----
+    order = np.sort(score)[::-1]
+    top1 = order[0] if len(order) else 0
+    top2 = order[1] if len(order) > 1 else 0
+    max_others = np.where((score == top1) & ((order == top1).sum() == 1), top2, top1)[:K]
+    alt_total = total - score[:K, None] + CELL_SCORES[None, :]                    # (K, 6)
+    alt_rating = rating_codes(alt_total, np.maximum(max_others[:, None], CELL_SCORES[None, :]))
+    worse = alt_rating < base_code   # lower code = more severe
+    better = alt_rating > base_code
+    raise_to = np.where(worse.any(1), CELL_SCORES[np.argmax(worse, 1)], 0)
+    lower_to = np.where(better.any(1), CELL_SCORES[len(CELL_SCORES) - 1 - np.argmax(better[:, ::-1], 1)], 0)
+
+    # ---- Monte Carlo ----
+    rng = np.random.default_rng(seed)
+    S = int(scenarios)
+    grid = weight_grid()
+    W = grid[rng.integers(0, len(grid), (S, len(cats)))]
+    override = rng.random((S, K)) < override_rate
+    Ps = np.where(override, rng.integers(1, 4, (S, K)), P[:K])
+    Is = np.where(override, rng.integers(1, 4, (S, K)), I[:K])
+    scores = np.concatenate([Ps * Is, np.broadcast_to(score[K:], (S, F))], axis=1)
+    rating = rating_codes(scores.sum(1), scores.max(1, initial=0))
+    weighted = np.round(scores * W[:, cidx], 1).sum(1)
+    flipped = rating != base_code
+
+    n_ov = override.sum(0)
+    flip_ov = np.divide((override & flipped[:, None]).sum(0), n_ov, out=np.zeros(K), where=n_ov > 0)
+    n_keep = S - n_ov
+    flip_keep = np.divide((~override & flipped[:, None]).sum(0), n_keep, out=np.zeros(K), where=n_keep > 0)
+
+    # Weighted-score spread attributable to each category weight (correlation over the draws)
+    Wc = W - W.mean(0)
+    wc = weighted - weighted.mean()
+    denom = np.sqrt((Wc ** 2).sum(0) * (wc ** 2).sum())
+    corr = np.divide(Wc.T @ wc, denom, out=np.zeros(len(cats)), where=denom > 0)
+
+    cat_score = np.bincount(cidx, weights=score, minlength=len(cats))
+    categories = pd.DataFrame({
+        "category": cats, "risks": np.bincount(cidx, minlength=len(cats)), "score": cat_score,
+        "weight": w_now, "weighted_now": np.bincount(cidx, weights=np.round(score * w_now[cidx], 1), minlength=len(cats)),
+        "weighted_min": cat_score * rules.WEIGHT_MIN, "weighted_max": cat_score * rules.WEIGHT_MAX,
+        "correlation": corr,
+    }).sort_values(["score", "category"], ascending=[False, True], ignore_index=True)
+    categories = categories[categories["score"] > 0].reset_index(drop=True)
+
+    item_frame = pd.DataFrame({
+        "risk_name": [r[1] for r in items], "category": [r[0] for r in items],
+        "P": P[:K], "I": I[:K], "score": score[:K],
+        "worse_at_score": raise_to, "better_at_score": lower_to,
+        "flip_rate_overridden": flip_ov, "flip_rate_kept": flip_keep,
+        "influence": flip_ov - flip_keep,
+    }).sort_values(["influence", "score"], ascending=False, ignore_index=True)
+
+    return {
+        "rating": base, "total": total, "max_cell": max_cell, "weighted_score": weighted_now,
+        "medium_margin": total - rules.MEDIUM_TOTAL, "high_margin": max_cell - rules.HIGH_CELL,
+        "scenarios": S,
+        "rating_share": {r: float((rating == n).mean()) for n, r in enumerate(RATINGS)},
+        "weighted_pcts": dict(zip(("p5", "p50", "p95"), map(float, np.percentile(weighted, [5, 50, 95])))) if S else {},
+        "items": item_frame, "categories": categories,
+    }
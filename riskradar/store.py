@@ -0,0 +1,152 @@
+# riskradar/store.py — durable assessment store behind results/*.csv
+#
+# Every save is content-hashed. Unchanged assessments are a no-op (no disk I/O
+# at all when this process already wrote the same bytes), changed ones are
+# written atomically (temp file + os.replace) and appended as a new revision to
+# an SQLite log in WAL mode. `BEGIN IMMEDIATE` serializes concurrent writers
+# across threads *and* server processes, so two sessions saving the same
+# project/version/date/tab can no longer interleave half-written files.
+import datetime, hashlib, os, re, sqlite3, tempfile, threading, time
+
+from riskradar import defects, drafts, trends
+
+DB_NAME = "assessments.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS revisions (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    project         TEXT NOT NULL,
+    version         TEXT NOT NULL,
+    assessment_date TEXT NOT NULL,
+    tab             TEXT NOT NULL,
+    path            TEXT NOT NULL,
+    content_hash    TEXT NOT NULL,
+    saved_at        REAL NOT NULL,
+    payload         BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS revisions_by_key
+    ON revisions (project, version, assessment_date, tab, id);
+CREATE INDEX IF NOT EXISTS revisions_by_path
+    ON revisions (path, id);
+"""
+
+_local = threading.local()
+_lock = threading.Lock()
+_last_hash = {}  # path -> digest of the bytes this process last wrote there
+_last_point = {}  # path -> trend point this process last recorded for it
+_stats = {"saves": 0, "writes": 0, "skipped": 0}
+
+# ---------- Paths ----------
+def sanitize_filename(name: str) -> str:
+    name = name.strip().replace(" ", "_")
+    return re.sub(r"[^A-Za-z0-9._-]", "", name)
+
+def results_dir() -> str:
+    # Resolved per call so tooling/benchmarks can point RISKRADAR_RESULTS_DIR elsewhere
+    return os.environ.get("RISKRADAR_RESULTS_DIR") or os.path.join(
+        os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "results")
+
+def ensure_results_dir() -> str:
+    out_dir = results_dir()
+    os.makedirs(out_dir, exist_ok=True)
+    return out_dir
+
+def results_filename(project, version, tab, date_str) -> str:
+    return f"{sanitize_filename(project)}_{sanitize_filename(version)}_{date_str}_{sanitize_filename(tab)}.csv"
+
+# ---------- SQLite ----------
+def connect(out_dir=None) -> sqlite3.Connection:
+    """Per-thread connection to the revision log living next to the CSVs."""
+    db_path = os.path.join(out_dir or ensure_results_dir(), DB_NAME)
+    conns = getattr(_local, "conns", None)
+    if conns is None:
+        conns = _local.conns = {}
+    conn = conns.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        conn.executescript(trends.SCHEMA)
+        conn.executescript(defects.SCHEMA)
+        conn.executescript(drafts.SCHEMA)
+        conns[db_path] = conn
+    return conn
+
+def _atomic_write(path, payload: bytes):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp_", suffix=".csv")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(payload)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+def _count(name):
+    with _lock:
+        _stats[name] += 1
+
+# ---------- Public API ----------
+def save_results_csv(project, version, tab, df, date_str=None, defects=None):
+    """Persist one tab's assessment; returns the CSV path.
+
+    Only writes when the CSV content differs from the latest stored revision.
+    `defects` = (blocker, critical, major, minor) feeds the trend aggregates
+    (riskradar/trends.py) even while the defect load is too low to be a risk row.
+    """
+    out_dir = ensure_results_dir()
+    date_str = date_str or datetime.date.today().strftime("%Y-%m-%d")
+    path = os.path.join(out_dir, results_filename(project, version, tab, date_str))
+    payload = df.to_csv(index=False).encode("utf-8")
+    digest = hashlib.sha256(payload).hexdigest()
+    point = trends.point(df, defects)
+    _count("saves")
+
+    with _lock:
+        if _last_hash.get(path) == digest and _last_point.get(path) == point and os.path.exists(path):
+            _stats["skipped"] += 1
+            return path
+
+    conn = connect(out_dir)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        # Keyed by file, not by the raw names: "DP" and "DP " sanitize to the same CSV
+        latest = conn.execute(
+            "SELECT content_hash FROM revisions WHERE path=? ORDER BY id DESC LIMIT 1",
+            (os.path.basename(path),)).fetchone()
+        changed = latest is None or latest[0] != digest or not os.path.exists(path)
+        if changed:
+            _atomic_write(path, payload)
+            conn.execute(
+                "INSERT INTO revisions (project, version, assessment_date, tab, path, content_hash, saved_at, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (project, version, date_str, tab, os.path.basename(path), digest, time.time(), payload))
+        trends.record(conn, project, tab, version, date_str, point)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+    with _lock:
+        _last_hash[path] = digest
+        _last_point[path] = point
+        _stats["writes" if changed else "skipped"] += 1
+    return path
+
+def history(project, version, tab, date_str=None, out_dir=None):
+    """Revision log of one assessment's CSV: [(id, saved_at, content_hash), ...] oldest first."""
+    date_str = date_str or datetime.date.today().strftime("%Y-%m-%d")
+    return connect(out_dir).execute(
+        "SELECT id, saved_at, content_hash FROM revisions WHERE path=? ORDER BY id",
+        (results_filename(project, version, tab, date_str),)).fetchall()
+
+def stats() -> dict:
+    """Process-wide counters: save calls, actual file writes, skipped (unchanged) saves."""
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,183 @@
+# riskradar/trends.py — per-project weekly trend aggregates, maintained on save
+#
+# Each saved assessment (project, tab, version, date) has one row in
+# trend_points with its totals: score, weighted score, high-risk count, rating
+# and the defect counters. trend_weekly holds running sums per ISO week, for
+# every project and for the whole portfolio (scope "*").
+#
+# record() runs inside store.save_results_csv's transaction. It reads the
+# assessment's previous point, writes the new one, and applies the difference
+# to two weekly buckets: a constant number of indexed statements, however long
+# the history is. Reading a trend is one range scan over a scope's weeks.
+import csv, datetime, io, re, sys, time
+
+from riskradar import rules
+
+PORTFOLIO = "*"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trend_points (
+    project         TEXT NOT NULL,
+    tab             TEXT NOT NULL,
+    version         TEXT NOT NULL,
+    assessment_date TEXT NOT NULL,
+    total_score     REAL NOT NULL,
+    weighted_score  REAL NOT NULL,
+    high_count      INTEGER NOT NULL,
+    max_cell        REAL NOT NULL,
+    rating          TEXT NOT NULL,
+    blocker         INTEGER NOT NULL,
+    critical        INTEGER NOT NULL,
+    major           INTEGER NOT NULL,
+    minor           INTEGER NOT NULL,
+    saved_at        REAL NOT NULL,
+    PRIMARY KEY (project, tab, version, assessment_date)
+);
+CREATE TABLE IF NOT EXISTS trend_weekly (
+    scope           TEXT NOT NULL,
+    week            TEXT NOT NULL,
+    assessments     INTEGER NOT NULL,
+    total_score     REAL NOT NULL,
+    weighted_score  REAL NOT NULL,
+    high_count      INTEGER NOT NULL,
+    high            INTEGER NOT NULL,
+    medium          INTEGER NOT NULL,
+    low             INTEGER NOT NULL,
+    blocker         INTEGER NOT NULL,
+    critical        INTEGER NOT NULL,
+    major           INTEGER NOT NULL,
+    minor           INTEGER NOT NULL,
+    PRIMARY KEY (scope, week)
+);
+"""
+
+# Point: (total_score, weighted_score, high_count, max_cell, rating, blocker, critical, major, minor)
+POINT_FIELDS = ("total_score", "weighted_score", "high_count", "max_cell", "rating",
+                "blocker", "critical", "major", "minor")
+WEEK_SUMS = ("assessments", "total_score", "weighted_score", "high_count", "high", "medium", "low",
+             "blocker", "critical", "major", "minor")
+
+_DEFECTS_RE = re.compile(r"Blocker=(\d+), Critical=(\d+), Major=(\d+), Minor=(\d+)")
+
+# ---------- Points ----------
+def _num(v) -> float:
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return 0.0
+
+def point(df, defects=None) -> tuple:
+    """Trend point of one assessment's rows; `defects` = (blocker, critical, major, minor).
+
+    Without `defects` the counters come from the rows' defects_summary, which is
+    only present once the defect load is high enough to be a risk.
+    """
+    scores = [_num(s) for s in df["score"]]
+    weighted = [_num(w) for w in df["weighted_score"]] if "weighted_score" in df else scores
+    total, max_cell = sum(scores), max(scores, default=0)
+    if defects is None:
+        defects = (0, 0, 0, 0)
+        for s in (df["defects_summary"] if "defects_summary" in df else ()):
+            m = _DEFECTS_RE.search(str(s))
+            if m:
+                defects = tuple(int(v) for v in m.groups())
+    return (total, sum(weighted), sum(1 for s in scores if s >= rules.HIGH_CELL), max_cell,
+            rules.score_to_rating(total, max_cell), *(int(d) for d in defects))
+
+def week_of(date_str: str) -> str:
+    """Monday of the ISO week holding `date_str` (YYYY-MM-DD)."""
+    d = datetime.date.fromisoformat(date_str)
+    return (d - datetime.timedelta(days=d.weekday())).isoformat()
+
+def _week_sums(p, sign):
+    total, weighted, high_count, _, rating, b, c, mj, mn = p
+    return [sign * v for v in (1, total, weighted, high_count, rating == "High", rating == "Medium",
+                               rating == "Low", b, c, mj, mn)]
+
+_UPSERT_WEEK = (
+    f"INSERT INTO trend_weekly (scope, week, {', '.join(WEEK_SUMS)}) VALUES (?, ?{', ?' * len(WEEK_SUMS)}) "
+    f"ON CONFLICT (scope, week) DO UPDATE SET " + ", ".join(f"{c} = {c} + excluded.{c}" for c in WEEK_SUMS))
+
+def record(conn, project, tab, version, date_str, p) -> bool:
+    """Store point `p` for one assessment and fold the change into its weekly buckets.
+
+    Call inside the caller's transaction. Returns False when the point is unchanged.
+    """
+    key = (project, tab, version, date_str)
+    old = conn.execute(f"SELECT {', '.join(POINT_FIELDS)} FROM trend_points "
+                       "WHERE project=? AND tab=? AND version=? AND assessment_date=?", key).fetchone()
+    if old is not None and tuple(old) == tuple(p):
+        return False
+    conn.execute(f"INSERT OR REPLACE INTO trend_points (project, tab, version, assessment_date, "
+                 f"{', '.join(POINT_FIELDS)}, saved_at) VALUES (?, ?, ?, ?{', ?' * len(POINT_FIELDS)}, ?)",
+                 (*key, *p, time.time()))
+    delta = _week_sums(p, 1)
+    if old is not None:
+        delta = [a + b for a, b in zip(delta, _week_sums(tuple(old), -1))]
+    week = week_of(date_str)
+    for scope in (project, PORTFOLIO):
+        conn.execute(_UPSERT_WEEK, (scope, week, *delta))
+    return True
+
+# ---------- Reading ----------
+def series(scope=PORTFOLIO, since=None, out_dir=None) -> list:
+    """Weekly rows of one project (or the portfolio), oldest first, as dicts."""
+    from riskradar.store import connect
+    sql = f"SELECT week, {', '.join(WEEK_SUMS)} FROM trend_weekly WHERE scope=? AND assessments > 0"
+    args = [scope]
+    if since:
+        sql += " AND week >= ?"
+        args.append(week_of(since))
+    rows = connect(out_dir).execute(sql + " ORDER BY week", args).fetchall()
+    return [dict(zip(("week", *WEEK_SUMS), r)) for r in rows]
+
+def sparklines(since=None, out_dir=None) -> dict:
+    """project -> [mean weighted score per assessment, one value per week] for every project."""
+    from riskradar.store import connect
+    sql = "SELECT scope, weighted_score / assessments FROM trend_weekly WHERE scope != ? AND assessments > 0"
+    args = [PORTFOLIO]
+    if since:
+        sql += " AND week >= ?"
+        args.append(week_of(since))
+    out = {}
+    for scope, value in connect(out_dir).execute(sql + " ORDER BY scope, week", args):
+        out.setdefault(scope, []).append(value)
+    return out
+
+# ---------- Backfill ----------
+def rebuild(out_dir=None) -> int:
+    """Recompute both tables from the newest stored revision of every assessment."""
+    from riskradar.store import connect
+    conn = connect(out_dir)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.execute("DELETE FROM trend_points")
+        conn.execute("DELETE FROM trend_weekly")
+        latest = conn.execute(
+            "SELECT project, tab, version, assessment_date, payload FROM revisions WHERE id IN "
+            "(SELECT MAX(id) FROM revisions GROUP BY project, version, assessment_date, tab)").fetchall()
+        for project, tab, version, date_str, payload in latest:
+            rows = list(csv.DictReader(io.StringIO(payload.decode("utf-8"))))
+            cols = {k: [r[k] for r in rows] for k in (rows[0] if rows else ())}
+            record(conn, project, tab, version, date_str, point(cols) if rows else point({"score": []}))
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return len(latest)
+
+# ---------- CLI ----------
+def add_arguments(ap):
+    ap.add_argument("--project", default=PORTFOLIO, help="project to print (default: whole portfolio)")
+    ap.add_argument("--since", help="first week to print (YYYY-MM-DD)")
+    ap.add_argument("--rebuild", action="store_true", help="recompute aggregates from the revision log first")
+    ap.add_argument("--results-dir", help="saved assessments (default: results/ or $RISKRADAR_RESULTS_DIR)")
+
+def main(args):
+    if args.rebuild:
+        print(f"rebuilt trends from {rebuild(args.results_dir)} assessments", file=sys.stderr)
+    writer = csv.writer(sys.stdout)
+    writer.writerow(("week", *WEEK_SUMS))
+    for row in series(args.project, args.since, args.results_dir):
+        writer.writerow(row.values())
+    return 0
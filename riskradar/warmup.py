@@ -0,0 +1,68 @@
+# riskradar/warmup.py — get the heavy imports out of the first paint
+#
+# The Streamlit entry points only import streamlit and the pure-Python riskradar
+# modules at top level; pandas, numpy and matplotlib are imported where they
+# are first used. start() loads them on a daemon thread as soon as the script
+# first runs, so by the time an assessor reaches the summary/heatmap they are
+# usually already in sys.modules (a foreground import of a module the thread is
+# still loading simply waits on Python's per-module import lock).
+#
+# `python -m riskradar warmup` does the same synchronously. Run it while
+# building the container image so matplotlib's font cache (fontlist-*.json in
+# MPLCONFIGDIR) is already on disk when a fresh server process starts.
+import logging, threading, time
+
+log = logging.getLogger(__name__)
+_thread = None
+_lock = threading.Lock()
+timings = {}  # step -> seconds, filled in by warm()
+
+def warm() -> dict:
+    """Import the plotting/DataFrame stack and rasterize one chart (builds the font cache)."""
+    steps = [
+        ("pandas", lambda: __import__("pandas")),
+        ("matplotlib", lambda: __import__("riskradar.charts")),
+        ("portfolio", lambda: __import__("riskradar.portfolio")),
+        ("first_chart", _first_chart),
+    ]
+    for name, step in steps:
+        t0 = time.perf_counter()
+        step()
+        timings[name] = time.perf_counter() - t0
+    return timings
+
+def _first_chart():
+    from riskradar import charts
+    charts.heatmap_png(((0, 0, 0), (0, 0, 0), (0, 0, 0)))
+
+def _run():
+    try:
+        warm()
+    except Exception:  # warm-up is best effort; the foreground import will raise properly
+        log.exception("warm-up failed")
+
+def start():
+    """Warm up on a background thread, once per process."""
+    global _thread
+    with _lock:
+        if _thread is not None:
+            return
+        _thread = threading.Thread(target=_run, name="riskradar-warmup", daemon=True)
+    _thread.start()
+
+def wait(timeout=None):
+    # Short-lived processes (tests, benchmarks) should join before exiting: a daemon
+    # thread killed halfway through a C-extension import can abort the interpreter.
+    if _thread is not None:
+        _thread.join(timeout)
+
+# ---------- CLI ----------
+def add_arguments(ap):
+    pass
+
+def main(args):
+    import matplotlib
+    for name, seconds in warm().items():
+        print(f"{name:<12} {seconds * 1e3:8.1f} ms")
+    print(f"font cache in {matplotlib.get_cachedir()}")
+    return 0
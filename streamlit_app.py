@@ -1,237 +1,314 @@
-
 # streamlit_app.py — RiskRadar360 (full + fixes: formatted defects summary, smaller heatmap)
-import os, re, datetime
+import os, datetime, functools
 import streamlit as st
-import pandas as pd
-import matplotlib
-matplotlib.use("agg")
-import matplotlib.pyplot as plt
+from riskradar import metrics, rules, warmup
+from riskradar.catalog import TABS, key_for, load_catalog
+from riskradar.rules import RESULT_COLUMNS, score_to_rating
+from riskradar.store import save_results_csv
 
 st.set_page_config(page_title="RiskRadar360", layout="wide")
+# pandas/matplotlib are imported where first used; this loads them off the first paint
+warmup.start()
 
 # ---------- Helpers ----------
-def sanitize_filename(name: str) -> str:
-    name = name.strip().replace(" ", "_")
-    return re.sub(r"[^A-Za-z0-9._-]", "", name)
-
-def key_for(tab: str, name: str) -> str:
-    safe = re.sub(r"[^A-Za-z0-9_]+", "_", name)
-    return f"{tab}_{safe}"
-
-def ensure_results_dir():
-    out_dir = os.path.join(os.path.dirname(__file__), "results")
-    os.makedirs(out_dir, exist_ok=True)
-    return out_dir
-
-def save_results_csv(project, version, tab, df):
-    out_dir = ensure_results_dir()
-    date_str = datetime.date.today().strftime("%Y-%m-%d")
-    fname = f"{sanitize_filename(project)}_{sanitize_filename(version)}_{date_str}_{sanitize_filename(tab)}.csv"
-    path = os.path.join(out_dir, fname)
-    df.to_csv(path, index=False, encoding="utf-8")
-    return path
-
-def score_to_rating(total_score: int, max_cell: int) -> str:
-    if max_cell >= 7:
-        return "High"
-    elif total_score >= 12:
-        return "Medium"
-    else:
-        return "Low"
+def timed(phase: str, tab_name: str):
+    # Opt-in phase timing (riskradar/metrics.py); a shared no-op unless RISKRADAR_METRICS_* is set
+    if not metrics.enabled():
+        return metrics.NOOP
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+    ctx = get_script_run_ctx()
+    return metrics.span(phase, tab_name, ctx.session_id if ctx else "")
 
 def plot_heatmap(rows, title="Risk Matrix (Possibility × Impact)"):
-    # Build 3x3 grid of counts
-    grid = [[0,0,0],[0,0,0],[0,0,0]]
-    for r in rows:
-        try:
-            P = int(r["possibility"]) - 1
-            I = int(r["impact"]) - 1
-        except Exception:
-            continue
-        if 0 <= P < 3 and 0 <= I < 3:
-            grid[P][I] += 1
-
-    # Smaller figure so it doesn't dominate the page
-    fig, ax = plt.subplots(figsize=(4.5, 4.5), dpi=120)
-    im = ax.imshow(grid, cmap="viridis")
-
-    # Annotate cells
-    for i in range(3):
-        for j in range(3):
-            val = grid[i][j]
-            ax.text(j, i, str(val), ha="center", va="center",
-                    color="white" if val > 0 else "black", fontsize=10)
-
-    ax.set_xticks([0,1,2]); ax.set_yticks([0,1,2])
-    ax.set_xticklabels(["Impact 1","Impact 2","Impact 3"], fontsize=9)
-    ax.set_yticklabels(["Poss 1","Poss 2","Poss 3"], fontsize=9)
-    ax.set_title(title, fontsize=13, pad=8)
-    fig.tight_layout()
-    st.pyplot(fig, use_container_width=False)
+    # Rendered once per distinct 3x3 grid and shared across sessions (riskradar/charts.py)
+    from riskradar import charts
+    st.image(charts.heatmap_png(charts.count_grid(rows), title), use_column_width="never")
 
 SCALE_HELP_P = "1 = Low (unlikely), 2 = Medium (could happen), 3 = High (very likely)"
 SCALE_HELP_I = "1 = Low (minor), 2 = Medium (some rework/delay), 3 = High (major disruption)"
+DEFECTS_MAX = 99_999
+DOWNLOAD_MAX_MB = 50  # bigger exports are only written to results/exports/
+LINK_POLL_S = 2  # while link checks or the defect ingest are pending, the panel reruns this often
+LINK_FIELDS = ("rel_url", "link_repo", "link_ci", "link_spec")
+PAGE_SIZE = 25  # checklist questions rendered per run (see checklist_page)
+TRIGGERS = ("_dl", "_go")  # button keys; session_state can't set them
 
-# ---------- Risk Definitions ----------
-# tuple: (category, risk_name, question, risk_when_true, P, I, mitigation, group)
-L10N_RISKS = [
-    ("File Handling", "FTP used instead of Git", "Are handoffs still using FTP instead of Git?", True, 3, 3, "Switch handoffs to Git; deprecate FTP", "Handoffs"),
-    ("Tooling", "Mixed HTTPS/SSH setup", "Is there a mixed HTTPS/SSH Git setup that may cause token/login failures?", True, 3, 2, "Standardize to HTTPS; document PAT", "Repo Access"),
-    ("Tooling", "Wrong clone URLs", "Are correct clone URLs guaranteed (no Gerrit admin URLs)?", False, 2, 3, "Publish canonical clone URLs; CI guardrails", "Repo Access"),
-    ("Quality", "Automation disabled", "Are automated checks (SourceChecker/TransChecker) enabled?", False, 2, 3, "Enable and gate on checks", "Quality"),
-    ("Schedule", "Drops misaligned", "Are translation drops aligned with the sprint calendar?", False, 3, 3, "Publish drop calendar; align with PI", "Schedule"),
-    ("Resources", "Screenshot bandwidth", "Is screenshot validation bandwidth planned (with vendor support)?", False, 2, 2, "Plan capacity; early build share", "QA & Screens"),
-    ("Tooling", "Permissions missing", "Are all Git/Gerrit permissions granted pre-drop?", False, 2, 2, "Raise access early; track in KT docs", "Repo Access"),
-    ("File Handling", "Parser/encoding not standardized", "Are parser/encoding settings standardized (e.g., Passolo UTF-8)?", False, 2, 3, "Standardize and version configs", "Build/Parser"),
-    ("Tooling", "ezL10n mapping absent", "Is the Git repo mapped for ezL10n automation?", False, 2, 3, "Map repo to ezL10n; validate jobs", "Automation"),
-]
-
-LOCOPS_RISKS = [
-    ("Automation", "ezL10n repo mapping drift", "Is ezL10n mapping up-to-date for this repo & branch?", False, 3, 3, "Sync mappings; validate job paths", "ezL10n"),
-    ("Automation", "ezL10n job health", "Have the last 10 ezL10n jobs succeeded (no chronic failures)?", False, 2, 3, "Fix chronic failures; canary job; alerts", "ezL10n"),
-    ("Quality Gates", "SourceChecker coverage gaps", "Is SourceChecker enforced for all products in scope?", False, 2, 3, "Gate on SourceChecker; block failures", "SourceChecker"),
-    ("Quality Gates", "Source placeholder risk", "Do SourceChecker rules include placeholder/escape checks?", False, 2, 2, "Enable placeholder/escape validations", "SourceChecker"),
-    ("Quality Gates", "TransChecker not enforced", "Is TransChecker required for vendor handback?", False, 2, 3, "Run TransChecker pre-HB; reject failing packs", "TransChecker"),
-    ("Quality Gates", "TM/term consistency checks", "Are TM & terminology consistency checks part of handback?", False, 2, 2, "Integrate term rules; update glossaries", "TransChecker"),
-    ("DocOps", "DocOps staging failures", "Has the DocOps pipeline been green for staging in the last 2 weeks?", False, 2, 3, "Stabilize staging; retry policy; alerts", "DocOps"),
-    ("DocOps", "Prod publish risk", "Is production publish tested with rollback artifacts?", False, 2, 3, "Add rollback build; run preflight", "DocOps"),
-    ("SCA", "i18n SCA skipped", "Is the i18n static analysis part of CI for new features?", False, 2, 3, "Add SCA job; enforce pre-merge", "SCA"),
-    ("SCA", "Hardcoded strings risk", "Are hardcoded string detections triaged within SLA?", False, 2, 2, "Triage dashboard; fix SLA", "SCA"),
-    ("Screens", "SnapGen outdated", "Is the screenshot generator aligned to current builds & locales?", False, 2, 2, "Update SnapGen configs; smoke test", "SnapGen"),
-    ("Screens", "Vendor screenshot validation", "Is vendor LQA process integrated with SnapGen output?", False, 2, 2, "Provide annotated packs; define acceptance", "SnapGen"),
-    ("Infra", "License server SPOF", "Are Passolo/MT license servers redundant & monitored?", False, 2, 3, "Add HA; monitoring; vendor plan", "Licenses"),
-    ("Security", "Secrets/token rotation overdue", "Are CI tokens & vendor creds rotated per policy?", False, 2, 3, "Use secrets vault; rotate; audit", "Secrets"),
-    ("CI Runners", "Agent env drift", "Are build agents pinned (toolchain versions) & reproducible?", False, 2, 2, "Golden images; config mgmt; audits", "Runners"),
-]
-
-GENERAL_RISKS = [
-    ("Schedule", "Sprint misalignment", "Are milestones aligned with sprint/PI and dependencies tracked?", False, 3, 3, "Dependency board; early alignment", "Planning"),
-    ("Quality", "Missing reviews", "Are design/quality/accessibility reviews scheduled?", False, 2, 2, "Schedule formal reviews; checklist", "Quality"),
-    ("Knowledge", "Specs/KT gaps", "Are specs/KT complete and up-to-date?", False, 2, 3, "KT docs; owner assignment; versioning", "Docs"),
-    ("Tooling", "CI/CD & repo stability", "Are CI/CD and repo configs stable and documented?", False, 2, 3, "Harden CI; doc configs; change control", "Tooling"),
-    ("Resources", "Bandwidth & time zones", "Are bandwidth and time zones planned into the schedule?", False, 2, 2, "Follow-the-sun plan; handoff SOP", "Resourcing"),
-    ("Stakeholders", "Signoffs missing", "Are early stakeholder signoffs scheduled and tracked?", False, 2, 2, "RACI; signoff gates", "Stakeholders"),
-]
-
-TAB_DEF = {"L10n": L10N_RISKS, "LocOps": LOCOPS_RISKS, "General": GENERAL_RISKS}
 
-def assess_tab(tab_name: str):
-    top = st.container()
-    with top:
-        c1, c2, c3, c4 = st.columns([2,2,1,1])
-        project = c1.text_input("Project", key=key_for(tab_name, "Project"))
-        version = c2.text_input("Version", key=key_for(tab_name, "Version"))
-        assessor = c3.text_input("Assessor", key=key_for(tab_name, "Assessor"))
-        today = datetime.date.today().strftime("%Y-%m-%d")
-        c4.markdown(f"**Date**: {today}")
+# ---------- Assessment fragments ----------
+# Below a tab's header, the weights row, the checklist, the Intelligence Panel and
+# the summary are four st.fragments, so an edit reruns the part it was made in.
+# Each input part publishes what the summary reads to a slot in session_state,
+# and the summary renders from those slots. Streamlit 1.37 can't rerun one
+# fragment from another, so when a published value changes, the fragment asks for
+# one full run (st.rerun()) to bring the summary up to date. The checklist
+# publishes before it draws a widget, so a changed answer costs about one full
+# run, not two. Edits the summary doesn't read (the checklist page, the release
+# date, a defect count below the load threshold), the summary's own toggles and
+# the panel's poll ticks stay within their fragment. Only the panel polls, while
+# link checks or the defect ingest are pending; starting and stopping that takes
+# a full run too.
+def slot(tab_name: str, part: str) -> str:
+    return f"_{tab_name}__{part}"
 
-    st.markdown("#### Weights & Advanced ⚙️")
-    st.caption("Adjust how much each category contributes. Toggle **Advanced** to tune default Possibility (P) & Impact (I) per item.")
-    wc1, wc2 = st.columns([3,1])
-    with wc1:
-        cats = sorted({c for (c, *_rest) in TAB_DEF[tab_name]} | {"Release","Quality Metrics","Process"})
-        weights = {}
-        wcols = st.columns(len(cats)) if cats else []
-        for i, c in enumerate(cats):
-            with wcols[i]:
-                weights[c] = st.slider(c, 0.5, 2.0, 1.0, 0.1, key=key_for(tab_name, f"wt_{c}"))
-    with wc2:
-        show_adv = st.toggle("Advanced controls", value=True, key=key_for(tab_name, "adv"))
+def full_rerun(keys):
+    """st.rerun() from a fragment run. Streamlit 1.37 then drops the state of every widget the fragment
+    didn't draw, so `keys` are set through session_state first, which keeps them like seeded values."""
+    from streamlit.errors import StreamlitAPIException
+    for k in keys:
+        if k in st.session_state and not k.endswith(TRIGGERS):
+            try:
+                st.session_state[k] = st.session_state[k]
+            except StreamlitAPIException:
+                pass  # drawn in this fragment run, so it keeps its state anyway
+    st.rerun()
 
-    left, right = st.columns([2,1])
-    risk_rows = []
-    red_flags = []
+def publish(key: str, value):
+    """Store what a part feeds the summary; a change during a fragment run takes a full run."""
+    from riskradar import drafts
+    changed = st.session_state.get(key) != value
+    st.session_state[key] = value
+    if changed and not st.session_state.get("_full_run"):
+        full_rerun(["view", *drafts.tab_keys(st.session_state["view"], st.session_state)])
+
+def touched(tab_name: str):
+    # on_change of every input a draft records: autosave() only encodes after one fired
+    st.session_state[slot(tab_name, "dirty")] = True
+
+def seed_defaults(tab_name: str, catalog):
+    """Catalog defaults for the Advanced toggle and weights the session doesn't have yet, once per
+    catalog layout (questions are seeded per page by checklist_page)."""
+    from riskradar import drafts
+    state = st.session_state
+    if state.get(slot(tab_name, "seeded")) == drafts.signature(catalog):
+        return
+    have = state.to_dict()
+    for key, default in ((key_for(tab_name, "adv"), True), *((wkey, 1.0) for wkey in catalog.weight_keys)):
+        if key not in have:
+            state[key] = default
+    state[slot(tab_name, "seeded")] = drafts.signature(catalog)
+
+def weights_row(tab_name: str):
+    edit = {"on_change": touched, "args": (tab_name,)}
+    with timed("weights", tab_name):
+        st.markdown("#### Weights & Advanced ⚙️")
+        st.caption("Adjust how much each category contributes. Toggle **Advanced** to tune default Possibility (P) & Impact (I) per item.")
+        catalog = load_catalog(tab_name)
+        wc1, wc2 = st.columns([3,1])
+        with wc1:
+            cats = catalog.weight_categories
+            weights = {}
+            wcols = st.columns(len(cats)) if cats else []
+            for i, (c, wkey) in enumerate(zip(cats, catalog.weight_keys)):
+                with wcols[i]:
+                    weights[c] = st.slider(c, rules.WEIGHT_MIN, rules.WEIGHT_MAX, step=rules.WEIGHT_STEP, key=wkey, **edit)
+        with wc2:
+            show_adv = st.toggle("Advanced controls", key=key_for(tab_name, "adv"), **edit)
+    return weights, show_adv
+
+# Streamlit 1.37 walks every keyed widget in session_state for each keyed widget it
+# renders, so a rerun grows quadratically with the widgets on the page. The checklist
+# therefore renders PAGE_SIZE questions at a time; the inputs of all other questions
+# are "parked" in one plain dict per tab and still count towards the summary.
+@functools.lru_cache(maxsize=16)
+def item_defaults(catalog) -> dict:
+    """Question widget key -> catalog default, for every question of a catalog."""
+    out = {}
+    for n, risk_when_true in enumerate(catalog.risk_when_true):
+        out[catalog.answer_keys[n]] = "No" if risk_when_true else "Yes"
+        out[catalog.p_keys[n]], out[catalog.i_keys[n]] = catalog.P[n], catalog.I[n]
+        out[catalog.evidence_keys[n]] = ""
+    return out
+
+def checklist_page(tab_name: str, catalog, lo: int, hi: int, show_adv: bool) -> dict:
+    """Give questions lo..hi-1 their widget keys (parked value or catalog default) and park
+    every other question's inputs. Only does work when the page, layout or Advanced changes."""
+    from riskradar import drafts
+    state = st.session_state
+    parked = state.get(slot(tab_name, "parked"))
+    if parked is None:
+        parked = state[slot(tab_name, "parked")] = {}
+    live = (drafts.signature(catalog), lo, hi, show_adv)
+    if state.get(slot(tab_name, "live")) == live:
+        return parked
+    keep = {*catalog.answer_keys[lo:hi], *catalog.evidence_keys[lo:hi]}
+    if show_adv:
+        keep.update(catalog.p_keys[lo:hi] + catalog.i_keys[lo:hi])
+    defaults, have = item_defaults(catalog), state.to_dict()
+    for key in defaults.keys() & have.keys() - keep:
+        if have[key] != defaults[key]:
+            parked[key] = have[key]  # only what differs from the catalog is kept
+        del state[key]
+    for key in keep - have.keys():
+        state[key] = parked.pop(key, defaults[key])
+    state[slot(tab_name, "live")] = live
+    return parked
+
+# Signal tuple: (category, risk_name, P, I, score, mitigation, evidence, defects_summary, red-flag mitigation|None)
+def checklist_signals(catalog, values: dict, show_adv: bool) -> list:
+    """Signals of every question, from the tab's inputs (widget keys and parked questions)."""
+    signals = []
+    for n, (cat, rname, question, risk_when_true, P, I, mitigation, group) in enumerate(catalog.items):
+        ans = values.get(catalog.answer_keys[n], "No" if risk_when_true else "Yes")
+        if show_adv:
+            P, I = values.get(catalog.p_keys[n], P), values.get(catalog.i_keys[n], I)
+        # Risk logic (riskradar/rules.py)
+        is_risk = rules.is_risk(ans == "Yes", risk_when_true)
+        poss, impact, base_score = rules.item_score(is_risk, P, I)
+        if is_risk:
+            flag = mitigation if base_score >= rules.RED_FLAG_SCORE else None
+            signals.append((cat, rname, poss, impact, base_score, mitigation,
+                            values.get(catalog.evidence_keys[n], ""), "", flag))
+    return signals
+
+def checklist(tab_name: str):
+    from riskradar import linkcheck
+    catalog = load_catalog(tab_name)
+    show_adv = st.session_state[slot(tab_name, "weights")][1]
+    edit = {"on_change": touched, "args": (tab_name,)}
+    with timed("checklist", tab_name):
+        pages = -(-len(catalog) // PAGE_SIZE)
+        page_key = key_for(tab_name, "checklist_page")
+        page = min(st.session_state.get(page_key, 0), pages - 1) if pages > 1 else 0
+        lo, hi = page * PAGE_SIZE, min(len(catalog), (page + 1) * PAGE_SIZE)
+        checklist_page(tab_name, catalog, lo, hi, show_adv)
+        # session_state already holds this run's edit, so a change escalates before any widget is drawn
+        values = tab_values(tab_name)
+        links = linkcheck.extract(*map(values.get, catalog.evidence_keys))  # new ones start a link check
+        publish(slot(tab_name, "items"), (checklist_signals(catalog, values, show_adv), links))
 
-    # LEFT — checklist
-    with left:
         st.markdown("### Checklist → Signals")
-        for (cat, rname, question, risk_when_true, P, I, mitigation, group) in TAB_DEF[tab_name]:
+        if pages > 1:
+            def label(page):
+                first, last = page * PAGE_SIZE, min(len(catalog), (page + 1) * PAGE_SIZE)
+                groups = dict.fromkeys(item[7] for item in catalog.items[first:last])
+                return f"{first + 1}–{last} of {len(catalog)} · {', '.join(groups)}"
+            st.selectbox("Questions", range(pages), format_func=label, key=page_key)
+        for n in range(lo, hi):
+            question = catalog.items[n][2]
             with st.container():
                 cols = st.columns([5,2,2,3])
-                default_yes = not risk_when_true
-                ans = cols[0].radio(question, ["Yes","No"], index=0 if default_yes else 1, horizontal=True, key=key_for(tab_name, rname))
-                item_P, item_I = P, I
+                cols[0].radio(question, ["Yes","No"], horizontal=True, key=catalog.answer_keys[n], **edit)
                 if show_adv:
-                    item_P = cols[1].selectbox("Possibility (P)", [1,2,3], index=max(0, min(2, P-1)), key=key_for(tab_name, rname+"_P"))
-                    item_I = cols[2].selectbox("Impact (I)", [1,2,3], index=max(0, min(2, I-1)), key=key_for(tab_name, rname+"_I"))
+                    cols[1].selectbox("Possibility (P)", [1,2,3], key=catalog.p_keys[n], **edit)
+                    cols[2].selectbox("Impact (I)", [1,2,3], key=catalog.i_keys[n], **edit)
                 cols[1].caption(SCALE_HELP_P); cols[2].caption(SCALE_HELP_I)
-                evidence = cols[3].text_input("Evidence / link (optional)", key=key_for(tab_name, rname+"_evi"))
-                # Risk logic
-                is_risk = (ans == "No") if default_yes else (ans == "Yes")
-                poss = int(item_P) if is_risk else 1
-                impact = int(item_I) if is_risk else 1
-                base_score = poss * impact
-                weighted_score = round(base_score * weights.get(cat, 1.0), 1)
-                if is_risk:
-                    risk_rows.append({
-                        "project_name": project, "version": version, "assessment_date": today, "tab": tab_name,
-                        "category": cat, "risk_name": rname, "possibility": poss, "impact": impact,
-                        "score": base_score, "weighted_score": weighted_score, "mitigation": mitigation,
-                        "evidence": evidence, "defects_summary": "", "assessor": assessor
-                    })
-                    if base_score >= 6:
-                        red_flags.append((rname, cat, base_score, mitigation))
-
-    # RIGHT — intelligence panel
-    with right:
+                cols[3].text_input("Evidence / link (optional)", key=catalog.evidence_keys[n], **edit)
+    autosave(tab_name)
+
+def tab_values(tab_name: str) -> dict:
+    """Every input of a tab: its widget keys plus the parked questions (what a draft records)."""
+    values = dict(st.session_state.get(slot(tab_name, "parked")) or {})
+    values.update(st.session_state.to_dict())
+    return values
+
+def tab_links(tab_name: str) -> list:
+    from riskradar import linkcheck
+    get = tab_values(tab_name).get
+    return linkcheck.extract(*map(get, load_catalog(tab_name).evidence_keys),
+                             *(get(key_for(tab_name, name)) for name in LINK_FIELDS))
+
+def links_pending(tab_name: str) -> bool:
+    from riskradar import linkcheck
+    return linkcheck.enabled() and None in linkcheck.lookup(tab_links(tab_name)).values()
+
+def intelligence_panel(tab_name: str, reading_defects: bool = False):
+    """Release gate, defect and evidence-link signals, and whether link checks are still pending."""
+    from riskradar import linkcheck
+    edit = {"on_change": touched, "args": (tab_name,)}
+    signals = []
+    with timed("panel", tab_name):
         st.markdown("### Intelligence Panel")
         st.markdown("##### Release tracker")
-        rel_url = st.text_input("Release link (ValueEdge / Jira / other)", key=key_for(tab_name, "rel_url"))
-        rel_status = st.selectbox("Gate status", ["Unknown","Draft","In progress","Ready","Blocked"], index=0, key=key_for(tab_name, "rel_status"))
-        rel_date = st.date_input("Planned release date", key=key_for(tab_name, "rel_date"))
+        rel_url = st.text_input("Release link (ValueEdge / Jira / other)", key=key_for(tab_name, "rel_url"), **edit)
+        rel_status = st.selectbox("Gate status", rules.RELEASE_STATUSES, index=0, key=key_for(tab_name, "rel_status"), **edit)
+        rel_date = st.date_input("Planned release date", key=key_for(tab_name, "rel_date"), **edit)
         st.caption("Link & status help validate scope/timing gates.")
-        if rel_status in ["Unknown","Blocked"]:
-            rname = "Release tracker unclear/blocked"; cat = "Release"
-            P2, I2 = (2,3) if rel_status=="Unknown" else (3,3)
-            base_score = P2*I2
-            weighted_score = round(base_score * weights.get(cat, 1.0), 1)
-            risk_rows.append({
-                "project_name": project, "version": version, "assessment_date": today, "tab": tab_name,
-                "category": cat, "risk_name": rname, "possibility": P2, "impact": I2, "score": base_score,
-                "weighted_score": weighted_score, "mitigation": "Clarify release scope/gates; unblock owners",
-                "evidence": rel_url, "defects_summary": "", "assessor": assessor
-            })
-            red_flags.append((rname, cat, base_score, "Clarify release gates; unblock"))
+        gate = rules.release_gate(rel_status)
+        if gate:
+            cat, rname, mitigation, flag_mitigation = rules.RELEASE_RISK
+            P2, I2 = gate
+            signals.append((cat, rname, P2, I2, P2*I2, mitigation, rel_url, "", flag_mitigation))
 
         st.markdown("##### Ongoing defects")
         dcols = st.columns(4)
-        sev_b = dcols[0].number_input("Blocker", 0, 999, 0, key=key_for(tab_name, "def_blocker"))
-        sev_c = dcols[1].number_input("Critical", 0, 999, 0, key=key_for(tab_name, "def_critical"))
-        sev_mj = dcols[2].number_input("Major", 0, 999, 0, key=key_for(tab_name, "def_major"))
-        sev_mn = dcols[3].number_input("Minor", 0, 999, 0, key=key_for(tab_name, "def_minor"))
-        defect_score = sev_b*6 + sev_c*4 + sev_mj*2 + sev_mn*1
-        if defect_score >= 12:
-            cat = "Quality Metrics"; rname = "High defect load"
-            P3, I3 = (3,3) if sev_b>0 or sev_c>2 else (2,3)
-            base_score = P3*I3
-            weighted_score = round(base_score * weights.get(cat, 1.0), 1)
-            defects_summary = f"Blocker={sev_b}, Critical={sev_c}, Major={sev_mj}, Minor={sev_mn}"
+        # No explicit value: prefill_defects() may set these keys, and a default would warn
+        sev_b = dcols[0].number_input("Blocker", 0, DEFECTS_MAX, key=key_for(tab_name, "def_blocker"), **edit)
+        sev_c = dcols[1].number_input("Critical", 0, DEFECTS_MAX, key=key_for(tab_name, "def_critical"), **edit)
+        sev_mj = dcols[2].number_input("Major", 0, DEFECTS_MAX, key=key_for(tab_name, "def_major"), **edit)
+        sev_mn = dcols[3].number_input("Minor", 0, DEFECTS_MAX, key=key_for(tab_name, "def_minor"), **edit)
+        sources = st.session_state.get(key_for(tab_name, "def_from"), (None, None, None))[2]
+        if reading_defects:
+            st.caption("Reading tracker exports…")
+        elif sources:
+            sources = [sources] if isinstance(sources, str) else sources  # drafts saved before paged exports
+            pages = f" + {len(sources) - 1} more page(s)" if len(sources) > 1 else ""
+            st.caption(f"Prefilled from `{os.path.basename(sources[0])}`{pages} — edit to override.")
+        load = rules.defect_load(sev_b, sev_c, sev_mj, sev_mn)
+        if load:
+            cat, rname, mitigation, flag_mitigation = rules.DEFECT_RISK
+            P3, I3 = load
+            defects_summary = rules.defects_summary(sev_b, sev_c, sev_mj, sev_mn)
+            signals.append((cat, rname, P3, I3, P3*I3, mitigation, "", defects_summary, flag_mitigation))
+
+        st.markdown("##### Links & artifacts")
+        st.text_input("Git/Gerrit repo URL", key=key_for(tab_name, "link_repo"), **edit)
+        st.text_input("CI pipeline URL", key=key_for(tab_name, "link_ci"), **edit)
+        st.text_input("Spec/Confluence URL", key=key_for(tab_name, "link_spec"), **edit)
+
+        # Checked on a background thread (riskradar/linkcheck.py); this only reads its cache
+        st.markdown("##### Link check")
+        found = linkcheck.lookup(tab_links(tab_name)) if linkcheck.enabled() else {}
+        checked = [r for r in found.values() if r is not None]
+        dead = [r for r in checked if not r.ok]
+        if len(checked) < len(found):
+            st.caption(f"Checking {len(found) - len(checked)} link(s)…")
+        elif found:
+            st.caption(f"{len(checked) - len(dead)} of {len(checked)} links reachable.")
+        else:
+            st.caption("Evidence and artifact links are checked in the background." if linkcheck.enabled()
+                       else "Link checks are off (RISKRADAR_LINKCHECK=0 or httpx not installed).")
+        for r in dead[:5]:
+            st.caption(f"⚠️ `{r.url}` — {r.detail}")
+        gate = rules.evidence_gate(len(dead), len(checked))
+        if gate:
+            cat, rname, mitigation, flag_mitigation = rules.EVIDENCE_RISK
+            P4, I4 = gate
+            signals.append((cat, rname, P4, I4, P4*I4, mitigation, " ".join(r.url for r in dead), "",
+                            flag_mitigation if P4*I4 >= rules.RED_FLAG_SCORE else None))
+    return signals, len(checked) < len(found)
+
+def summary_panel(tab_name: str, project: str, version: str, assessor: str, today: str,
+                  weights: dict, items: list, panel: list):
+    with timed("summary.rows", tab_name):
+        risk_rows = []
+        red_flags = []
+        for (cat, rname, poss, impact, base_score, mitigation, evidence, defects_summary, flag) in items + panel:
             risk_rows.append({
                 "project_name": project, "version": version, "assessment_date": today, "tab": tab_name,
-                "category": cat, "risk_name": rname, "possibility": P3, "impact": I3, "score": base_score,
-                "weighted_score": weighted_score, "mitigation": "Focus blocker/critical burndown; triage",
-                "evidence": "", "defects_summary": defects_summary, "assessor": assessor
+                "category": cat, "risk_name": rname, "possibility": poss, "impact": impact,
+                "score": base_score, "weighted_score": rules.weighted(base_score, weights.get(cat, 1.0)),
+                "mitigation": mitigation, "evidence": evidence, "defects_summary": defects_summary, "assessor": assessor
             })
-            red_flags.append((rname, cat, base_score, "Blocker/critical burndown"))
+            if flag:
+                red_flags.append((rname, cat, base_score, flag))
 
-        st.markdown("##### Links & artifacts")
-        st.text_input("Git/Gerrit repo URL", key=key_for(tab_name, "link_repo"))
-        st.text_input("CI pipeline URL", key=key_for(tab_name, "link_ci"))
-        st.text_input("Spec/Confluence URL", key=key_for(tab_name, "link_spec"))
-
-    # Summary
-    st.markdown("---")
-    total_score = sum(r["score"] for r in risk_rows)
-    max_cell = max((r["score"] for r in risk_rows), default=0)
-    rating = score_to_rating(total_score, max_cell)
+        total_score = sum(r["score"] for r in risk_rows)
+        max_cell = max((r["score"] for r in risk_rows), default=0)
+        rating = score_to_rating(total_score, max_cell)
     sL, sR = st.columns([1,1])
     with sL:
         st.subheader(f"Summary — {rating}")
-        st.write(f"High‑risk items (≥7): {sum(1 for r in risk_rows if r['score']>=7)}")
+        st.write(f"High‑risk items (≥7): {sum(1 for r in risk_rows if r['score']>=rules.HIGH_CELL)}")
         st.write(f"Weighted score: {int(sum(r['weighted_score'] for r in risk_rows))}")
-    with sR:
+    with sR, timed("summary.heatmap", tab_name):
         plot_heatmap(risk_rows)
 
+    sens = st.toggle("Sensitivity mode", key=key_for(tab_name, "sens"), on_change=touched, args=(tab_name,),
+                     help="Evaluate the current answers under 10,000 weight / P×I combinations")
+    if sens:
+        with timed("summary.sensitivity", tab_name):
+            sensitivity_panel(items, panel, weights)
+
     st.markdown("### 🔴 Red Flags (auto)")
     if red_flags:
         for name, cat, s, mit in sorted(red_flags, key=lambda x: x[2], reverse=True)[:5]:
@@ -239,19 +316,394 @@ def assess_tab(tab_name: str):
     else:
         st.info("No red flags identified.")
 
-    cols = ["project_name","version","assessment_date","tab","category","risk_name","possibility","impact","score","weighted_score","mitigation","evidence","defects_summary","assessor"]
-    df = pd.DataFrame(risk_rows, columns=cols)
-    display_cols = {"possibility":"Possibility (P)", "impact":"Impact (I)"}
-    st.dataframe(df.rename(columns=display_cols), use_container_width=True)
+    with timed("summary.dataframe", tab_name):
+        import pandas as pd
+        df = pd.DataFrame(risk_rows, columns=RESULT_COLUMNS)
+        display_cols = {"possibility":"Possibility (P)", "impact":"Impact (I)"}
+        st.dataframe(df.rename(columns=display_cols), use_container_width=True)
 
     if project and version and not df.empty:
-        path = save_results_csv(project, version, tab_name, df)
-        st.download_button("⬇️ Download CSV", data=df.to_csv(index=False).encode("utf-8"),
+        # No-op unless the rows changed since the last save (see riskradar/store.py)
+        with timed("summary.save", tab_name):
+            defects = tuple(st.session_state.get(key_for(tab_name, f"def_{sev.lower()}"), 0)
+                            for sev in rules.SEVERITIES)
+            path = save_results_csv(project, version, tab_name, df, today, defects=defects)
+        with timed("summary.to_csv", tab_name):
+            data = df.to_csv(index=False).encode("utf-8")
+        st.download_button("⬇️ Download CSV", data=data,
                            file_name=os.path.basename(path), mime="text/csv", key=key_for(tab_name, "dl"))
     elif not project or not version:
         st.warning("Enter Project & Version to enable CSV download.")
 
-tabs = st.tabs(["L10n", "LocOps", "General"])
-with tabs[0]: assess_tab("L10n")
-with tabs[1]: assess_tab("LocOps")
-with tabs[2]: assess_tab("General")
+def sensitivity_panel(items: list, panel: list, weights: dict):
+    # One vectorized pass over weight / P×I scenarios with the rules of score_to_rating (riskradar/sensitivity.py)
+    from riskradar import sensitivity
+    pick = lambda sig: [(cat, rname, P, I) for (cat, rname, P, I, *_) in sig]
+    res = sensitivity.analyze(pick(items), pick(panel), weights)
+    st.markdown("#### Sensitivity")
+    cols = st.columns(4)
+    for col, (rating, share) in zip(cols, res["rating_share"].items()):
+        col.metric(f"{rating} in", f"{share:.0%}")
+    pct = res["weighted_pcts"]
+    cols[3].metric("Weighted score p5–p95", f"{pct['p5']:.0f}–{pct['p95']:.0f}")
+    st.caption(f"{res['scenarios']:,} scenarios: every weight drawn from the slider range, each item's P and I "
+               f"re-picked 30% of the time. Weights never change the rating, only the weighted score. "
+               f"Now: total {res['total']} (Medium at ≥ {rules.MEDIUM_TOTAL}), "
+               f"max cell {res['max_cell']} (High at ≥ {rules.HIGH_CELL}).")
+    iL, iR = st.columns([3,2])
+    with iL:
+        st.markdown("##### Items the rating is most sensitive to")
+        st.dataframe(res["items"].head(15), use_container_width=True, hide_index=True, column_config={
+            "worse_at_score": st.column_config.NumberColumn("Worse rating at score ≥", help="0 = never"),
+            "better_at_score": st.column_config.NumberColumn("Better rating at score ≤", help="0 = never"),
+            "flip_rate_overridden": st.column_config.NumberColumn("Flip rate (overridden)", format="%.2f"),
+            "flip_rate_kept": st.column_config.NumberColumn("Flip rate (kept)", format="%.2f"),
+            "influence": st.column_config.ProgressColumn("Influence", min_value=0.0, max_value=1.0)})
+    with iR:
+        st.markdown("##### Weighted score by category weight")
+        st.dataframe(res["categories"], use_container_width=True, hide_index=True, column_config={
+            "weighted_min": st.column_config.NumberColumn(f"At {rules.WEIGHT_MIN}", format="%.1f"),
+            "weighted_max": st.column_config.NumberColumn(f"At {rules.WEIGHT_MAX}", format="%.1f"),
+            "correlation": st.column_config.ProgressColumn("Sensitivity", min_value=0.0, max_value=1.0)})
+
+def prefill_defects(tab_name: str, project: str, version: str) -> bool:
+    """Counts from tracker exports in results/defects/ (riskradar/defects.py), applied once per
+    project/version so a hand-edited counter sticks until the project or version changes.
+    True while the exports are still being read (the fragment polls until they are)."""
+    marker = key_for(tab_name, "def_from")
+    if not project or not version or st.session_state.get(marker, (None, None))[:2] == (project, version):
+        return False
+    from riskradar import defects
+    if defects.refresh():  # parses new or changed exports on a background thread
+        return True
+    found = defects.counts_for(project, version)
+    prefilled = st.session_state.get(marker, (None, None, None))[2]
+    st.session_state[marker] = (project, version, found["sources"] if found else None)
+    if found or prefilled:  # don't carry another project's tracker counts over
+        for n, sev in enumerate(rules.SEVERITIES):
+            st.session_state[key_for(tab_name, f"def_{sev.lower()}")] = min(found["counts"][n], DEFECTS_MAX) if found else 0
+    touched(tab_name)
+    return False
+
+def weights_part(tab_name: str):
+    seed_defaults(tab_name, load_catalog(tab_name))
+    publish(slot(tab_name, "weights"), weights_row(tab_name))
+    autosave(tab_name)
+
+def panel_part(tab_name: str, project: str, version: str):
+    reading = prefill_defects(tab_name, project, version)
+    signals, pending = intelligence_panel(tab_name, reading)
+    publish(slot(tab_name, "panel"), (signals, pending or reading))
+    autosave(tab_name)
+
+def summary_part(tab_name: str, project: str, version: str, assessor: str, today: str):
+    state = st.session_state
+    weights = state[slot(tab_name, "weights")][0]
+    items, panel = state[slot(tab_name, "items")][0], state[slot(tab_name, "panel")][0]
+    summary_panel(tab_name, project, version, assessor, today, weights, items, panel)
+    autosave(tab_name)
+
+weights_fragment = st.fragment(weights_part)
+checklist_fragment = st.fragment(checklist)
+summary_fragment = st.fragment(summary_part)
+# The same panel, polling only while link checks or the defect ingest are pending
+# (a full run drops the timer again)
+panel_fragment = st.fragment(panel_part)
+panel_polling = st.fragment(panel_part, run_every=LINK_POLL_S)
+
+def assess_tab(tab_name: str):
+    edit = {"on_change": touched, "args": (tab_name,)}
+    top = st.container()
+    with top, timed("header", tab_name):
+        c1, c2, c3, c4 = st.columns([2,2,1,1])
+        project = c1.text_input("Project", key=key_for(tab_name, "Project"), **edit)
+        version = c2.text_input("Version", key=key_for(tab_name, "Version"), **edit)
+        assessor = c3.text_input("Assessor", key=key_for(tab_name, "Assessor"), **edit)
+        today = datetime.date.today().strftime("%Y-%m-%d")
+        c4.markdown(f"**Date**: {today}")
+        reading = prefill_defects(tab_name, project, version)
+    weights_fragment(tab_name)
+    left, right = st.columns([2,1])
+    with left:
+        checklist_fragment(tab_name)
+    with right:
+        (panel_polling if reading or links_pending(tab_name) else panel_fragment)(tab_name, project, version)
+    st.markdown("---")
+    summary_fragment(tab_name, project, version, assessor, today)
+
+
+def portfolio_matrix(frame, tab_filter):
+    # Partial counts are built once per loaded frame; filters only re-sum them (riskradar/matrix.py)
+    from riskradar import charts, matrix
+    index = matrix.index_for(frame)
+    st.markdown("### Risk Matrix (portfolio)")
+    f1, f2, f3 = st.columns([2,2,2])
+    categories = f1.multiselect("Categories", index.options("category"), key="pf_m_cats")
+    projects = f2.multiselect("Projects", index.options("project_name"), key="pf_m_projects")
+    dates = index.options("assessment_date")
+    date_from = date_to = None
+    if dates:
+        lo, hi = datetime.date.fromisoformat(dates[0]), datetime.date.fromisoformat(dates[-1])
+        picked = f3.date_input("Assessment dates", value=(lo, hi), min_value=lo, max_value=hi, key="pf_m_dates")
+        if isinstance(picked, (tuple, list)) and picked:
+            date_from, date_to = picked[0], picked[-1]
+    filters = {"tabs": tab_filter, "categories": categories, "projects": projects,
+               "date_from": date_from, "date_to": date_to}
+    counts = index.counts(**filters)
+
+    mL, mR = st.columns([1,1])
+    with mL:
+        st.image(charts.heatmap_png(matrix.as_grid(counts), "Portfolio Risk Matrix (Possibility × Impact)"),
+                 use_column_width="never")
+    with mR:
+        cells = sorted(((int(counts[p-1, i-1]), p, i) for p in (1,2,3) for i in (1,2,3)), reverse=True)
+        cells = [(n, p, i) for n, p, i in cells if n]
+        if not cells:
+            st.info("No risks match these filters.")
+            return
+        n, p, i = st.selectbox("Drill into cell", cells, key="pf_m_cell",
+                               format_func=lambda c: f"P{c[1]} × I{c[2]} — {c[0]} risks")
+        rows = index.rows(p, i, **filters)
+        st.dataframe(rows[["project_name","version","assessment_date","tab","category","risk_name","score","mitigation"]]
+                     .head(1000), use_container_width=True, hide_index=True)
+
+def portfolio_delta(frame, tab_filter):
+    # Hash join over the indexed portfolio (riskradar/delta.py); the index is built once per loaded frame
+    from riskradar import delta
+    index = delta.index_for(frame)
+    st.markdown("### Compare releases")
+    d1, d2, d3, d4 = st.columns([1,2,2,3])
+    by = d1.radio("By", delta.BY, horizontal=True, key="pf_d_by")
+    options = index.options(by)
+    if len(options) < 2:
+        st.info(f"Need assessments saved for at least two {by}s to compare.")
+        return
+    for key, default in (("pf_d_base", options[-2]), ("pf_d_head", options[-1])):
+        if st.session_state.get(key) not in options:  # seeded, not index=, so full_rerun() can keep them
+            st.session_state[key] = default
+    base = d2.selectbox("Base", options, key="pf_d_base")
+    head = d3.selectbox("Head", options, key="pf_d_head")
+    projects = d4.multiselect("Projects", sorted(map(str, index.projects)), key="pf_d_projects")
+    changes = index.compare(base, head, by=by, projects=projects, tabs=tab_filter)
+    totals = delta.summarize(changes)
+    cols = st.columns(len(delta.CHANGES) + 1)
+    for col, name in zip(cols, delta.CHANGES):
+        col.metric(name.capitalize(), totals[name])
+    cols[-1].metric("Δ weighted score", f"{totals['weighted_delta']:+.1f}")
+    st.dataframe(changes.head(2000), use_container_width=True, hide_index=True)
+
+def portfolio_trends(frame):
+    # Weekly aggregates kept up to date on every save (riskradar/trends.py); reading is one range scan
+    import pandas as pd
+    from riskradar import trends
+    st.markdown("### Trends")
+    scopes = [trends.PORTFOLIO, *sorted(map(str, frame["project_name"].unique()))]
+    t1, t2 = st.columns([2,1])
+    scope = t1.selectbox("Scope", scopes, key="pf_t_scope",
+                         format_func=lambda s: "Whole portfolio" if s == trends.PORTFOLIO else s)
+    st.session_state.setdefault("pf_t_weeks", 52)
+    weeks = t2.select_slider("Weeks", [13, 26, 52, 104, 260], key="pf_t_weeks")
+    rows = trends.series(scope)[-weeks:]
+    if not rows:
+        st.info("No trend data yet — `python -m riskradar trends --rebuild` backfills it from the revision log.")
+        return
+    df = pd.DataFrame(rows).set_index("week")
+    per = df["assessments"]
+    avg = pd.DataFrame({"weighted score": df["weighted_score"] / per, "total score": df["total_score"] / per})
+    avg["weighted (4-wk avg)"] = avg["weighted score"].rolling(4, min_periods=1).mean()
+    tL, tR = st.columns([1,1])
+    with tL:
+        st.markdown("#### Score per assessment")
+        st.line_chart(avg)
+        st.markdown("#### High-risk items per assessment")
+        st.line_chart(df["high_count"] / per)
+    with tR:
+        st.markdown("#### Ratings")
+        st.bar_chart(df[["high", "medium", "low"]].rename(columns=str.capitalize))
+        st.markdown("#### Open defects (per assessment)")
+        st.line_chart(df[["blocker", "critical", "major", "minor"]].div(per, axis=0).rename(columns=str.capitalize))
+
+    if scope == trends.PORTFOLIO:
+        lines = trends.sparklines()
+        spark = pd.DataFrame({"project": list(lines), "weeks": [len(v) for v in lines.values()],
+                              "latest": [v[-1] for v in lines.values()],
+                              "trend": [v[-weeks:] for v in lines.values()]})
+        st.dataframe(spark, use_container_width=True, hide_index=True, column_config={
+            "latest": st.column_config.NumberColumn("Weighted score (latest week)", format="%.1f"),
+            "trend": st.column_config.LineChartColumn(f"Weighted score, last {weeks} weeks")})
+
+def portfolio_export(frame):
+    # Streams results/*.csv chunk by chunk (riskradar/export.py); the file goes to results/exports/
+    from riskradar import export, store
+    st.markdown("### Export")
+    e1, e2, e3 = st.columns([2,2,1])
+    tabs = e1.multiselect("Tabs", sorted(frame["tab"].unique()), key="pf_x_tabs")
+    dates = sorted(frame["assessment_date"].astype(str).unique())
+    date_from = date_to = None
+    if dates:
+        lo, hi = datetime.date.fromisoformat(dates[0]), datetime.date.fromisoformat(dates[-1])
+        picked = e2.date_input("Assessment dates", value=(lo, hi), min_value=lo, max_value=hi, key="pf_x_dates")
+        if isinstance(picked, (tuple, list)) and picked:
+            date_from, date_to = picked[0], picked[-1]
+    fmt = e3.selectbox("Format", export.FORMATS, key="pf_x_fmt")
+    if not st.button("Export", key="pf_x_go"):
+        return
+    out_dir = os.path.join(store.ensure_results_dir(), "exports")
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"riskradar_{datetime.datetime.now():%Y%m%d_%H%M%S}.{fmt}")
+    try:
+        with st.spinner("Exporting…"):
+            n = export.export(path, fmt, tabs=tabs, date_from=date_from, date_to=date_to)
+    except RuntimeError as e:
+        st.error(str(e))
+        return
+    size = os.path.getsize(path)
+    st.success(f"Exported {n:,} rows ({size / 1e6:.1f} MB) to `{path}`")
+    # download_button holds the whole file in memory (and in the browser), so only offer it for small exports
+    if size <= DOWNLOAD_MAX_MB * 1e6:
+        with open(path, "rb") as fh:
+            st.download_button("Download", fh.read(), file_name=os.path.basename(path), key="pf_x_dl")
+
+def portfolio_links(frame) -> dict:
+    # url -> [(project, version, date, tab, risk), ...] over the saved evidence
+    from riskradar import linkcheck
+    st.markdown("### Evidence links")
+    if not linkcheck.enabled():
+        st.caption("Link checks are off (RISKRADAR_LINKCHECK=0 or httpx not installed).")
+        return {}
+    cols = ["project_name", "version", "assessment_date", "tab", "risk_name", "evidence"]
+    rows = frame.loc[frame["evidence"].astype(str).str.contains("://", regex=False), cols]
+    refs = {}
+    for *ref, evidence in rows.itertuples(index=False):
+        for url in linkcheck.extract(evidence):
+            refs.setdefault(url, []).append(tuple(map(str, ref)))
+    if not refs:
+        st.info("No links in the saved evidence.")
+    return refs
+
+def portfolio_keys():
+    # What full_rerun() keeps in the Portfolio view. The date ranges take their value= from the data, and
+    # Streamlit warns when such a widget is also set through session_state, so they go back to the full range
+    return ["view", *(k for k in st.session_state if k.startswith("pf_") and not k.endswith("_dates"))]
+
+def link_report(refs: dict):
+    from riskradar import linkcheck
+    import pandas as pd
+    c1, c2 = st.columns([1,4])
+    if c1.button("Check links", key="pf_l_go") and linkcheck.schedule(refs):
+        full_rerun(portfolio_keys())  # full run: picks the polling variant while the checks run
+    found = linkcheck.cached(refs)
+    dead = {u: r for u, r in found.items() if not r.ok}
+    busy = linkcheck.pending(refs)
+    c2.caption(f"{len(refs)} distinct links · {len(found)} checked · {len(dead)} unverifiable"
+               + (f" · checking {busy} in the background…" if busy else ""))
+    if not busy and st.session_state.get("_pf_links_busy"):
+        st.session_state["_pf_links_busy"] = False
+        full_rerun(portfolio_keys())  # full run: back to the non-polling variant
+    st.session_state["_pf_links_busy"] = bool(busy)
+    if dead:
+        st.dataframe(pd.DataFrame([{"url": u, "result": r.detail, "assessments": len(refs[u]),
+                                    "first seen in": " ".join(refs[u][0])} for u, r in dead.items()]),
+                     use_container_width=True, hide_index=True)
+
+links_fragment = st.fragment(link_report)
+links_polling = st.fragment(link_report, run_every=LINK_POLL_S)
+
+def portfolio_tab():
+    from riskradar import portfolio
+    frame = portfolio.load_portfolio()
+    if frame.empty:
+        st.info("No saved assessments yet — results appear here once a tab is saved.")
+        return
+    full = frame
+    tab_filter = st.multiselect("Tabs", sorted(frame["tab"].unique()), key="pf_tabs")
+    if tab_filter:
+        frame = frame[frame["tab"].isin(tab_filter)]
+    runs = portfolio.assessments(frame)
+
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Assessments", len(runs))
+    m2.metric("Projects", runs["project_name"].nunique())
+    m3.metric("High", int((runs["rating"] == "High").sum()))
+    m4.metric("Risk rows", len(frame))
+
+    pL, pR = st.columns([1,1])
+    with pL:
+        st.markdown("#### Ratings")
+        st.bar_chart(runs["rating"].value_counts().reindex(["High","Medium","Low"], fill_value=0))
+    with pR:
+        st.markdown("#### Category totals")
+        st.bar_chart(portfolio.category_totals(frame)["score"])
+
+    portfolio_matrix(full, tab_filter)
+    portfolio_delta(full, tab_filter)
+    portfolio_trends(full)
+    portfolio_export(full)
+    refs = portfolio_links(full)
+    if refs:
+        from riskradar import linkcheck
+        (links_polling if linkcheck.pending(refs) else links_fragment)(refs)
+
+    st.markdown("### 🔴 Top Red Flags (portfolio)")
+    st.dataframe(portfolio.top_red_flags(frame), use_container_width=True, hide_index=True)
+    st.markdown("### Assessments")
+    st.dataframe(runs.head(500), use_container_width=True, hide_index=True)
+
+# ---------- Drafts ----------
+# Inputs are autosaved as a compact per-tab snapshot (riskradar/drafts.py) under the
+# draft id in the URL, so a reconnect or server restart restores them in one read.
+# Hidden tabs are kept only in that form: their widget keys, parked questions and flags
+# are dropped, and expanded back when the tab is shown again. Widgets whose default isn't
+# the neutral one get it seeded into session_state instead of passed as an argument
+# (seed_defaults, checklist_page), so a restored value never counts as "set twice".
+# A snapshot is only encoded after an input's on_change fired (touched()).
+def autosave(tab_name: str):
+    from riskradar import drafts
+    if not st.session_state.pop(slot(tab_name, "dirty"), False):
+        return
+    blob = drafts.encode(load_catalog(tab_name), tab_values(tab_name))
+    if blob != st.session_state.get(slot(tab_name, "saved")):
+        drafts.save(st.session_state["_draft"], tab_name, blob)
+        st.session_state[slot(tab_name, "saved")] = blob
+
+def sync_drafts(active: str):
+    from riskradar import drafts
+    if "_draft" not in st.session_state:
+        draft_id = st.query_params.get("draft")
+        saved = drafts.load(draft_id) if draft_id else {}
+        if not draft_id:
+            draft_id = st.query_params["draft"] = drafts.new_id()
+            drafts.prune()
+        st.session_state["_draft"] = draft_id
+        for tab, blob in saved.items():
+            if tab in TABS:
+                st.session_state[slot(tab, "draft")] = st.session_state[slot(tab, "saved")] = blob
+    for tab in TABS:
+        keys = drafts.tab_keys(tab, st.session_state)
+        if tab != active:
+            if keys:
+                saved = st.session_state.get(slot(tab, "saved"))
+                if saved is None or st.session_state.get(slot(tab, "dirty")):
+                    saved = drafts.encode(load_catalog(tab), tab_values(tab))
+                st.session_state[slot(tab, "draft")] = saved
+                for k in keys + [slot(tab, part) for part in ("weights", "items", "panel", "seeded", "dirty", "parked", "live")]:
+                    st.session_state.pop(k, None)
+        elif not keys and slot(tab, "draft") in st.session_state:
+            # Questions go back to the parked dict; checklist_page gives the current page its keys
+            catalog = load_catalog(tab)
+            values, questions = drafts.decode(catalog, st.session_state.pop(slot(tab, "draft"))), item_defaults(catalog)
+            st.session_state[slot(tab, "parked")] = {k: v for k, v in values.items() if k in questions}
+            st.session_state.update({k: v for k, v in values.items() if k not in questions})
+
+# Only the selected view is evaluated (st.tabs would run all of them on every rerun)
+view = st.radio("View", [*TABS, "Portfolio"], horizontal=True, key="view", label_visibility="collapsed")
+sync_drafts(view)
+st.session_state["_full_run"] = True
+try:
+    with timed("rerun", view):
+        if view == "Portfolio":
+            portfolio_tab()
+        else:
+            assess_tab(view)
+finally:
+    st.session_state["_full_run"] = False
@@ -0,0 +1,19 @@
+# tests/conftest.py — shared fixtures for the riskradar unit tests
+#
+#   python -m pytest -q
+#
+# Every test that touches the store gets its own results directory through
+# RISKRADAR_RESULTS_DIR, so nothing is written to results/.
+import os, sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+@pytest.fixture
+def results_dir(tmp_path, monkeypatch):
+    out_dir = tmp_path / "results"
+    out_dir.mkdir()
+    monkeypatch.setenv("RISKRADAR_RESULTS_DIR", str(out_dir))
+    return str(out_dir)
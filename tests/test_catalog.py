@@ -0,0 +1,94 @@
+# tests/test_catalog.py — riskradar/catalog.py: compiled catalogs, hot reload and half-saved edits
+import json, os
+
+import pytest
+
+from riskradar import catalog
+from riskradar.catalog import load_catalog
+
+def item(name, P=2, I=3, risk_when_true=True, category="Process"):
+    return {"category": category, "risk_name": name, "question": f"{name}?", "risk_when_true": risk_when_true,
+            "P": P, "I": I, "mitigation": f"fix {name}", "group": "Quality"}
+
+def write(cat_dir, items, tab="L10n", bump=0, raw=None):
+    path = os.path.join(cat_dir, f"{tab.lower()}.json")
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(raw if raw is not None else json.dumps({"schema": 1, "version": "t", "items": items}))
+    # mtime resolution is coarse on some filesystems; make every write a new version
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump * 1_000_000_000))
+    return path
+
+@pytest.fixture
+def cat_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("RISKRADAR_CATALOG_DIR", str(tmp_path))
+    return str(tmp_path)
+
+def test_compiled_fields(cat_dir):
+    write(cat_dir, [item("FTP used", 3, 3), item("No CI", 1, 2, risk_when_true=False, category="Tooling")])
+    cat = load_catalog("L10n")
+    assert len(cat) == 2
+    assert cat.answer_keys == ("L10n_FTP_used", "L10n_No_CI")
+    assert cat.p_keys[0] == "L10n_FTP_used_P" and cat.evidence_keys[1] == "L10n_No_CI_evi"
+    assert list(cat.P) == [3, 1] and list(cat.I) == [3, 2] and list(cat.risk_when_true) == [1, 0]
+    # The panel-driven categories always get a weight slider
+    assert cat.weight_categories == ("Process", "Quality Metrics", "Release", "Tooling")
+    assert [cat.weight_categories[i] for i in cat.category_index] == ["Process", "Tooling"]
+
+def test_unchanged_file_is_not_recompiled(cat_dir, monkeypatch):
+    write(cat_dir, [item("a")])
+    first = load_catalog("L10n")
+    monkeypatch.setattr(catalog, "_compile", lambda *a: pytest.fail("recompiled an unchanged catalog"))
+    assert load_catalog("L10n") is first
+
+def test_edit_hot_reloads(cat_dir):
+    write(cat_dir, [item("a")])
+    assert load_catalog("L10n").names == ("a",)
+    write(cat_dir, [item("a"), item("b")], bump=1)
+    assert load_catalog("L10n").names == ("a", "b")
+
+def test_half_saved_edit_keeps_the_last_good_version(cat_dir, monkeypatch, caplog):
+    path = write(cat_dir, [item("a")])
+    good = load_catalog("L10n")
+    write(cat_dir, None, bump=1, raw='{"schema": 1, "items": [')
+    assert load_catalog("L10n") is good
+    assert catalog._broken[path] == os.stat(path).st_mtime_ns
+    assert "not reloaded" in caplog.text
+    # The broken version is remembered: no recompile attempt per call
+    with monkeypatch.context() as m:
+        m.setattr(catalog, "_compile", lambda *a: pytest.fail("recompiled a known-broken catalog"))
+        assert load_catalog("L10n") is good
+    write(cat_dir, [item("a"), item("c")], bump=2)
+    assert load_catalog("L10n").names == ("a", "c")
+
+def test_broken_catalog_without_a_good_version_raises(cat_dir):
+    write(cat_dir, None, raw="not json")
+    with pytest.raises(ValueError):
+        load_catalog("L10n")
+
+@pytest.mark.parametrize("doc, message", [
+    ({"schema": 2, "items": []}, "unsupported catalog schema"),
+    ({"schema": 1, "items": [{"risk_name": "a"}]}, "is missing"),
+    ({"schema": 1, "items": [item("a", P=4)]}, "P and I in 1..3"),
+    ({"schema": 1, "items": [item("a b"), item("a-b")]}, "must be unique"),
+])
+def test_invalid_catalogs(cat_dir, doc, message):
+    write(cat_dir, None, raw=json.dumps(doc))
+    with pytest.raises(ValueError, match=message):
+        load_catalog("L10n")
+
+def test_stock_catalogs_compile(monkeypatch):
+    monkeypatch.delenv("RISKRADAR_CATALOG_DIR", raising=False)
+    for tab in catalog.TABS:
+        assert len(load_catalog(tab)) > 0
+
+def test_locops_keeps_the_starter_app_questions(monkeypatch):
+    # app.py had its own LocOps list before both entry points read the catalogs; its saves use these names
+    monkeypatch.delenv("RISKRADAR_CATALOG_DIR", raising=False)
+    cat = load_catalog("LocOps")
+    starter = ["Pipeline instability", "License server outage risk", "Secrets management gaps", "Parser regressions",
+               "Staging/server availability", "Agent env drift", "Guardrails missing", "Backup/restore gaps",
+               "Monitoring SLAs"]
+    assert set(starter) <= set(cat.names) and len(cat) == 23
+    assert cat.items[cat.names.index("Pipeline instability")][:6] == \
+        ("Tooling", "Pipeline instability", "Have pipelines been ≥95% green in the last 14 days?", False, 2, 3)
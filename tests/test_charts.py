@@ -0,0 +1,26 @@
+# tests/test_charts.py — riskradar/charts.py: count grid and memoized PNG rendering
+import gc
+
+from riskradar import charts
+
+def test_count_grid_skips_bad_and_out_of_range_rows():
+    rows = [{"possibility": 1, "impact": 1}, {"possibility": "3", "impact": 2}, {"possibility": 3, "impact": 2},
+            {"possibility": 4, "impact": 1}, {"possibility": None, "impact": 1}, {"impact": 2}]
+    assert charts.count_grid(rows) == ((1, 0, 0), (0, 0, 0), (0, 2, 0))
+
+def test_heatmap_is_rendered_once_per_grid():
+    grid = ((1, 2, 3), (0, 0, 0), (4, 5, 6))
+    before = charts.heatmap_png.cache_info()
+    png = charts.heatmap_png(grid, "test")
+    assert png.startswith(b"\x89PNG")
+    assert charts.heatmap_png(grid, "test") is png
+    after = charts.heatmap_png.cache_info()
+    assert (after.misses - before.misses, after.hits - before.hits) == (1, 1)
+
+def test_rendering_leaves_no_live_figures():
+    from matplotlib.figure import Figure
+    import matplotlib.pyplot as plt
+    charts.radar_png(("A", "B", "C"), (1.0, 2.0, 3.0), "test")
+    gc.collect()
+    assert not plt.get_fignums()
+    assert all(not o.axes for o in gc.get_objects() if isinstance(o, Figure))
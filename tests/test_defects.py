@@ -0,0 +1,123 @@
+# tests/test_defects.py — riskradar/defects.py: tracker export parsing, ingest and paged exports
+import json, os
+
+import pytest
+
+from riskradar import defects
+
+JIRA_CSV = """Summary,Project name,Fix Version/s,Fix Version/s,Priority,Status,Resolution
+a,Data Platform,25.3,25.4,Highest,Open,Unresolved
+b,Data Platform,25.3,,High,In Progress,
+c,Data Platform,25.3,,Medium,Done,Done
+d,Data Platform,25.3,,Low,Open,Fixed
+e,Data Platform,25.3,,Sev-9,Open,
+f,Data Platform,25.4,,Lowest,Open,
+"""
+
+def write(inbox, name, text, mtime=None):
+    path = os.path.join(inbox, name)
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(text)
+    if mtime is not None:
+        os.utime(path, (mtime, mtime))
+    return path
+
+@pytest.fixture
+def inbox(tmp_path, results_dir):
+    path = tmp_path / "defects"
+    path.mkdir()
+    return str(path)
+
+def test_jira_csv(inbox):
+    counts, stats = defects.aggregate(defects.iter_issues(write(inbox, "jira.csv", JIRA_CSV)))
+    # Both Fix Version/s columns count; Done and resolved issues are skipped
+    assert counts == {("data platform", "25.3"): [1, 1, 0, 0], ("data platform", "25.4"): [1, 0, 0, 1]}
+    assert (stats["issues"], stats["open"], stats["counted"], stats["unmapped"]) == (6, 4, 3, {"Sev-9": 1})
+
+def test_jira_and_valueedge_json(inbox):
+    jira = {"startAt": 0, "total": 2, "issues": [
+        {"fields": {"project": {"key": "DP", "name": "Data Platform"}, "fixVersions": [{"name": "25.3"}],
+                    "priority": {"name": "High"}, "status": {"name": "Open", "statusCategory": {"key": "new"}}}},
+        {"fields": {"project": {"key": "DP"}, "fixVersions": [{"name": "25.3"}], "priority": {"name": "High"},
+                    "status": {"name": "Closed", "statusCategory": {"key": "done"}}}}]}
+    counts, _ = defects.aggregate(defects.iter_issues(write(inbox, "jira.json", json.dumps(jira))))
+    assert counts == {("data platform", "25.3"): [0, 1, 0, 0], ("dp", "25.3"): [0, 1, 0, 0]}
+
+    valueedge = {"total_count": 2, "data": [
+        {"product": {"name": "Billing"}, "release": {"name": "R1"}, "phase": {"name": "New"},
+         "severity": {"logical_name": "list_node.severity.very_high"}},
+        {"product": {"name": "Billing"}, "release": {"name": "R1"}, "phase": {"name": "Rejected"},
+         "severity": {"name": "Low"}}]}
+    counts, _ = defects.aggregate(defects.iter_issues(write(inbox, "ve.json", json.dumps(valueedge))))
+    assert counts == {("billing", "r1"): [0, 1, 0, 0]}
+
+def test_json_is_streamed_across_small_blocks(inbox, monkeypatch):
+    issues = [{"fields": {"project": "P", "fixVersions": ["1.0"], "priority": "Major", "status": "Open",
+                          "summary": "x" * n}} for n in range(50)]
+    path = write(inbox, "big.json", json.dumps({"total": 50, "issues": issues}, indent=1))
+    monkeypatch.setattr(defects._JsonStream, "BLOCK", 7)
+    counts, stats = defects.aggregate(defects.iter_issues(path))
+    assert counts == {("p", "1.0"): [0, 0, 50, 0]} and stats["issues"] == 50
+    monkeypatch.setattr(defects._JsonStream, "BLOCK", 1 << 20)
+    write(inbox, "bad.json", '{"issues": [{"fields": ')
+    with pytest.raises(ValueError):
+        list(defects.iter_issues(os.path.join(inbox, "bad.json")))
+
+def test_unversioned_export_applies_to_every_version(inbox):
+    lines = [{"project": "W", "severity": "S1", "status": "Open"}, {"severity": "minor", "status": "Open"}]
+    path = write(inbox, "w.jsonl", "\n".join(map(json.dumps, lines)) + "\n")
+    counts, stats = defects.aggregate(defects.iter_issues(path))
+    assert counts == {("w", defects.ANY_VERSION): [1, 0, 0, 0]} and stats["unattributed"] == 1
+    counts, _ = defects.aggregate(defects.iter_issues(path), default_project="Web")
+    assert counts == {("w", defects.ANY_VERSION): [1, 0, 0, 0], ("web", defects.ANY_VERSION): [0, 0, 0, 1]}
+
+def test_ingest_rereads_only_changes(inbox, results_dir):
+    path = write(inbox, "jira.csv", JIRA_CSV)
+    assert [r["path"] for r in defects.ingest(inbox)] == [path]
+    assert defects.ingest(inbox) == []
+    assert defects.counts_for("DATA  platform", "25.4")["counts"] == (1, 0, 0, 1)
+    os.unlink(path)
+    assert defects.ingest(inbox) == []
+    assert defects.counts_for("Data Platform", "25.4") is None
+
+def test_newest_export_wins_and_pages_are_summed(inbox, results_dir):
+    day = 86_400
+    header = "Project,Fix Version/s,Priority,Status\n"
+    write(inbox, "jira_old.csv", header + "DP,25.3,Highest,Open\n", mtime=1_000_000)
+    write(inbox, "Jira.csv", header + "DP,25.3,High,Open\n" * 2, mtime=1_000_000 + day)
+    write(inbox, "Jira (1).csv", header + "DP,25.3,Medium,Open\n", mtime=1_000_000 + day + 60)
+    write(inbox, "Jira (2).csv", header + "Other,1.0,Low,Open\n", mtime=1_000_000 + day + 120)
+    defects.ingest(inbox)
+    found = defects.counts_for("DP", "25.3")
+    assert found["counts"] == (0, 2, 1, 0)
+    assert sorted(map(os.path.basename, found["sources"])) == ["Jira (1).csv", "Jira.csv"]
+    # Same name a day later: a new export, not another page
+    write(inbox, "Jira (3).csv", header + "DP,25.3,Low,Open\n", mtime=1_000_000 + 2 * day)
+    defects.ingest(inbox)
+    assert defects.counts_for("DP", "25.3")["counts"] == (0, 0, 0, 1)
+
+def test_export_names():
+    assert {defects.export_name(n) for n in ("Jira.csv", "jira (2).csv", "JIRA_page3.csv", "jira-part-1.csv")} == {"jira"}
+    assert defects.export_name("jira_2025-08-26.csv") == "jira_2025-08-26"
+    assert defects.export_name("jump2.csv") == "jump2"
+
+def test_refresh_ingests_in_the_background(inbox, results_dir):
+    write(inbox, "jira.csv", JIRA_CSV)
+    assert defects.refresh(inbox)
+    defects.wait(10)
+    assert not defects.refresh(inbox)  # nothing changed since
+    assert defects.counts_for("Data Platform", "25.3")["counts"] == (1, 1, 0, 0)
+    write(inbox, "jira (1).csv", "Project,Fix Version/s,Priority,Status\nData Platform,25.3,Minor,Open\n")
+    assert defects.refresh(inbox)
+    defects.wait(10)
+    assert defects.counts_for("Data Platform", "25.3")["counts"] == (1, 1, 0, 1)
+
+def test_fill_records(inbox, results_dir):
+    write(inbox, "jira.csv", JIRA_CSV)
+    defects.ingest(inbox)
+    records = [{"project_name": "Data Platform", "version": "25.3"},
+               {"project_name": "Data Platform", "version": "25.3", "defects": {"Blocker": 9}},
+               {"project_name": "Nope", "version": "1"}]
+    out = list(defects.fill_records(records))
+    assert out[0]["defects"] == {"Blocker": 1, "Critical": 1, "Major": 0, "Minor": 0}
+    assert out[1]["defects"] == {"Blocker": 9} and "defects" not in out[2]
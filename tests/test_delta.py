@@ -0,0 +1,71 @@
+# tests/test_delta.py — riskradar/delta.py: release comparisons and version ordering
+import pandas as pd
+import pytest
+
+from riskradar import delta
+
+def frame(rows):
+    # (project, tab, version, date, risk, score)
+    return pd.DataFrame([{"project_name": p, "tab": t, "version": v, "assessment_date": d, "risk_name": r,
+                          "category": "Process", "score": s, "weighted_score": s * 1.5, "source_file": f"{p}_{v}_{d}"}
+                         for p, t, v, d, r, s in rows])
+
+def changes(out):
+    return {(r.project_name, r.risk_name): (r.change, r.base_score, r.head_score) for r in out.itertuples()}
+
+def test_versions_sort_numerically():
+    assert sorted(["25.10", "25.9", "25.3", "26.1", "25.3.1"], key=delta.version_key) == \
+        ["25.3", "25.3.1", "25.9", "25.10", "26.1"]
+    assert delta.version_key("2025-08-26") < delta.version_key("2025-10-01")
+
+def test_options_default_to_the_two_newest_versions():
+    index = delta.DeltaIndex(frame([("A", "L10n", v, "2025-08-01", "r", 1) for v in ("25.10", "25.9", "25.8")]))
+    options = index.options("version")
+    assert options == ["25.8", "25.9", "25.10"]
+    assert options[-2:] == ["25.9", "25.10"]  # the UI's Base / Head defaults
+
+def test_added_resolved_escalated_deescalated():
+    index = delta.DeltaIndex(frame([
+        ("A", "L10n", "25.9", "2025-08-01", "kept", 2), ("A", "L10n", "25.9", "2025-08-01", "gone", 6),
+        ("A", "L10n", "25.9", "2025-08-01", "down", 9), ("A", "L10n", "25.9", "2025-08-01", "same", 4),
+        ("A", "L10n", "25.10", "2025-09-01", "kept", 6), ("A", "L10n", "25.10", "2025-09-01", "new", 3),
+        ("A", "L10n", "25.10", "2025-09-01", "down", 4), ("A", "L10n", "25.10", "2025-09-01", "same", 4),
+    ]))
+    out = index.compare("25.9", "25.10")
+    assert changes(out) == {("A", "kept"): ("escalated", 2, 6), ("A", "new"): ("added", 0, 3),
+                            ("A", "gone"): ("resolved", 6, 0), ("A", "down"): ("de-escalated", 9, 4)}
+    assert len(index.compare("25.9", "25.10", unchanged=True)) == 5
+    totals = delta.summarize(out)
+    assert totals["added"] == totals["resolved"] == totals["escalated"] == totals["de-escalated"] == 1
+    assert totals["score_delta"] == (6 - 2) + 3 - 6 + (4 - 9)
+    assert totals["weighted_delta"] == pytest.approx(totals["score_delta"] * 1.5)
+
+def test_only_pairs_assessed_on_both_sides():
+    index = delta.DeltaIndex(frame([
+        ("A", "L10n", "25.9", "2025-08-01", "r", 2), ("A", "L10n", "25.10", "2025-09-01", "r", 4),
+        ("B", "L10n", "25.9", "2025-08-01", "r", 9),                    # B not assessed on 25.10
+        ("C", "L10n", "25.10", "2025-09-01", "r", 9),                   # C not assessed on 25.9
+    ]))
+    assert set(changes(index.compare("25.9", "25.10"))) == {("A", "r")}
+
+def test_each_side_uses_the_newest_snapshot():
+    rows = [("A", "L10n", "25.9", "2025-08-01", "r", 2), ("A", "L10n", "25.9", "2025-08-15", "r", 9),
+            ("A", "L10n", "25.10", "2025-09-01", "r", 6)]
+    assert changes(delta.DeltaIndex(frame(rows)).compare("25.9", "25.10")) == {("A", "r"): ("de-escalated", 9, 6)}
+    # By date, a day holding two versions uses the higher one — 25.10, not 25.9
+    rows = [("A", "L10n", "25.9", "2025-09-01", "r", 9), ("A", "L10n", "25.10", "2025-09-01", "r", 4),
+            ("A", "L10n", "25.8", "2025-08-01", "r", 2)]
+    out = delta.DeltaIndex(frame(rows)).compare("2025-08-01", "2025-09-01", by="date")
+    assert changes(out) == {("A", "r"): ("escalated", 2, 4)}
+
+def test_filters_and_duplicate_rows():
+    index = delta.DeltaIndex(frame([
+        ("A", "L10n", "25.9", "2025-08-01", "r", 2), ("A", "L10n", "25.9", "2025-08-01", "r", 3),  # listed twice: last wins
+        ("A", "L10n", "25.10", "2025-09-01", "r", 6),
+        ("A", "LocOps", "25.9", "2025-08-01", "r", 1), ("A", "LocOps", "25.10", "2025-09-01", "r", 2),
+        ("B", "L10n", "25.9", "2025-08-01", "r", 1), ("B", "L10n", "25.10", "2025-09-01", "r", 2),
+    ]))
+    out = index.compare("25.9", "25.10", projects=["A"], tabs=["L10n"])
+    assert changes(out) == {("A", "r"): ("escalated", 3, 6)}
+    assert len(index.compare("25.9", "25.10")) == 3
+    assert index.compare("25.9", "nope").empty
@@ -0,0 +1,103 @@
+# tests/test_drafts.py — riskradar/drafts.py: tab snapshots, catalog edits and the drafts table
+import datetime, json, os, random, time, zlib
+
+import pytest
+
+from riskradar import drafts
+from riskradar.catalog import key_for, load_catalog
+
+def item(name):
+    return {"category": "Process", "risk_name": name, "question": f"{name}?", "risk_when_true": True,
+            "P": 2, "I": 3, "mitigation": f"fix {name}", "group": "Quality"}
+
+def write_catalog(cat_dir, names, bump=0):
+    path = os.path.join(cat_dir, "l10n.json")
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump({"schema": 1, "version": "t", "items": [item(n) for n in names]}, fh)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump * 1_000_000_000))
+    return load_catalog("L10n")
+
+def filled_state(cat, rnd):
+    """A tab's full widget state (every key, as streamlit_app.py holds it) with random edits."""
+    state = {}
+    for n, key in enumerate(cat.answer_keys):
+        state[key] = rnd.choice(["Yes", "No"])
+        state[cat.p_keys[n]], state[cat.i_keys[n]] = rnd.choice([(cat.P[n], cat.I[n]), (rnd.randint(1, 3), rnd.randint(1, 3))])
+        state[cat.evidence_keys[n]] = rnd.choice(["", "", f"https://jira.example/{n}"])
+    for key in cat.weight_keys:
+        state[key] = rnd.choice([1.0, 1.0, 0.5, 1.7, 2.0])
+    state.update({key_for(cat.tab, "Project"): "Data Platform", key_for(cat.tab, "Version"): "25.3",
+                  key_for(cat.tab, "Assessor"): "", key_for(cat.tab, "adv"): False,
+                  key_for(cat.tab, "rel_status"): "Blocked", key_for(cat.tab, "rel_date"): datetime.date(2025, 9, 1),
+                  key_for(cat.tab, "def_major"): 4, key_for(cat.tab, "def_minor"): 0,
+                  key_for(cat.tab, "def_from"): ("Data Platform", "25.3", ["/x/Jira.csv", "/x/Jira (1).csv"])})
+    return state
+
+def defaults(cat):
+    out = {}
+    for n, key in enumerate(cat.answer_keys):
+        out[key] = "No" if cat.risk_when_true[n] else "Yes"
+        out[cat.p_keys[n]], out[cat.i_keys[n]] = int(cat.P[n]), int(cat.I[n])
+        out[cat.evidence_keys[n]] = ""
+    out.update(dict.fromkeys(cat.weight_keys, 1.0))
+    out.update({key_for(cat.tab, name): drafts.DEFAULTS.get(name, 0) for name in drafts.FIELDS})
+    return out
+
+@pytest.mark.parametrize("tab", ["L10n", "LocOps"])
+def test_round_trip(tab):
+    cat, rnd = load_catalog(tab), random.Random(7)
+    for _ in range(20):
+        state = filled_state(cat, rnd)
+        blob = drafts.encode(cat, state)
+        restored = drafts.decode(cat, blob)
+        # Only non-defaults are stored; over the defaults they give the state back
+        assert {k: v for k, v in {**defaults(cat), **restored}.items() if k in state and state[k] != ""} == \
+               {k: v for k, v in state.items() if v != ""}
+        assert key_for(tab, "Assessor") not in restored and key_for(tab, "def_minor") not in restored
+        assert len(blob) < 400
+
+def test_defaults_encode_to_nothing():
+    cat = load_catalog("L10n")
+    state = {**defaults(cat), key_for("L10n", "adv"): True, key_for("L10n", "rel_date"): datetime.date.today()}
+    assert drafts.decode(cat, drafts.encode(cat, state)) == {}
+    assert drafts.decode(cat, drafts.encode(cat, {})) == {}
+
+def test_catalog_edit_keeps_only_the_fields(tmp_path, monkeypatch):
+    monkeypatch.setenv("RISKRADAR_CATALOG_DIR", str(tmp_path))
+    old = write_catalog(str(tmp_path), ["a", "b"])
+    state = {old.answer_keys[1]: "Yes", old.evidence_keys[0]: "https://x", old.weight_keys[0]: 2.0,
+             key_for("L10n", "Project"): "P", key_for("L10n", "rel_status"): "Ready"}
+    blob = drafts.encode(old, state)
+    assert drafts.decode(old, blob) == state
+    # A question inserted in front: bit positions no longer line up, so item-level parts are dropped
+    new = write_catalog(str(tmp_path), ["c", "a", "b"], bump=1)
+    assert drafts.signature(new) != drafts.signature(old)
+    assert drafts.decode(new, blob) == {key_for("L10n", "Project"): "P", key_for("L10n", "rel_status"): "Ready"}
+    # Same layout re-saved (e.g. a reworded question): everything still applies
+    same = write_catalog(str(tmp_path), ["a", "b"], bump=2)
+    assert same is not old and drafts.decode(same, blob) == state
+
+@pytest.mark.parametrize("blob", [b"", b"not zlib", zlib.compress(b"[1, 2]"), zlib.compress(json.dumps({"f": drafts.FORMAT}).encode()),
+                                  zlib.compress(json.dumps({"f": drafts.FORMAT + 1}).encode())])
+def test_unreadable_snapshots_decode_to_nothing(blob):
+    assert drafts.decode(load_catalog("L10n"), blob) == {}
+
+def test_strings_are_shared_across_decodes():
+    cat = load_catalog("L10n")
+    blob = drafts.encode(cat, {cat.evidence_keys[0]: "https://jira.example/" + "ABC-1"})
+    a, b = drafts.decode(cat, blob), drafts.decode(cat, blob)
+    assert a[cat.evidence_keys[0]] is b[cat.evidence_keys[0]]
+
+def test_store(results_dir):
+    draft = drafts.new_id()
+    drafts.save(draft, "L10n", b"one")
+    drafts.save(draft, "LocOps", b"two")
+    drafts.save(draft, "L10n", b"three")  # upsert, one row per tab
+    drafts.save("other", "L10n", b"x")
+    assert drafts.load(draft) == {"L10n": b"three", "LocOps": b"two"}
+    assert drafts.load("missing") == {}
+    drafts._connect().execute("UPDATE drafts SET updated_at=? WHERE draft_id='other'",
+                              (time.time() - (drafts.MAX_AGE_DAYS + 1) * 86400,))
+    assert drafts.prune() == 1
+    assert drafts.load("other") == {} and len(drafts.load(draft)) == 2
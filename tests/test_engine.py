@@ -0,0 +1,131 @@
+# tests/test_engine.py — riskradar/engine.py: vectorized batch scoring vs the row-by-row loop
+import random
+
+import pandas as pd
+import pytest
+
+from riskradar import engine, rules
+from riskradar.catalog import TABS, load_catalog
+
+def random_record(tab, rnd, n):
+    items = load_catalog(tab).items
+    return {
+        "tab": tab, "project_name": f"Proj{n % 7}", "version": "25.3", "assessment_date": "2025-08-26",
+        "assessor": "test",
+        "answers": {it[1]: rnd.choice(["Yes", "No"]) for it in items if rnd.random() < 0.8},
+        "P": {it[1]: rnd.randint(1, 3) for it in items if rnd.random() < 0.3},
+        "I": {it[1]: rnd.randint(1, 3) for it in items if rnd.random() < 0.3},
+        "evidence": {it[1]: f"https://jira.example/{n}" for it in items if rnd.random() < 0.2},
+        "weights": {c: rnd.randint(5, 20) / 10 for c in load_catalog(tab).weight_categories if rnd.random() < 0.5},
+        "release_status": rnd.choice(rules.RELEASE_STATUSES),
+        "release_url": f"https://release.example/{n}",
+        "defects": {s: rnd.randint(0, 3) for s in rules.SEVERITIES},
+        "links": {"checked": rnd.randint(3, 6), "dead": [f"https://dead.example/{n}/{k}" for k in range(rnd.randint(0, 3))]},
+    }
+
+@pytest.mark.parametrize("tab", TABS)
+def test_batch_matches_row_by_row(tab):
+    rnd = random.Random(3)
+    records = [random_record(tab, rnd, n) for n in range(300)]
+    rows, summary = engine.score_batch(tab, **engine.records_to_arrays(tab, records))
+    expected = pd.DataFrame([row for r in records for row in engine.score_record(r)], columns=rules.RESULT_COLUMNS)
+    assert rows.to_csv(index=False) == expected.to_csv(index=False)
+
+    per_record = [engine.score_record(r) for r in records]
+    assert summary["risks"].tolist() == [len(r) for r in per_record]
+    assert summary["rating"].tolist() == [
+        rules.score_to_rating(sum(x["score"] for x in r), max((x["score"] for x in r), default=0)) for r in per_record]
+
+def test_stream_keeps_input_order_across_tabs():
+    rnd = random.Random(4)
+    records = [random_record(TABS[n % len(TABS)], rnd, n) for n in range(40)]
+    for n, r in enumerate(records):
+        r["project_name"] = f"P{n}"
+    summaries = pd.concat([s for _, s in engine.score_stream(records, chunk_size=16)])
+    assert summaries["project_name"].tolist() == [f"P{n}" for n in range(40)]
+
+def test_csv_records(tmp_path):
+    tab = TABS[0]
+    name = load_catalog(tab).names[0]
+    path = tmp_path / "answers.csv"
+    path.write_text(f"tab,project_name,{name},P:{name},I:{name},Blocker\n{tab},DP,"
+                    f"{'Yes' if load_catalog(tab).risk_when_true[0] else 'No'},3,3,2\n", encoding="utf-8")
+    rec, = engine.iter_records(str(path))
+    rows = engine.score_record(rec)
+    assert (rows[0]["risk_name"], rows[0]["score"]) == (name, 9)
+    assert rows[-1]["risk_name"] == rules.DEFECT_RISK[1]
+
+@pytest.mark.parametrize("change, message", [
+    ({"P": 7}, "P of"), ({"I": 0}, "I of"), ({"P": "high"}, "P of"), ({"I": 2.5}, "I of"),
+    ({"weights": {"Process": 5}}, "weight of"), ({"defects": {"Major": -1}}, "Major"),
+    ({"release_status": "blocked"}, "release_status"),
+    ({"links": {"checked": 1, "dead": ["https://a", "https://b"]}}, "links.checked"),
+])
+def test_values_the_ui_cannot_produce_are_rejected(change, message):
+    tab = TABS[0]
+    name = load_catalog(tab).names[0]
+    rec = {"tab": tab, "project_name": "DP", "version": "25.3"}
+    for key, value in change.items():
+        rec[key] = {name: value} if key in ("P", "I") else value
+    with pytest.raises(ValueError, match=f"{tab} record DP 25.3: {message}"):
+        engine.records_to_arrays(tab, [rec])
+    with pytest.raises(ValueError, match=message):
+        engine.score_record(rec)
+
+@pytest.mark.parametrize("change, message", [
+    ({"answers": "maybe"}, "answer to"), ({"answers": 1}, "answer to"),
+    ({"answers": {"no such risk": "Yes"}}, "answers has 'no such risk', which is not a L10n question"),
+    ({"P": {"no such risk": 2}}, "P has 'no such risk'"), ({"evidence": {"typo": "x"}}, "evidence has 'typo'"),
+    ({"weights": {"Procss": 1.0}}, "weights has 'Procss', which is not a L10n category"),
+])
+def test_answers_and_names_the_catalog_does_not_have_are_rejected(change, message):
+    tab = "L10n"
+    name = load_catalog(tab).names[0]
+    rec = {"tab": tab, "project_name": "DP", "version": "25.3"}
+    for key, value in change.items():
+        rec[key] = value if isinstance(value, dict) else {name: value}
+    with pytest.raises(ValueError, match=f"{tab} record DP 25.3: {message}"):
+        engine.records_to_arrays(tab, [rec])
+    with pytest.raises(ValueError, match=message):
+        engine.score_record(rec)
+
+def test_answers_and_tabs_ignore_case():
+    tab = TABS[0]
+    catalog = load_catalog(tab)
+    risky = {n: "YES" if rwt else False for n, rwt in zip(catalog.names, catalog.risk_when_true)}
+    canonical = {n: "Yes" if rwt else "No" for n, rwt in zip(catalog.names, catalog.risk_when_true)}
+    odd = {"tab": f" {tab.lower()} ", "project_name": "DP", "answers": risky}
+    rows, summary = next(engine.score_stream([odd, {"tab": tab, "project_name": "DP", "answers": canonical}]))
+    assert summary["tab"].tolist() == [tab, tab] and summary["risks"].iloc[0] == summary["risks"].iloc[1] >= len(catalog.names)
+    assert engine.score_record(odd) == engine.score_record({"tab": tab, "project_name": "DP", "answers": canonical})
+
+@pytest.mark.parametrize("tab", ["Localization", "", None])
+def test_records_without_a_known_tab_are_rejected(tab):
+    records = [{"tab": TABS[0], "project_name": "A"}, {"tab": tab, "project_name": "B"}]
+    if tab is None:
+        del records[1]["tab"]
+    with pytest.raises(ValueError, match="record B: tab must be one of L10n, LocOps, General"):
+        list(engine.score_stream(records))
+    with pytest.raises(ValueError, match="tab must be one of"):
+        engine.score_record(records[1])
+
+def test_csv_columns_must_be_questions(tmp_path):
+    path = tmp_path / "answers.csv"
+    path.write_text("tab,project_name,Not a question\nL10n,DP,yes\n", encoding="utf-8")
+    with pytest.raises(ValueError, match="answers has 'Not a question'"):
+        list(engine.score_stream(engine.iter_records(str(path))))
+
+def test_cli_exit_status(tmp_path):
+    from riskradar import cli
+    path = tmp_path / "in.jsonl"
+    path.write_text('{"tab": "LocOps"}\n', encoding="utf-8")
+    assert cli.main(["score", str(path), "-o", str(tmp_path / "out.csv")]) == 0
+    path.write_text('{"tab": "locops", "answers": {"x": "Yes"}}\n', encoding="utf-8")
+    assert cli.main(["score", str(path), "-o", str(tmp_path / "out.csv")]) == 2
+
+def test_cli_reports_bad_records(tmp_path, capsys):
+    from riskradar import cli
+    path = tmp_path / "in.jsonl"
+    path.write_text('{"tab": "%s", "P": {"%s": 21}}\n' % (TABS[0], load_catalog(TABS[0]).names[0]), encoding="utf-8")
+    assert cli.main(["score", str(path), "-o", str(tmp_path / "out.csv")]) == 2
+    assert "must be 1, 2 or 3, got 21" in capsys.readouterr().err
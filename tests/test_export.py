@@ -0,0 +1,92 @@
+# tests/test_export.py — riskradar/export.py: streamed bulk export in every format
+import csv, os
+
+import pytest
+
+from riskradar import export
+from riskradar.export import EXPORT_COLUMNS
+from riskradar.rules import RESULT_COLUMNS
+
+APP_COLUMNS = ["project_name", "version", "assessment_date", "tab", "category", "risk_name", "likelihood",
+               "impact", "score", "mitigation", "assessor", "notes"]  # what app.py saves
+
+def save(out_dir, name, header, rows):
+    with open(os.path.join(out_dir, name), "w", newline="", encoding="utf-8") as fh:
+        w = csv.writer(fh)
+        w.writerow(header)
+        w.writerows(rows)
+
+def result_row(project, date, tab, risk, score):
+    row = dict.fromkeys(RESULT_COLUMNS, "")
+    row.update(project_name=project, version="1.0", assessment_date=date, tab=tab, category="Process",
+               risk_name=risk, possibility=1, impact=score, score=score, weighted_score=score)
+    return [row[c] for c in RESULT_COLUMNS]
+
+@pytest.fixture
+def saved(results_dir):
+    save(results_dir, "A_1.0_2025-08-26_L10n.csv", RESULT_COLUMNS,
+         [result_row("A", "2025-08-26", "L10n", "r1", 4), result_row("A", "2025-08-26", "L10n", "r2", 6)])
+    save(results_dir, "B_1.0_2025-09-02_LocOps.csv", RESULT_COLUMNS, [result_row("B", "2025-09-02", "LocOps", "r1", 9)])
+    save(results_dir, "C_2.0_2025-09-10.csv", APP_COLUMNS,
+         [["C", "2.0", "2025-09-10", "General", "Process", "FTP used", 3, 2, 6, "use SFTP", "QA", "vendor, see ticket"]])
+    return results_dir
+
+def rows(**kwargs):
+    return [r for chunk in export.iter_chunks(**kwargs) for r in chunk]
+
+def test_both_saved_schemas_map_to_the_export_columns(saved):
+    out = {r[EXPORT_COLUMNS.index("project_name")]: dict(zip(EXPORT_COLUMNS, r)) for r in rows()}
+    assert all(len(r) == len(EXPORT_COLUMNS) for r in rows())
+    c = out["C"]
+    assert (c["possibility"], c["impact"], c["score"], c["assessor"]) == ("3", "2", "6", "QA")
+    assert c["notes"] == "vendor, see ticket" and c["weighted_score"] == ""
+    assert out["A"]["notes"] == "" and out["A"]["score"] == "6"
+
+def test_filters(saved):
+    assert {r[3] for r in rows(tabs=["LocOps", "General"])} == {"LocOps", "General"}
+    assert [r[0] for r in rows(date_from="2025-09-01", date_to="2025-09-05")] == ["B"]
+    assert rows(date_from="2026-01-01") == []
+
+def test_chunks_are_bounded(saved):
+    sizes = [len(c) for c in export.iter_chunks(chunk_rows=2)]
+    assert sizes == [2, 2]
+
+def test_csv_keeps_notes(saved, tmp_path):
+    path = str(tmp_path / "all.csv")
+    assert export.export(path, chunk_rows=1) == 4
+    with open(path, newline="", encoding="utf-8") as fh:
+        out = list(csv.DictReader(fh))
+    assert list(out[0]) == EXPORT_COLUMNS
+    assert [r["notes"] for r in out] == ["", "", "", "vendor, see ticket"]
+    assert b"".join(export.iter_csv_bytes(export.iter_chunks())) == open(path, "rb").read()
+
+def test_parquet(saved, tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    path = str(tmp_path / "all.parquet")
+    assert export.export(path, chunk_rows=2) == 4
+    table = pq.read_table(path)
+    assert table.column_names == EXPORT_COLUMNS
+    assert table.column("score").to_pylist() == [4.0, 6.0, 9.0, 6.0]
+    assert table.column("weighted_score").to_pylist()[-1] is None
+    assert table.column("notes").to_pylist()[-1] == "vendor, see ticket"
+
+def test_xlsx(saved, tmp_path):
+    openpyxl = pytest.importorskip("openpyxl")
+    path = str(tmp_path / "all.xlsx")
+    assert export.export(path) == 4
+    sheet = openpyxl.load_workbook(path, read_only=True)["assessments"]
+    values = list(sheet.values)
+    assert list(values[0]) == EXPORT_COLUMNS and values[-1][-1] == "vendor, see ticket"
+    assert values[1][EXPORT_COLUMNS.index("score")] == 4
+
+def test_failed_export_leaves_no_file(saved, tmp_path, monkeypatch):
+    path = str(tmp_path / "all.csv")
+    def broken(path, chunks):
+        open(path, "w").close()
+        raise OSError("disk full")
+    monkeypatch.setitem(export.WRITERS, "csv", broken)
+    with pytest.raises(OSError):
+        export.export(path)
+    assert os.listdir(tmp_path) == ["results"]
+    with pytest.raises(ValueError, match="unsupported export format"):
+        export.export(str(tmp_path / "all.json"))
@@ -0,0 +1,120 @@
+# tests/test_linkcheck.py — riskradar/linkcheck.py against the stand-in server of benchmarks/bench_linkcheck.py
+import asyncio, os, socket, subprocess, sys, time
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from riskradar import engine, linkcheck, rules
+from riskradar.catalog import load_catalog
+
+BENCH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "bench_linkcheck.py")
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+@pytest.fixture(scope="module")
+def server():
+    port = free_port()
+    proc = subprocess.Popen([sys.executable, BENCH, "--serve", str(port), "0", "2"], stdout=subprocess.PIPE, text=True)
+    try:
+        assert proc.stdout.readline().strip() == "ready"
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        proc.kill()
+        proc.wait()
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    linkcheck.clear()
+    yield
+    linkcheck.wait(10)
+
+def test_extract():
+    assert linkcheck.extract("see https://a.example/x, and (https://b.example/y).", None, "https://a.example/x") == \
+        ["https://a.example/x", "https://b.example/y"]
+
+def test_head_falls_back_to_get(server):
+    found = linkcheck.check([f"{server}/ok/1", f"{server}/nohead/1", f"{server}/dead/1"])
+    assert [(r.ok, r.status) for r in found.values()] == [(True, 200), (True, 200), (False, 404)]
+    assert found[f"{server}/dead/1"].detail == "HTTP 404 Not Found"
+
+@pytest.mark.parametrize("code, ok", [(401, True), (403, True), (407, True), (429, True), (410, False), (500, False)])
+def test_reachable_status_codes(server, code, ok):
+    r = linkcheck.check([f"{server}/status/{code}/x"])[f"{server}/status/{code}/x"]
+    assert (r.ok, r.status) == (ok, code)
+
+def test_timeouts_and_unreachable_hosts(server):
+    found = linkcheck.check([f"{server}/slow/1", f"http://127.0.0.1:{free_port()}/x"], timeout=0.3)
+    slow, closed = found.values()
+    assert (slow.ok, slow.status, slow.detail) == (False, 0, "timed out")
+    assert (closed.ok, closed.status) == (False, 0) and "Connect" in closed.detail
+
+def test_results_expire_after_their_ttl(server, monkeypatch):
+    ok, dead = f"{server}/ok/ttl", f"{server}/dead/ttl"
+    linkcheck.check([ok, dead])
+    assert set(linkcheck.cached([ok, dead])) == {ok, dead}
+    checked = linkcheck.stats()["checked"]
+    monkeypatch.setattr(linkcheck, "TTL_FAILED", 0.05)  # dead links are retried sooner than reachable ones
+    time.sleep(0.1)
+    assert set(linkcheck.cached([ok, dead])) == {ok}
+    linkcheck.check([ok, dead])
+    assert linkcheck.stats()["checked"] == checked + 1
+    monkeypatch.setattr(linkcheck, "TTL_OK", 0.05)
+    time.sleep(0.1)
+    assert linkcheck.cached([ok, dead]) == {}
+
+def test_schedule_and_lookup_deduplicate(server):
+    a, b = f"{server}/ok/dedup", f"{server}/dead/dedup"
+    checked = linkcheck.stats()["checked"]
+    assert linkcheck.lookup([a, b, a]) == {a: None, b: None}
+    assert linkcheck.schedule([a, b]) == 0  # already in flight
+    assert linkcheck.wait(10)
+    found = linkcheck.lookup([a, b])
+    assert found[a].ok and not found[b].ok
+    assert linkcheck.schedule([a, b]) == 0  # fresh in the cache
+    assert linkcheck.stats()["checked"] == checked + 2
+
+def test_idle_host_pools_are_closed():
+    async def run():
+        pools, clients = linkcheck._Pools(2, 1.0, size=2), {}
+        for host in "abc":
+            async with pools.use(host) as (_, clients[host]):
+                pass
+        assert list(pools.pools) == ["b", "c"] and clients["a"].is_closed
+        async with pools.use("b"), pools.use("d") as (_, clients["d"]), pools.use("e"):
+            assert list(pools.pools) == ["b", "d", "e"]  # pools in use are kept past the limit
+            assert clients["c"].is_closed and not clients["b"].is_closed
+        async with pools.use("f"):
+            assert list(pools.pools) == ["e", "f"] and clients["d"].is_closed
+        await pools.close()
+        assert pools.pools == {}
+    asyncio.run(run())
+
+def test_shutdown_closes_the_worker(server):
+    linkcheck.schedule([f"{server}/ok/shutdown"])
+    assert linkcheck.wait(10)
+    worker = linkcheck._worker
+    clients = [client for _, client in worker.pools.pools.values()]
+    assert clients and not any(c.is_closed for c in clients)
+    linkcheck.shutdown()
+    assert linkcheck._worker is None and all(c.is_closed for c in clients)
+    linkcheck.clear()
+    assert linkcheck.schedule([f"{server}/ok/shutdown"]) == 1 and linkcheck.wait(10)
+    assert linkcheck.cached([f"{server}/ok/shutdown"])[f"{server}/ok/shutdown"].ok
+
+def test_batch_scoring_adds_the_evidence_risk(server):
+    tab = "L10n"
+    names = load_catalog(tab).names
+    record = {"tab": tab, "project_name": "DP", "version": "25.3",
+              "evidence": {names[0]: f"{server}/dead/a {server}/ok/a", names[1]: f"{server}/dead/b"},
+              "release_url": f"{server}/nohead/a"}
+    rec, = linkcheck.fill_records([dict(record)])
+    assert rec["links"] == {"checked": 4, "dead": [f"{server}/dead/a", f"{server}/dead/b"]}
+    row = engine.score_record(rec)[-1]
+    assert (row["risk_name"], row["possibility"], row["impact"]) == (rules.EVIDENCE_RISK[1], 3, rules.EVIDENCE_IMPACT)
+    assert row["evidence"] == f"{server}/dead/a {server}/dead/b"
+    rows, _ = engine.score_batch(tab, **engine.records_to_arrays(tab, [rec]))
+    assert rows.iloc[-1].to_dict() == row
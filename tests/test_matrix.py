@@ -0,0 +1,61 @@
+# tests/test_matrix.py — riskradar/matrix.py: bincount partials vs a plain loop, filters and drilldown
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from riskradar import matrix
+
+def frame(n=600, seed=5):
+    rnd = random.Random(seed)
+    return pd.DataFrame({
+        "project_name": [rnd.choice(["A", "B", "C"]) for _ in range(n)],
+        "assessment_date": [f"2025-0{rnd.randint(6, 9)}-1{rnd.randint(0, 9)}" for _ in range(n)],
+        "tab": [rnd.choice(["L10n", "LocOps", "General"]) for _ in range(n)],
+        "category": pd.Categorical([rnd.choice(["Process", "Tooling", "Release"]) for _ in range(n)]),
+        "risk_name": [f"r{k}" for k in range(n)],
+        "possibility": [rnd.choice([1, 2, 3, 3, "", "x"]) for _ in range(n)],  # hand-edited cells are skipped
+        "impact": [rnd.choice([1, 2, 3]) for _ in range(n)],
+    })
+
+def loop_counts(df, tabs=None, categories=None, projects=None, date_from=None, date_to=None):
+    grid = np.zeros((3, 3), dtype=int)
+    for r in df.itertuples():
+        if r.possibility not in (1, 2, 3) or (tabs and r.tab not in tabs) or (categories and r.category not in categories) \
+                or (projects and r.project_name not in projects) or (date_from and r.assessment_date < date_from) \
+                or (date_to and r.assessment_date > date_to):
+            continue
+        grid[r.possibility - 1, r.impact - 1] += 1
+    return grid
+
+@pytest.mark.parametrize("filters", [
+    {}, {"tabs": ["L10n"]}, {"categories": ["Tooling", "Release"], "projects": ["B"]},
+    {"date_from": "2025-07-01", "date_to": "2025-08-15"}, {"tabs": ["LocOps"], "date_to": "2025-06-30"},
+    {"projects": ["nobody"]},
+])
+def test_counts_match_a_plain_loop(filters):
+    df = frame()
+    index = matrix.MatrixIndex(df)
+    assert (index.counts(**filters) == loop_counts(df, **filters)).all()
+    assert len(index) == loop_counts(df).sum()
+
+def test_drilldown_rows_are_the_cell():
+    df = frame()
+    index = matrix.MatrixIndex(df)
+    rows = index.rows(3, 2, tabs=["General"], projects=["A", "C"])
+    assert len(rows) == index.counts(tabs=["General"], projects=["A", "C"])[2, 1]
+    assert set(rows["tab"]) == {"General"} and set(rows["project_name"]) <= {"A", "C"}
+    assert (rows["possibility"] == 3).all() and (rows["impact"] == 2).all()
+
+def test_options_and_empty_frames():
+    index = matrix.MatrixIndex(frame())
+    assert index.options("project_name") == ["A", "B", "C"]
+    empty = matrix.MatrixIndex(frame().iloc[:0])
+    assert len(empty) == 0 and empty.counts().sum() == 0 and empty.rows(1, 1).empty
+
+def test_index_is_reused_per_frame():
+    df = frame(50)
+    assert matrix.index_for(df) is matrix.index_for(df)
+    assert matrix.index_for(df.copy()) is not matrix.index_for(df)
+    assert matrix.as_grid(np.arange(9).reshape(3, 3)) == ((0, 1, 2), (3, 4, 5), (6, 7, 8))
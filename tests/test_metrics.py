@@ -0,0 +1,69 @@
+# tests/test_metrics.py — riskradar/metrics.py: no-op when off, rolling histograms, Prometheus and JSONL output
+import json, logging, socket, urllib.error, urllib.request
+
+import pytest
+
+from riskradar import metrics
+
+@pytest.fixture
+def fresh(monkeypatch):
+    """Metrics module state as at import with nothing configured; restored afterwards."""
+    for name, value in (("_enabled", False), ("_events", None), ("_server", None), ("_hists", {})):
+        monkeypatch.setattr(metrics, name, value)
+    yield metrics
+    if metrics._server is not None:
+        metrics._server.shutdown()
+        metrics._server.server_close()
+    for handler in logging.getLogger("riskradar.metrics.events").handlers[:]:
+        handler.close()
+        logging.getLogger("riskradar.metrics.events").removeHandler(handler)
+
+def test_disabled_spans_are_a_shared_noop(fresh):
+    assert fresh.span("render", "L10n", "s") is fresh.NOOP
+    with fresh.span("render", "L10n", "s"):
+        pass
+    assert fresh._hists == {}
+
+def test_rolling_histogram_buckets_and_window():
+    h = metrics.RollingHistogram(window=60, slots=6)
+    h.observe(0.001, now=1000)   # on a bucket bound: counted in it (le)
+    h.observe(0.3, now=1005)
+    h.observe(99.0, now=1055)    # past the last bound: +Inf
+    counts, total = h.snapshot(now=1055)
+    assert counts[metrics.BUCKETS.index(0.001)] == 1 and counts[metrics.BUCKETS.index(0.5)] == 1 and counts[-1] == 1
+    assert total == pytest.approx(99.301)
+    # A minute later the first two observations have left the window
+    counts, total = h.snapshot(now=1065)
+    assert sum(counts) == 1 and total == pytest.approx(99.0)
+    h.observe(0.01, now=1061)  # recycles the slot the first observations lived in
+    assert sum(h.snapshot(now=1061)[0]) == 2
+
+def test_prometheus_text(fresh):
+    fresh.observe("render", 0.004, tab='L"10n')
+    fresh.observe("render", 0.2, tab='L"10n')
+    text = fresh.render_prometheus()
+    assert "# TYPE riskradar_phase_seconds histogram" in text
+    labels = 'phase="render",tab="L\\"10n"'
+    assert f'riskradar_phase_seconds_bucket{{{labels},le="0.005"}} 1' in text
+    assert f'riskradar_phase_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"riskradar_phase_seconds_count{{{labels}}} 2" in text
+    assert f"riskradar_phase_seconds_sum{{{labels}}} 0.204000" in text
+
+def test_configured_endpoint_and_events(fresh, tmp_path):
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    path = tmp_path / "metrics" / "metrics.jsonl"
+    fresh.configure(port=port, path=str(path))
+    assert fresh.enabled()
+    with fresh.span("save", "LocOps", "session-1"):
+        pass
+    with pytest.raises(RuntimeError), fresh.span("save", "LocOps", "session-2"):
+        raise RuntimeError("boom")
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as resp:
+        assert resp.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+        assert 'riskradar_phase_seconds_count{phase="save",tab="LocOps"} 2' in resp.read().decode()
+    with pytest.raises(urllib.error.HTTPError):
+        urllib.request.urlopen(f"http://127.0.0.1:{port}/other")
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(e["phase"], e["session"], e["error"]) for e in events] == [("save", "session-1", False), ("save", "session-2", True)]
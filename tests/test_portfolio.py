@@ -0,0 +1,72 @@
+# tests/test_portfolio.py — riskradar/portfolio.py: incremental ingest and portfolio views
+import csv, os
+
+from riskradar import portfolio, rules
+from riskradar.rules import RESULT_COLUMNS
+
+def write_csv(out_dir, name, rows, header=RESULT_COLUMNS):
+    # Like the store: write elsewhere, then rename into place
+    tmp = os.path.join(out_dir, f".tmp_{name}")
+    with open(tmp, "w", newline="", encoding="utf-8") as fh:
+        w = csv.writer(fh)
+        w.writerow(header)
+        w.writerows(rows)
+    os.replace(tmp, os.path.join(out_dir, name))
+
+def row(project, risk, P, I, tab="L10n", category="Process"):
+    values = {"project_name": project, "version": "25.3", "assessment_date": "2025-08-26", "tab": tab,
+              "category": category, "risk_name": risk, "possibility": P, "impact": I, "score": P * I,
+              "weighted_score": P * I}
+    return [values.get(c, "") for c in RESULT_COLUMNS]
+
+def test_only_new_or_changed_files_are_reingested(results_dir):
+    write_csv(results_dir, "A.csv", [row("A", "r1", 3, 3), row("A", "r2", 1, 1)])
+    write_csv(results_dir, "B.csv", [row("B", "r1", 2, 2)])
+    frame = portfolio.load_portfolio(results_dir)
+    assert sorted(frame["source_file"].astype(str)) == ["A.csv", "A.csv", "B.csv"]
+
+    write_csv(results_dir, "B.csv", [row("B", "r1", 2, 3), row("B", "r3", 1, 2)])
+    os.unlink(os.path.join(results_dir, "A.csv"))
+    frame = portfolio.load_portfolio(results_dir)
+    assert sorted(frame["source_file"].astype(str)) == ["B.csv", "B.csv"]
+    assert sorted(frame["score"].tolist()) == [2, 6]
+
+def test_files_edited_in_place_are_reingested(results_dir):
+    path = os.path.join(results_dir, "A.csv")
+    write_csv(results_dir, "A.csv", [row("A", "r1", 3, 3)])
+    portfolio.load_portfolio(results_dir)
+    assert len(portfolio.load_portfolio(results_dir)) == 1  # warm: served from memory
+    with open(path, "a", newline="", encoding="utf-8") as fh:  # no rename: the folder mtime stays
+        csv.writer(fh).writerow(row("A", "r2", 1, 2))
+    frame = portfolio.load_portfolio(results_dir)
+    assert frame["risk_name"].astype(str).tolist() == ["r1", "r2"]
+    assert portfolio.load_portfolio(results_dir) is frame
+
+def test_cache_survives_a_new_process(results_dir):
+    write_csv(results_dir, "A.csv", [row("A", "r1", 3, 3)])
+    first = portfolio.load_portfolio(results_dir)
+    portfolio._memo.clear()  # as if the server restarted: read back from results/.portfolio/
+    again = portfolio.load_portfolio(results_dir)
+    assert again["risk_name"].astype(str).tolist() == first["risk_name"].astype(str).tolist()
+
+def test_starter_likelihood_column_is_read_as_possibility(results_dir):
+    header = [c if c != "possibility" else "likelihood" for c in RESULT_COLUMNS]
+    write_csv(results_dir, "Old.csv", [row("Old", "r1", 2, 3)], header=header)
+    frame = portfolio.load_portfolio(results_dir)
+    assert frame["possibility"].tolist() == [2]
+
+def test_views(results_dir):
+    write_csv(results_dir, "A.csv", [row("A", "r1", 3, 3), row("A", "r2", 2, 3, category="Release")])
+    write_csv(results_dir, "B.csv", [row("B", "r1", 3, 3), row("B", "r4", 1, 2)])
+    frame = portfolio.load_portfolio(results_dir)
+    runs = portfolio.assessments(frame).set_index("project_name")
+    assert runs.loc["A", "rating"] == "High" and runs.loc["B", "total_score"] == 11
+    flags = portfolio.top_red_flags(frame)
+    assert flags["risk_name"].astype(str).tolist() == ["r1", "r2"]
+    assert flags.iloc[0]["assessments"] == 2
+    assert portfolio.category_totals(frame).loc["Release", "score"] == 6
+
+def test_red_flags_follow_the_app_rule(results_dir, monkeypatch):
+    write_csv(results_dir, "A.csv", [row("A", "r1", 3, 3), row("A", "r2", 2, 3)])
+    monkeypatch.setattr(rules, "RED_FLAG_SCORE", 9)
+    assert portfolio.top_red_flags(portfolio.load_portfolio(results_dir))["risk_name"].astype(str).tolist() == ["r1"]
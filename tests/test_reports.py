@@ -0,0 +1,78 @@
+# tests/test_reports.py — riskradar/reports.py: which assessment each report uses, rendered HTML/PDF, reuse
+import os
+
+import pandas as pd
+import pytest
+
+from riskradar import reports, rules
+
+def frame(runs):
+    # (project, tab, version, date, [(risk, P, I), ...])
+    return pd.DataFrame([{"project_name": p, "tab": t, "version": v, "assessment_date": d, "category": f"C{n % 2}",
+                          "risk_name": r, "possibility": P, "impact": I, "score": P * I, "weighted_score": P * I * 1.5,
+                          "mitigation": f"fix {r}", "source_file": f"{p}_{v}_{d}_{t}.csv"}
+                         for p, t, v, d, risks in runs for n, (r, P, I) in enumerate(risks)])
+
+def picked(jobs):
+    return {(j["project"], s["tab"]): (j["version"], s["date"]) for j in jobs for s in j["sections"]}
+
+def test_newest_version_is_numeric():
+    df = frame([("Alpha", "L10n", "25.9", "2025-08-26", [("a", 1, 1)]),
+                ("Alpha", "L10n", "25.10", "2025-08-26", [("a", 2, 2)]),
+                ("Alpha", "LocOps", "25.10", "2025-08-20", [("b", 1, 2)]),
+                ("Beta", "L10n", "25.10", "2025-09-01", [("c", 1, 1)]),
+                ("Beta", "L10n", "25.9", "2025-09-03", [("c", 3, 3)])])
+    assert picked(reports.build_jobs(df)) == {("Alpha", "L10n"): ("25.10", "2025-08-26"),
+                                              ("Alpha", "LocOps"): ("25.10", "2025-08-20"),
+                                              ("Beta", "L10n"): ("25.10", "2025-09-01")}
+    assert picked(reports.build_jobs(df, version="25.9")) == {("Alpha", "L10n"): ("25.9", "2025-08-26"),
+                                                              ("Beta", "L10n"): ("25.9", "2025-09-03")}
+
+def test_newest_assessment_per_tab_and_filters():
+    df = frame([("A", "L10n", "1.0", "2025-08-01", [("old", 3, 3)]),
+                ("A", "L10n", "1.0", "2025-08-02", [("new", 1, 2)]),
+                ("A", "General", "1.0", "2025-07-01", [("g", 2, 1)]),
+                ("B", "L10n", "1.0", "2025-08-01", [("b", 1, 1)])])
+    assert picked(reports.build_jobs(df))[("A", "L10n")] == ("1.0", "2025-08-02")
+    assert picked(reports.build_jobs(df, projects=["A"], tabs=["General"])) == {("A", "General"): ("1.0", "2025-07-01")}
+    assert reports.build_jobs(df, version="9.9") == []
+
+def test_section_contents():
+    risks = [(f"r{k}", 3, 3 if k < 3 else 2) for k in range(7)] + [("low", 1, 1)]
+    job, = reports.build_jobs(frame([("A", "L10n", "1.0", "2025-08-01", risks)]))
+    s, = job["sections"]
+    scores = [P * I for _, P, I in risks]
+    assert (s["total"], s["max_cell"], s["risks"]) == (sum(scores), 9, 8)
+    assert s["rating"] == rules.score_to_rating(sum(scores), 9) and s["high"] == 3
+    assert [f[0] for f in s["red_flags"]] == ["r0", "r1", "r2", "r3", "r4"]  # top 5, highest first
+    assert s["grid"][2][2] == 3 and s["grid"][2][1] == 4 and s["grid"][0][0] == 1
+    assert s["radar"] == (["C0", "C1"], [9 * 2 + 6 * 2, 9 + 6 * 2 + 1])
+
+def test_html_reports_and_reuse(tmp_path):
+    df = frame([("A <&>", "L10n", "1.0", "2025-08-01", [("r", 3, 3)]),
+                ("A <&>", "LocOps", "1.0", "2025-08-01", [("r", 3, 3)]),
+                ("B", "L10n", "1.0", "2025-08-01", [("r", 3, 3)])])
+    out = str(tmp_path / "results")
+    r = reports.generate(fmt="html", workers=1, out_dir=out, frame=df)
+    assert (r["reports"], r["written"], r["unchanged"]) == (2, 2, 0)
+    assert r["charts"] == r["charts_rendered"] == 4  # B's L10n charts are the same as A's
+    name = reports.report_name({"project": "A <&>", "version": "1.0"}, "html")
+    assert name == "A__1.0.html"
+    page = open(os.path.join(r["dest"], name), encoding="utf-8").read()
+    assert "<h1>A &lt;&amp;&gt; — 1.0</h1>" in page and page.count("<section>") == 2
+    assert page.count('<img src="data:image/png;base64,') == 4 and "fix r" in page
+
+    again = reports.generate(fmt="html", workers=1, out_dir=out, frame=df)
+    assert (again["written"], again["unchanged"], again["charts_rendered"]) == (0, 2, 0)
+    changed = df.copy()
+    changed.loc[changed["project_name"] == "B", ["impact", "score"]] = (1, 3)
+    again = reports.generate(fmt="html", workers=1, out_dir=out, frame=changed)
+    assert (again["written"], again["unchanged"], again["charts_rendered"]) == (1, 1, 2)
+
+def test_pdf_and_bad_format(tmp_path):
+    df = frame([("A", "L10n", "1.0", "2025-08-01", [("r", 2, 3)])])
+    r = reports.generate(str(tmp_path / "out"), fmt="pdf", workers=1, out_dir=str(tmp_path / "results"), frame=df)
+    with open(os.path.join(r["dest"], "A_1.0.pdf"), "rb") as fh:
+        assert fh.read(5) == b"%PDF-"
+    with pytest.raises(ValueError, match="unsupported report format"):
+        reports.generate(fmt="docx", out_dir=str(tmp_path / "results"), frame=df)
@@ -0,0 +1,62 @@
+# tests/test_sensitivity.py — riskradar/sensitivity.py: exact flip thresholds and the Monte Carlo sweep
+import random
+
+import pytest
+
+from riskradar import rules, sensitivity
+
+CATEGORIES = ("Process", "Tooling", "Release", "Quality Metrics")
+
+def assessment(rnd):
+    items = [(rnd.choice(CATEGORIES), f"r{k}", rnd.randint(1, 3), rnd.randint(1, 3)) for k in range(rnd.randint(1, 8))]
+    fixed = [("Release", "Release gate", 2, 3)] if rnd.random() < 0.3 else []
+    weights = {c: rnd.choice([0.5, 1.0, 1.5, 2.0]) for c in CATEGORIES if rnd.random() < 0.5}
+    return items, fixed, weights
+
+def rating(scores):
+    return sensitivity.RATINGS.index(rules.score_to_rating(sum(scores), max(scores, default=0)))
+
+@pytest.mark.parametrize("seed", range(30))
+def test_flip_thresholds_are_exact(seed):
+    items, fixed, weights = assessment(random.Random(seed))
+    out = sensitivity.analyze(items, fixed, weights, scenarios=200)
+    scores = [p * i for _, _, p, i in items + fixed]
+    base = rating(scores)
+    assert out["rating"] == sensitivity.RATINGS[base] and out["total"] == sum(scores)
+    for row in out["items"].itertuples():
+        k = int(row.risk_name[1:])
+        alt = {c: rating(scores[:k] + [c] + scores[k + 1:]) for c in sensitivity.CELL_SCORES.tolist()}
+        assert row.worse_at_score == min((c for c, r in alt.items() if r < base), default=0)
+        assert row.better_at_score == max((c for c, r in alt.items() if r > base), default=0)
+
+def test_weights_never_flip_the_rating():
+    items, fixed, weights = assessment(random.Random(1))
+    out = sensitivity.analyze(items, fixed, weights, scenarios=2000, override_rate=0.0)
+    assert out["rating_share"][out["rating"]] == 1.0
+    assert out["items"]["flip_rate_overridden"].eq(0).all()
+    p5, p50, p95 = out["weighted_pcts"].values()
+    assert p5 <= p50 <= p95
+
+def test_monte_carlo_is_seeded():
+    items, fixed, weights = assessment(random.Random(2))
+    a = sensitivity.analyze(items, fixed, weights, scenarios=1000, seed=7)
+    b = sensitivity.analyze(items, fixed, weights, scenarios=1000, seed=7)
+    assert a["rating_share"] == b["rating_share"] and a["weighted_pcts"] == b["weighted_pcts"]
+    assert sum(a["rating_share"].values()) == pytest.approx(1.0)
+
+def test_weighted_score_and_categories():
+    items = [("Process", "a", 3, 3), ("Tooling", "b", 1, 2)]
+    out = sensitivity.analyze(items, [("Release", "gate", 2, 2)], {"Process": 2.0, "Tooling": 0.5}, scenarios=500)
+    assert out["weighted_score"] == 9 * 2.0 + 2 * 0.5 + 4
+    assert (out["rating"], out["high_margin"]) == ("High", 9 - rules.HIGH_CELL)
+    cats = out["categories"].set_index("category")
+    assert list(cats.index) == ["Process", "Release", "Tooling"]  # by score
+    assert (cats.loc["Process", "weighted_min"], cats.loc["Process", "weighted_max"]) == \
+        (9 * rules.WEIGHT_MIN, 9 * rules.WEIGHT_MAX)
+    # The largest category dominates the weighted-score spread
+    assert cats["correlation"].idxmax() == "Process"
+
+def test_no_risks():
+    out = sensitivity.analyze([], [], {}, scenarios=100)
+    assert (out["rating"], out["total"], out["max_cell"]) == ("Low", 0, 0)
+    assert out["items"].empty and out["categories"].empty
@@ -0,0 +1,78 @@
+# tests/test_store.py — riskradar/store.py: de-duplicated saves, revisions on change, history
+import os, threading
+
+import pandas as pd
+
+from riskradar import store
+from riskradar.rules import RESULT_COLUMNS
+
+def rows(*scores):
+    return pd.DataFrame([{"project_name": "DP", "risk_name": f"r{n}", "score": s, "weighted_score": s}
+                         for n, s in enumerate(scores)], columns=RESULT_COLUMNS)
+
+def delta(before):
+    after = store.stats()
+    return {k: after[k] - before[k] for k in after}
+
+def test_unchanged_saves_are_skipped(results_dir):
+    before = store.stats()
+    path = store.save_results_csv("DP 1", "25.3", "L10n", rows(9, 2), "2025-08-26")
+    assert path == os.path.join(results_dir, "DP_1_25.3_2025-08-26_L10n.csv")
+    mtime = os.stat(path).st_mtime_ns
+    assert store.save_results_csv("DP 1", "25.3", "L10n", rows(9, 2), "2025-08-26") == path
+    assert os.stat(path).st_mtime_ns == mtime
+    assert delta(before) == {"saves": 2, "writes": 1, "skipped": 1}
+    assert len(store.history("DP 1", "25.3", "L10n", "2025-08-26")) == 1
+    assert not [f for f in os.listdir(results_dir) if f.startswith(".tmp_")]
+
+def test_changes_add_revisions(results_dir):
+    for scores in [(9, 2), (9, 3), (9, 3), (9, 2)]:
+        path = store.save_results_csv("DP", "25.3", "L10n", rows(*scores), "2025-08-26")
+    revs = store.history("DP", "25.3", "L10n", "2025-08-26")
+    assert len(revs) == 3  # the repeated (9, 3) is not a revision; going back to (9, 2) is
+    assert revs[0][2] == revs[2][2] != revs[1][2]
+    assert [r[0] for r in revs] == sorted(r[0] for r in revs)
+    assert pd.read_csv(path)["score"].tolist() == [9, 2]
+    payload, = store.connect(results_dir).execute("SELECT payload FROM revisions WHERE id=?", (revs[1][0],)).fetchone()
+    assert payload == rows(9, 3).to_csv(index=False).encode("utf-8")
+
+def test_history_is_per_assessment(results_dir):
+    store.save_results_csv("DP", "25.3", "L10n", rows(1), "2025-08-26")
+    store.save_results_csv("DP", "25.3", "LocOps", rows(1), "2025-08-26")
+    store.save_results_csv("DP", "25.4", "L10n", rows(1), "2025-08-26")
+    store.save_results_csv("DP", "25.3", "L10n", rows(1), "2025-08-27")
+    assert len(store.history("DP", "25.3", "L10n", "2025-08-26")) == 1
+    assert len(store.history("DP", "25.3", "L10n", "2025-08-27", out_dir=results_dir)) == 1
+    assert store.history("DP", "25.3", "General", "2025-08-26") == []
+
+def test_deleted_csv_is_rewritten(results_dir):
+    path = store.save_results_csv("DP", "25.3", "L10n", rows(4), "2025-08-26")
+    os.unlink(path)
+    store.save_results_csv("DP", "25.3", "L10n", rows(4), "2025-08-26")
+    assert os.path.exists(path)
+    assert len(store.history("DP", "25.3", "L10n", "2025-08-26")) == 2
+
+def test_concurrent_saves_of_one_key(results_dir):
+    def save(k):
+        for n in range(5):
+            store.save_results_csv("DP", "25.3", "L10n", rows(k, n), "2025-08-26")
+    threads = [threading.Thread(target=save, args=(k,)) for k in range(1, 5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    revs = store.history("DP", "25.3", "L10n", "2025-08-26")
+    payload, = store.connect(results_dir).execute("SELECT payload FROM revisions WHERE id=?", (revs[-1][0],)).fetchone()
+    with open(os.path.join(results_dir, "DP_25.3_2025-08-26_L10n.csv"), "rb") as fh:
+        assert fh.read() == payload  # the file is always the newest revision, never a mix
+
+def test_names_that_share_a_file_share_its_revisions(results_dir):
+    def named(project, *scores):
+        return rows(*scores).assign(project_name=project)
+    path = store.save_results_csv("DP", "25.3", "L10n", named("DP", 9), "2025-08-26")
+    assert store.save_results_csv("DP ", "25.3", "L10n", named("DP ", 3), "2025-08-26") == path
+    before = store.stats()
+    store.save_results_csv("DP", "25.3", "L10n", named("DP", 9), "2025-08-26")
+    assert delta(before)["writes"] == 1  # not mistaken for the first, unchanged save
+    assert pd.read_csv(path)["score"].tolist() == [9]
+    assert len(store.history("DP ", "25.3", "L10n", "2025-08-26")) == 3
@@ -0,0 +1,65 @@
+# tests/test_trends.py — riskradar/trends.py: weekly aggregates kept up to date on every save
+import pandas as pd
+import pytest
+
+from riskradar import store, trends
+from riskradar.rules import RESULT_COLUMNS
+
+def rows(*scores, defects_summary=""):
+    return pd.DataFrame([{"risk_name": f"r{n}", "score": s, "weighted_score": s * 2, "defects_summary": defects_summary}
+                         for n, s in enumerate(scores)], columns=RESULT_COLUMNS)
+
+def week(scope, w, out_dir):
+    return next(r for r in trends.series(scope, out_dir=out_dir) if r["week"] == w)
+
+def test_point_and_week():
+    p = trends.point(rows(9, 2, 1), defects=(1, 0, 3, 0))
+    assert p == (12, 24, 1, 9, "High", 1, 0, 3, 0)
+    # Without explicit counters they come from the defect risk row's summary
+    p = trends.point(rows(2, 2, defects_summary="Blocker=0, Critical=3, Major=1, Minor=4"))
+    assert p[4:] == ("Low", 0, 3, 1, 4)
+    assert trends.week_of("2025-08-27") == trends.week_of("2025-08-25") == "2025-08-25"
+    assert trends.week_of("2025-08-31") == "2025-08-25" and trends.week_of("2025-09-01") == "2025-09-01"
+
+def test_resave_applies_only_the_difference(results_dir):
+    store.save_results_csv("A", "1.0", "L10n", rows(9, 3), "2025-08-26", defects=(0, 1, 0, 0))
+    store.save_results_csv("B", "1.0", "L10n", rows(2), "2025-08-27")
+    w = week(trends.PORTFOLIO, "2025-08-25", results_dir)
+    assert (w["assessments"], w["total_score"], w["high"], w["low"], w["critical"]) == (2, 14, 1, 1, 1)
+
+    # Same assessment saved again with new answers: replaced, not counted twice
+    store.save_results_csv("A", "1.0", "L10n", rows(3, 3, 3, 3), "2025-08-26", defects=(0, 0, 0, 0))
+    w = week(trends.PORTFOLIO, "2025-08-25", results_dir)
+    assert (w["assessments"], w["total_score"], w["high"], w["medium"], w["low"], w["critical"]) == (2, 14, 0, 1, 1, 0)
+    a = week("A", "2025-08-25", results_dir)
+    assert (a["assessments"], a["total_score"], a["weighted_score"]) == (1, 12, 24)
+
+def test_unchanged_point_is_not_recorded_again(results_dir):
+    conn = store.connect(results_dir)
+    p = trends.point(rows(4, 2))
+    assert trends.record(conn, "A", "L10n", "1.0", "2025-08-26", p)
+    assert not trends.record(conn, "A", "L10n", "1.0", "2025-08-26", p)
+    assert week("A", "2025-08-25", results_dir)["assessments"] == 1
+
+def test_weeks_scopes_and_since(results_dir):
+    store.save_results_csv("A", "1.0", "L10n", rows(2), "2025-08-26")
+    store.save_results_csv("A", "1.1", "L10n", rows(4), "2025-09-03")
+    store.save_results_csv("B", "1.0", "LocOps", rows(6), "2025-09-04")
+    assert [r["week"] for r in trends.series(out_dir=results_dir)] == ["2025-08-25", "2025-09-01"]
+    assert [r["total_score"] for r in trends.series("A", out_dir=results_dir)] == [2, 4]
+    assert [r["week"] for r in trends.series("B", since="2025-09-02", out_dir=results_dir)] == ["2025-09-01"]
+    assert trends.sparklines(out_dir=results_dir) == {"A": [4.0, 8.0], "B": [12.0]}
+
+def test_rebuild_matches_incremental(results_dir):
+    store.save_results_csv("A", "1.0", "L10n", rows(9, 1), "2025-08-26")
+    store.save_results_csv("A", "1.0", "L10n", rows(4), "2025-08-26")
+    store.save_results_csv("B", "2.0", "General", rows(6, 6), "2025-09-10")
+    incremental = {s: trends.series(s, out_dir=results_dir) for s in (trends.PORTFOLIO, "A", "B")}
+    assert trends.rebuild(results_dir) == 2
+    assert {s: trends.series(s, out_dir=results_dir) for s in incremental} == incremental
+
+@pytest.mark.parametrize("scores, rating", [((9,), "High"), ((6, 6), "Medium"), ((2, 2), "Low")])
+def test_rating_buckets(results_dir, scores, rating):
+    store.save_results_csv("A", "1.0", "L10n", rows(*scores), "2025-08-26")
+    w = week("A", "2025-08-25", results_dir)
+    assert {"High": w["high"], "Medium": w["medium"], "Low": w["low"]} == {r: int(r == rating) for r in ("High", "Medium", "Low")}